@@ -0,0 +1,256 @@
+# benchmarks/load_harness.py
+"""Drives the manager pages headlessly with many simulated sessions at once.
+
+    python -m benchmarks.load_harness                       # 1, 5, 10 and 25 concurrent managers
+    python -m benchmarks.load_harness --sessions 50 --employees 2000 --think-time 0.5
+    python -m benchmarks.load_harness --sequential          # same clicks, one session at a time
+
+Each session is a Streamlit ``AppTest`` of ``main.py`` running a manager's
+click sequence (approve a request, search for an employee and filter the
+dashboard, open the calendar and its heatmap, go back home) against a
+SQLite file filled by ``synthetic``. Sessions share one process, so
+``st.cache_resource`` objects (backend, cache, connection pool) are shared
+the way they are in one container from the ``Dockerfile``.
+
+``AppTest`` is not built for concurrent use: each session's ``AppTest`` is
+created, started and driven on one dedicated thread and never touched from
+another, and every session uses the same secrets since ``AppTest`` installs
+them process-wide while it runs. ``--sequential`` takes the same click
+sequences one session after another, a baseline free of any interference
+between test harnesses.
+
+For every concurrency level it reports p50/p95/p99 rerun latency,
+throughput in reruns per second, time spent in the data layer per rerun
+(from ``leave_store.metrics``) and resident memory per session.
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import statistics
+import tempfile
+import threading
+import time
+from datetime import date
+
+from streamlit.testing.v1 import AppTest
+
+from leave_store.metrics import RECORDER
+from leave_store.sqlite_backend import SQLiteBackend
+
+from . import synthetic
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN_SCRIPT = os.path.join(APP_DIR, "main.py")
+DEFAULT_SESSIONS = (1, 5, 10, 25)
+DEFAULT_EMPLOYEES = 200
+DEFAULT_ROUNDS = 3
+DEFAULT_THINK_TIME = 1.0
+RERUN_TIMEOUT = 60
+
+
+def rss_bytes():
+    """Current resident set size of this process."""
+    try:
+        with open("/proc/self/statm") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        # No /proc (macOS): fall back to the peak, reported in bytes there.
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def percentile(values, share):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(share * len(ordered)))]
+
+
+def _by_label(widgets, label):
+    return next((widget for widget in widgets if widget.label == label), None)
+
+
+class ManagerSession:
+    """One simulated manager: an ``AppTest`` of ``main.py`` and their click sequence."""
+
+    def __init__(self, database_path, rng, think_time):
+        self.app = AppTest.from_file(MAIN_SCRIPT, default_timeout=RERUN_TIMEOUT)
+        self.app.secrets["LEAVE_BACKEND"] = "sqlite"
+        self.app.secrets["DATABASE_PATH"] = database_path
+        self.rng = rng
+        self.think_time = think_time
+        self.latencies = []
+        self.errors = 0
+
+    def _rerun(self, step):
+        """Runs ``step`` (which triggers a rerun) and records how long the rerun took."""
+        if self.think_time:
+            time.sleep(self.rng.expovariate(1 / self.think_time))
+        tick = time.perf_counter()
+        try:
+            step()
+        except Exception:
+            self.errors += 1
+            return
+        self.latencies.append(time.perf_counter() - tick)
+        if self.app.exception:
+            self.errors += 1
+
+    def open_home(self):
+        self._rerun(lambda: self.app.switch_page("home_page.py").run())
+
+    def approve_one(self):
+        buttons = [button for button in self.app.button if (button.key or "").startswith("approve_")]
+        if buttons:
+            self._rerun(lambda: self.rng.choice(buttons).click().run())
+
+    def filter_dashboard(self):
+        search = _by_label(self.app.text_input, "Search employee")
+        if search is not None:
+            typed = self.rng.choice(synthetic.FIRST_NAMES)[:self.rng.randint(2, 4)]
+            self._rerun(lambda: search.input(typed).run())
+        employees = _by_label(self.app.selectbox, "Filter by Employee")
+        if employees is not None and len(employees.options) > 1:
+            self._rerun(lambda: employees.select(self.rng.choice(employees.options[1:])).run())
+        statuses = _by_label(self.app.multiselect, "Filter by Status")
+        if statuses is not None:
+            self._rerun(lambda: statuses.select(self.rng.choice(["Declined", "Withdrawn", "Recalled"])).run())
+
+    def open_calendar(self):
+        self._rerun(lambda: self.app.switch_page("team_leaves.py").run())
+        mode = _by_label(self.app.radio, "Calendar view")
+        if mode is not None:
+            self._rerun(lambda: mode.set_value("Heatmap").run())
+        breakdown = _by_label(self.app.selectbox, "Count people off for")
+        if breakdown is not None and breakdown.options:
+            self._rerun(lambda: breakdown.select(self.rng.choice(breakdown.options)).run())
+
+    def start(self):
+        self._rerun(self.app.run)
+
+    def play(self, rounds):
+        for _ in range(rounds):
+            self.open_home()
+            self.approve_one()
+            self.filter_dashboard()
+            self.open_calendar()
+
+
+def prepare_database(path, employees, seed):
+    backend = SQLiteBackend(path)
+    synthetic.load_sqlite(backend, synthetic.generate(employees, seed, as_of=date.today()))
+    backend.pool.close()
+
+
+def _run_sessions(database_path, sessions, rounds, think_time, seed, before):
+    """Runs each session on its own thread; returns the managers and the memory once all have started."""
+    managers = [None] * sessions
+    all_started = threading.Barrier(sessions + 1)
+    measured = threading.Event()
+
+    def session(number):
+        # The AppTest is created, started and played on this thread only.
+        try:
+            managers[number] = ManagerSession(database_path, random.Random(seed + number), think_time)
+            managers[number].start()
+        finally:
+            all_started.wait()
+        measured.wait()
+        if managers[number] is not None:
+            managers[number].play(rounds)
+
+    threads = [threading.Thread(target=session, args=(number,), name=f"load-session-{number}")
+               for number in range(sessions)]
+    for thread in threads:
+        thread.start()
+    # Memory is measured with every session alive.
+    all_started.wait()
+    memory = max(rss_bytes() - before, 0)
+    measured.set()
+    for thread in threads:
+        thread.join()
+    return managers, memory
+
+
+def _run_sequentially(database_path, sessions, rounds, think_time, seed, before):
+    """Runs the sessions' rounds one session at a time; returns the managers and the memory with all started."""
+    managers = [ManagerSession(database_path, random.Random(seed + number), think_time) for number in range(sessions)]
+    for manager in managers:
+        manager.start()
+    memory = max(rss_bytes() - before, 0)
+    for _ in range(rounds):
+        for manager in managers:
+            manager.play(1)
+    return managers, memory
+
+
+def run_level(database_path, sessions, rounds, think_time, seed, sequential=False):
+    """Runs ``sessions`` managers, concurrently unless ``sequential``; returns the level's summary."""
+    RECORDER.reset()
+    before = rss_bytes()
+    started = time.perf_counter()
+    run = _run_sequentially if sequential else _run_sessions
+    managers, memory = run(database_path, sessions, rounds, think_time, seed, before)
+    elapsed = time.perf_counter() - started
+
+    latencies = [latency for manager in managers if manager for latency in manager.latencies]
+    query_seconds = sum(total[1] for (kind, _, _), total in RECORDER.totals.items() if kind == "query")
+    return {
+        "sessions": sessions,
+        "sequential": sequential,
+        "reruns": len(latencies),
+        "errors": sum(manager.errors if manager else 1 for manager in managers),
+        "p50_ms": percentile(latencies, 0.50) * 1000 if latencies else None,
+        "p95_ms": percentile(latencies, 0.95) * 1000 if latencies else None,
+        "p99_ms": percentile(latencies, 0.99) * 1000 if latencies else None,
+        "mean_ms": statistics.fmean(latencies) * 1000 if latencies else None,
+        "reruns_per_second": len(latencies) / elapsed if elapsed else None,
+        "query_ms_per_rerun": query_seconds * 1000 / len(latencies) if latencies else None,
+        "memory_mib_per_session": memory / sessions / 2**20,
+    }
+
+
+def format_row(result):
+    def ms(value):
+        return f"{value:9.1f}" if value is not None else f"{'-':>9}"
+    return (f"{result['sessions']:>8} {result['reruns']:>7} {result['errors']:>6} {ms(result['p50_ms'])} "
+            f"{ms(result['p95_ms'])} {ms(result['p99_ms'])} {result['reruns_per_second'] or 0:9.2f} "
+            f"{ms(result['query_ms_per_rerun'])} {result['memory_mib_per_session']:9.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", default=",".join(map(str, DEFAULT_SESSIONS)),
+                        help="comma-separated concurrency levels")
+    parser.add_argument("--employees", type=int, default=DEFAULT_EMPLOYEES, help="team size of the synthetic data")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS, help="click sequences per session")
+    parser.add_argument("--think-time", type=float, default=DEFAULT_THINK_TIME,
+                        help="mean seconds between clicks (0 for back-to-back reruns)")
+    parser.add_argument("--sequential", action="store_true",
+                        help="run the sessions one at a time instead of concurrently")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    args = parser.parse_args(argv)
+    levels = [int(level) for level in args.sessions.split(",") if level.strip()]
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        database_path = os.path.join(workdir, "load-test.db")
+        prepare_database(database_path, args.employees, args.seed)
+        # A warm-up session builds the process-wide resources (backend, caches,
+        # imports) so they are not charged to the first level.
+        run_level(database_path, 1, 1, 0, args.seed)
+        print(f"{'sessions':>8} {'reruns':>7} {'errors':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+              f"{'reruns/s':>9} {'db ms':>9} {'MiB/sess':>9}")
+        for level in levels:
+            result = run_level(database_path, level, args.rounds, args.think_time, args.seed, args.sequential)
+            results.append(result)
+            print(format_row(result), flush=True)
+
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump(results, handle, indent=2)
+            handle.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+# benchmarks/postgrest_standin.py
+"""In-process stand-in for the supabase-py / PostgREST query builder.
+
+Implements the subset of the builder ``SupabaseBackend`` and ``DeltaSync``
+use (select with count and ``table(columns)`` embeds, eq/neq/gt/gte/lt/lte/
+in_/ilike/or_ filters, order, limit, range, insert/update/upsert/delete) over
+tables held as lists of dicts, with PostgREST's semantics where they matter
+for performance: responses are capped at ``max_rows`` like Supabase's
+``max-rows`` setting, filters on a plain embed null the embed instead of
+dropping the row, and ``!inner`` embeds drop rows without a match.
+
+``round_trips`` counts executed requests, so benchmarks can catch a change
+that adds HTTP calls even where the stand-in itself is fast.
+"""
+import itertools
+import re
+from datetime import datetime, timedelta, timezone
+
+# Supabase's default PostgREST max-rows.
+DEFAULT_MAX_ROWS = 1000
+
+# Embedded resource -> (column on the embedded table, column on the parent row).
+EMBED_KEYS = {
+    "employee_table": ("AUUID", "employee_id"),
+}
+
+EMBED_PATTERN = re.compile(r"(\w+)(!inner)?\(([^)]*)\)")
+
+
+class Response:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+def _split_top_level(expression):
+    parts, depth, current = [], 0, ""
+    quoted = escaped = False
+    for char in expression:
+        if quoted:
+            quoted = escaped or char != '"'
+            escaped = not escaped and char == "\\"
+            current += char
+            continue
+        if char == "," and depth == 0:
+            parts.append(current)
+            current = ""
+            continue
+        quoted = char == '"'
+        depth += char == "("
+        depth -= char == ")"
+        current += char
+    parts.append(current)
+    return parts
+
+
+def _coerce(value, sample):
+    if isinstance(sample, bool):
+        return value in ("true", True)
+    if isinstance(sample, int) and not isinstance(value, int):
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return value
+    return value
+
+
+COMPARISONS = {
+    "eq": lambda a, b: a == b,
+    "neq": lambda a, b: a != b,
+    "gt": lambda a, b: a is not None and a > b,
+    "gte": lambda a, b: a is not None and a >= b,
+    "lt": lambda a, b: a is not None and a < b,
+    "lte": lambda a, b: a is not None and a <= b,
+}
+
+
+def _like_regex(pattern):
+    """Regex for a LIKE pattern: ``%``/``*`` any run, ``_`` one character, backslash escaping the next."""
+    parts, escaped = [], False
+    for char in pattern:
+        if escaped:
+            parts.append(re.escape(char))
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char in "%*":
+            parts.append(".*")
+        elif char == "_":
+            parts.append(".")
+        else:
+            parts.append(re.escape(char))
+    return "^" + "".join(parts) + "$"
+
+
+def _predicate(column, operator, value):
+    if operator == "in":
+        values = set(value)
+        return lambda row: row.get(column) in values
+    if operator == "ilike":
+        pattern = re.compile(_like_regex(value), re.IGNORECASE)
+        return lambda row: row.get(column) is not None and bool(pattern.match(str(row.get(column))))
+    compare = COMPARISONS[operator]
+    return lambda row: compare(row.get(column), _coerce(value, row.get(column)))
+
+
+def _parse_term(term):
+    """Parses one term of an ``or=(...)`` expression: ``col.op.value`` or ``and(...)``."""
+    if term.startswith("and("):
+        predicates = [_parse_term(part) for part in _split_top_level(term[4:-1])]
+        return lambda row: all(predicate(row) for predicate in predicates)
+    column, operator, value = term.split(".", 2)
+    if len(value) > 1 and value[0] == value[-1] == '"':
+        # Inside double quotes PostgREST reads a backslash as escaping the next character.
+        value = re.sub(r"\\(.)", r"\1", value[1:-1])
+    return _predicate(column, operator, value)
+
+
+class Query:
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.filters = []        # (embed name or None, predicate)
+        self.orders = []
+        self.columns = "*"
+        self.count_mode = None
+        self._limit = None
+        self._offset = 0
+        self.mode = "select"
+        self.payload = None
+
+    # ---- builder ----
+
+    def select(self, columns="*", count=None):
+        self.columns, self.count_mode = columns, count
+        return self
+
+    def insert(self, payload):
+        self.mode, self.payload = "insert", payload
+        return self
+
+    def upsert(self, payload):
+        self.mode, self.payload = "upsert", payload
+        return self
+
+    def update(self, payload):
+        self.mode, self.payload = "update", payload
+        return self
+
+    def delete(self):
+        self.mode = "delete"
+        return self
+
+    def _filter(self, column, operator, value):
+        if "." in column:
+            embed, field = column.split(".", 1)
+            self.filters.append((embed, _predicate(field, operator, value)))
+        else:
+            self.filters.append((None, _predicate(column, operator, value)))
+        return self
+
+    def eq(self, column, value):
+        return self._filter(column, "eq", value)
+
+    def neq(self, column, value):
+        return self._filter(column, "neq", value)
+
+    def gt(self, column, value):
+        return self._filter(column, "gt", value)
+
+    def gte(self, column, value):
+        return self._filter(column, "gte", value)
+
+    def lt(self, column, value):
+        return self._filter(column, "lt", value)
+
+    def lte(self, column, value):
+        return self._filter(column, "lte", value)
+
+    def in_(self, column, values):
+        return self._filter(column, "in", list(values))
+
+    def ilike(self, column, pattern):
+        return self._filter(column, "ilike", pattern)
+
+    def or_(self, expression):
+        predicates = [_parse_term(part) for part in _split_top_level(expression)]
+        self.filters.append((None, lambda row: any(predicate(row) for predicate in predicates)))
+        return self
+
+    def order(self, column, desc=False):
+        self.orders.append((column, desc))
+        return self
+
+    def limit(self, count):
+        self._limit = count
+        return self
+
+    def range(self, start, end):
+        self._offset, self._limit = start, end - start + 1
+        return self
+
+    # ---- execution ----
+
+    def _row_matches(self, row):
+        return all(predicate(row) for embed, predicate in self.filters if embed is None)
+
+    def execute(self):
+        self.client.round_trips += 1
+        rows = self.client.tables.setdefault(self.table, [])
+        if self.mode in ("insert", "upsert"):
+            return Response(self.client.write_rows(self.table, self.payload, upsert=self.mode == "upsert"))
+        matched = [row for row in rows if self._row_matches(row)]
+        if self.mode == "update":
+            stamp = self.client.now()
+            for row in matched:
+                row.update(self.payload)
+                row["updated_at"] = stamp
+            return Response([dict(row) for row in matched])
+        if self.mode == "delete":
+            removed = {id(row) for row in matched}
+            self.client.tables[self.table] = [row for row in rows if id(row) not in removed]
+            self.client.reindex(self.table)
+            return Response([dict(row) for row in matched])
+        return self._select(matched)
+
+    def _select(self, matched):
+        embeds = {
+            match.group(1): ([field.strip() for field in match.group(3).split(",")], bool(match.group(2)))
+            for match in EMBED_PATTERN.finditer(self.columns)
+        }
+        plain = [column.strip() for column in EMBED_PATTERN.sub("", self.columns).split(",") if column.strip()]
+        embed_filters = {}
+        for embed, predicate in self.filters:
+            if embed is not None:
+                embed_filters.setdefault(embed, []).append(predicate)
+
+        out = []
+        for row in matched:
+            item = dict(row) if plain in ([], ["*"]) else {column: row.get(column) for column in plain}
+            keep = True
+            for embed, (fields, inner) in embeds.items():
+                target = self.client.lookup(embed, row)
+                if target is not None and not all(predicate(target) for predicate in embed_filters.get(embed, ())):
+                    target = None
+                item[embed] = {field: target.get(field) for field in fields} if target is not None else None
+                if inner and target is None:
+                    keep = False
+            if keep:
+                out.append(item)
+
+        for column, desc in reversed(self.orders):
+            out.sort(key=lambda item: (item.get(column) is None, item.get(column)), reverse=desc)
+        total = len(out) if self.count_mode else None
+        limit = self.client.max_rows if self._limit is None else min(self._limit, self.client.max_rows)
+        return Response(out[self._offset:self._offset + limit], total)
+
+
+class RpcCall:
+    def __init__(self, client, name, params):
+        self.client, self.name, self.params = client, name, params
+
+    def execute(self):
+        self.client.round_trips += 1
+        return Response(self.client.functions[self.name](self.client, **(self.params or {})))
+
+
+class PostgRESTStandIn:
+    """Supabase-shaped client over in-memory tables; pass it to ``SupabaseBackend``."""
+
+    def __init__(self, max_rows=DEFAULT_MAX_ROWS):
+        self.tables = {}
+        self.max_rows = max_rows
+        self.functions = {}
+        self.round_trips = 0
+        self._ids = itertools.count(1)
+        self._clock = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        self._embed_index = {}
+
+    def now(self):
+        self._clock += timedelta(milliseconds=1)
+        return self._clock.isoformat()
+
+    def table(self, name):
+        return Query(self, name)
+
+    def rpc(self, name, params=None):
+        return RpcCall(self, name, params)
+
+    def load(self, table, rows):
+        """Bulk-loads rows without counting round trips; ids are assigned where missing."""
+        rows = [dict(row) for row in rows]
+        for row in rows:
+            if table == "off_roll_leave" and "id" not in row:
+                row["id"] = next(self._ids)
+            row.setdefault("updated_at", self.now())
+        self.tables.setdefault(table, []).extend(rows)
+        if table == "off_roll_leave":
+            self._ids = itertools.count(max(row["id"] for row in self.tables[table]) + 1)
+        self.reindex(table)
+
+    def write_rows(self, table, payload, upsert=False):
+        items = payload if isinstance(payload, list) else [payload]
+        rows = self.tables.setdefault(table, [])
+        written = []
+        for item in items:
+            row = dict(item)
+            if table == "off_roll_leave":
+                row.setdefault("id", next(self._ids))
+            row["updated_at"] = self.now()
+            if upsert and "id" in row:
+                rows[:] = [existing for existing in rows if existing.get("id") != row["id"]]
+            rows.append(row)
+            written.append(dict(row))
+        self.reindex(table)
+        return written
+
+    def reindex(self, table):
+        for embed, (key, _) in EMBED_KEYS.items():
+            if embed == table:
+                self._embed_index[embed] = {row[key]: row for row in self.tables.get(table, [])}
+
+    def lookup(self, embed, row):
+        key, parent_column = EMBED_KEYS[embed]
+        return self._embed_index.get(embed, {}).get(row.get(parent_column))
@@ -0,0 +1,197 @@
+# benchmarks/run.py
+"""Times the data-access functions against seeded data at several scales.
+
+    python -m benchmarks.run                          # 1k and 100k, both backends, checked against baselines
+    python -m benchmarks.run --sizes 1k,100k,1m       # add the million-row run
+    python -m benchmarks.run --record                 # overwrite the recorded baselines
+
+Each operation runs on the raw backends (no ``CachedBackend``), against a
+SQLite file built with ``sqlite_backend.init_db`` and against the
+in-process PostgREST stand-in, both loaded with the same
+``synthetic.generate`` data. The median wall time is compared with
+``baselines.json``: a run fails when an operation is more than
+``--tolerance`` times slower than its baseline (and slower by more than a
+small noise floor), or when it needs more PostgREST round trips.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+
+from leave_store.pagination import PAGE_SIZES
+from leave_store.sqlite_backend import SQLiteBackend
+from leave_store.supabase_backend import SupabaseBackend
+
+from . import synthetic
+from .postgrest_standin import PostgRESTStandIn
+
+SIZES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+DEFAULT_SIZES = ("1k", "100k")
+BACKENDS = ("sqlite", "postgrest")
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines.json")
+DEFAULT_TOLERANCE = 3.0
+# Differences below this many seconds are timer noise, not regressions.
+NOISE_FLOOR = 0.005
+MIN_REPEATS = 3
+MAX_REPEATS = 25
+TARGET_SECONDS = 0.5
+# Fixed reference date, so the generated statuses never drift between runs.
+AS_OF = date(2025, 6, 30)
+# One employee per this many leaves, so a team's history grows with its size.
+LEAVES_PER_EMPLOYEE = 20
+# Month shown by the calendar benchmark.
+CALENDAR_MONTH = (date(2025, 6, 1), date(2025, 6, 30))
+
+
+def build_calendar_events(backend, context):
+    leaves = backend.get_leaves_in_range(*CALENDAR_MONTH, ["Approved"])
+    return [
+        {
+            "title": f"{leave['employee_name']} - {leave['leave_type']}",
+            "start": leave["start_date"],
+            "end": leave["end_date"],
+        }
+        for leave in leaves
+    ]
+
+
+def toggle_leave_status(backend, context):
+    context["toggle"] = not context.get("toggle")
+    return backend.update_leave_status(context["leave_id"], "Approved" if context["toggle"] else "Pending")
+
+
+OPERATIONS = {
+    "get_team_leaves": lambda backend, context: backend.get_team_leaves(["Pending", "Approved"]),
+    "get_team_leaves_frame": lambda backend, context: backend.get_team_leaves_frame(["Pending", "Approved"],
+                                                                                    page_size=PAGE_SIZES[-1]),
+    "get_all_pending_leaves": lambda backend, context: backend.get_all_pending_leaves(),
+    "get_employee_used_leave": lambda backend, context: backend.get_employee_used_leave(context["employee_id"]),
+    "update_leave_status": toggle_leave_status,
+    "build_calendar_events": build_calendar_events,
+}
+
+
+def build_dataset(leave_count, seed=0):
+    employee_count = min(synthetic.MAX_EMPLOYEES, max(synthetic.MIN_EMPLOYEES, leave_count // LEAVES_PER_EMPLOYEE))
+    return synthetic.generate(employee_count, seed, as_of=AS_OF, leave_count=leave_count)
+
+
+def make_backend(kind, dataset, workdir):
+    if kind == "sqlite":
+        backend = SQLiteBackend(os.path.join(workdir, f"bench-{len(dataset)}.db"))
+        synthetic.load_sqlite(backend, dataset)
+        return backend, None
+    client = PostgRESTStandIn()
+    synthetic.load_standin(client, dataset)
+    return SupabaseBackend(client), client
+
+
+def time_operation(operation, backend, context, client=None):
+    """Returns ``(median seconds, round trips of one call)``."""
+    operation(backend, context)  # warm-up: page cache, prepared statements
+    round_trips = None
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < MIN_REPEATS or (
+        len(timings) < MAX_REPEATS and time.perf_counter() - started < TARGET_SECONDS
+    ):
+        before = client.round_trips if client else 0
+        tick = time.perf_counter()
+        operation(backend, context)
+        timings.append(time.perf_counter() - tick)
+        if client and round_trips is None:
+            round_trips = client.round_trips - before
+    return statistics.median(timings), round_trips
+
+
+def run(sizes, backends, log=print):
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in sizes:
+            tick = time.perf_counter()
+            dataset = build_dataset(SIZES[size])
+            log(f"[{size}] generated {len(dataset)} leaves / {dataset.employee_count} employees "
+                f"in {time.perf_counter() - tick:.1f}s")
+            context = {"employee_id": "emp-000000", "leave_id": 1}
+            for kind in backends:
+                tick = time.perf_counter()
+                backend, client = make_backend(kind, dataset, workdir)
+                log(f"[{size}] loaded {kind} in {time.perf_counter() - tick:.1f}s")
+                for name, operation in OPERATIONS.items():
+                    seconds, round_trips = time_operation(operation, backend, context, client)
+                    results.setdefault(kind, {}).setdefault(size, {})[name] = {
+                        "seconds": round(seconds, 6),
+                        "round_trips": round_trips,
+                    }
+                    trips = f"  {round_trips} round trip(s)" if round_trips is not None else ""
+                    log(f"  {kind:9} {size:>4} {name:24} {seconds * 1000:10.2f} ms{trips}")
+                if kind == "sqlite":
+                    backend.pool.close()
+    return results
+
+
+def compare(results, baselines, tolerance=DEFAULT_TOLERANCE):
+    """Returns a message for every operation that regressed against its baseline."""
+    failures = []
+    for kind, sizes in results.items():
+        for size, operations in sizes.items():
+            for name, measured in operations.items():
+                baseline = baselines.get(kind, {}).get(size, {}).get(name)
+                if baseline is None:
+                    continue
+                label = f"{kind}/{size}/{name}"
+                limit = baseline["seconds"] * tolerance
+                if measured["seconds"] > limit and measured["seconds"] - baseline["seconds"] > NOISE_FLOOR:
+                    failures.append(f"{label}: {measured['seconds'] * 1000:.2f} ms, baseline "
+                                    f"{baseline['seconds'] * 1000:.2f} ms (limit x{tolerance:g})")
+                if baseline.get("round_trips") is not None and (measured["round_trips"] or 0) > baseline["round_trips"]:
+                    failures.append(f"{label}: {measured['round_trips']} round trips, baseline {baseline['round_trips']}")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(DEFAULT_SIZES), help=f"comma-separated, from {', '.join(SIZES)}")
+    parser.add_argument("--backends", default=",".join(BACKENDS), help=f"comma-separated, from {', '.join(BACKENDS)}")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON file")
+    parser.add_argument("--record", action="store_true", help="write the results as the new baselines")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed slowdown factor")
+    args = parser.parse_args(argv)
+
+    sizes = [size.strip().lower() for size in args.sizes.split(",") if size.strip()]
+    backends = [kind.strip() for kind in args.backends.split(",") if kind.strip()]
+    unknown = [size for size in sizes if size not in SIZES] + [kind for kind in backends if kind not in BACKENDS]
+    if unknown:
+        parser.error(f"unknown size/backend: {', '.join(unknown)}")
+
+    results = run(sizes, backends)
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as handle:
+            baselines = json.load(handle)
+    if args.record:
+        for kind, by_size in results.items():
+            for size, operations in by_size.items():
+                baselines.setdefault(kind, {})[size] = operations
+        with open(args.baseline, "w") as handle:
+            json.dump(baselines, handle, indent=2, sort_keys=True)
+            handle.write("\n")
+        print(f"Recorded baselines in {args.baseline}")
+        return 0
+
+    failures = compare(results, baselines, args.tolerance)
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    if failures:
+        return 1
+    print("No regressions against the recorded baselines.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,315 @@
+# benchmarks/synthetic.py
+"""Seeded synthetic organisation and leave history for benchmarks and load tests.
+
+    python -m benchmarks.synthetic --employees 5000 --sqlite leave_management.db
+    python -m benchmarks.synthetic --employees 50000 --json fixtures/   # for the PostgREST stand-in
+
+The same seed and ``as_of`` date always give the same data. Everything is
+drawn as whole numpy arrays (no per-row Python until the rows are written),
+so a million leaves take a few seconds:
+
+* departments of very different sizes, each with its own partner;
+* a leave-type mix dominated by annual and sick leave, with type-specific
+  lengths in working days (maternity and paternity in calendar days);
+* start dates that peak over Christmas, Easter and August and rarely fall
+  on weekends (sick leave has no season);
+* statuses that depend on the leave's position relative to ``as_of``:
+  future leave is often still Pending, only past or current leave can be
+  Recalled.
+"""
+import argparse
+import json
+import os
+import re
+import time
+from datetime import date
+
+import numpy as np
+from dateutil.easter import easter
+
+MIN_EMPLOYEES = 10
+MAX_EMPLOYEES = 50_000
+DEFAULT_YEARS = 3
+LEAVES_PER_EMPLOYEE_YEAR = 7
+
+FIRST_NAMES = (
+    "Amina", "Brian", "Cynthia", "David", "Esther", "Felix", "Grace", "Hassan", "Irene", "James", "Kevin",
+    "Lucy", "Mercy", "Nelson", "Otieno", "Peter", "Quincy", "Rose", "Samuel", "Teresa", "Umar", "Violet",
+    "Wanjiru", "Xavier", "Yvonne", "Zawadi", "Achieng", "Baraka", "Chebet", "Dennis",
+)
+SURNAMES = (
+    "Kamau", "Odhiambo", "Mwangi", "Wanjiku", "Kiptoo", "Njoroge", "Mutua", "Chege", "Omondi", "Kariuki",
+    "Ndung'u", "Kimani", "Wafula", "Barasa", "Cheruiyot", "Macharia", "Owino", "Nyambura", "Korir", "Muthoni",
+)
+DEPARTMENTS = ("Audit", "Tax", "Advisory", "Consulting", "Deals", "Risk", "Operations", "Finance", "People", "IT")
+POSITIONS = ("Associate", "Senior Associate", "Manager", "Senior Manager", "Director")
+POSITION_WEIGHTS = (0.45, 0.28, 0.15, 0.08, 0.04)
+
+# Leave type -> (share of requests, mean length, maximum length, counted in calendar days).
+LEAVE_TYPES = {
+    "Annual": (0.55, 4.0, 20, False),
+    "Sick": (0.24, 1.6, 10, False),
+    "Compensation": (0.06, 1.3, 3, False),
+    "Study": (0.04, 2.5, 10, False),
+    "Compassionate": (0.04, 2.0, 5, False),
+    "Unpaid": (0.04, 3.5, 20, False),
+    "Maternity": (0.015, 90.0, 90, True),
+    "Paternity": (0.015, 14.0, 14, True),
+}
+FUTURE_STATUSES = (("Pending", 0.40), ("Approved", 0.50), ("Declined", 0.06), ("Withdrawn", 0.04))
+PAST_STATUSES = (("Approved", 0.80), ("Declined", 0.09), ("Withdrawn", 0.06), ("Recalled", 0.05))
+DECLINE_REASONS = ("Busy season", "Team already short-staffed", "Client deadline", "Insufficient balance")
+RECALL_REASONS = ("Urgent client request", "Audit fieldwork", "Cover for a colleague")
+HALF_DAY_SHARE = 0.08
+
+TABLES = ("employee_table", "leave_entitlements", "off_roll_leave")
+INDEX_NAME = re.compile(r"INDEX IF NOT EXISTS (\w+)")
+
+
+class SyntheticData:
+    """Generated tables as ``{column: numpy array}`` in the Supabase shape."""
+
+    def __init__(self, employees, entitlements, leaves):
+        self.tables = {"employee_table": employees, "leave_entitlements": entitlements, "off_roll_leave": leaves}
+
+    def __len__(self):
+        return len(self.tables["off_roll_leave"]["id"])
+
+    @property
+    def employee_count(self):
+        return len(self.tables["employee_table"]["AUUID"])
+
+    def columns(self, table):
+        return list(self.tables[table])
+
+    def tuples(self, table, columns=None):
+        """Yields rows as tuples of plain Python values, ordered by ``columns``."""
+        data = self.tables[table]
+        return zip(*(data[column].tolist() for column in columns or data))
+
+    def records(self, table):
+        """Returns the rows of ``table`` as dicts."""
+        columns = self.columns(table)
+        return [dict(zip(columns, row)) for row in self.tuples(table, columns)]
+
+
+def season_weights(first_day, day_count):
+    """Relative likelihood of a leave starting on each day of the history."""
+    days = first_day + np.arange(day_count)
+    weights = np.ones(day_count)
+    weekday = (days.astype("int64") + 3) % 7  # 1970-01-01 was a Thursday; Monday = 0
+    weights[weekday >= 5] = 0.1
+    months = days.astype("datetime64[M]").astype(int) % 12 + 1
+    day_of_month = (days - days.astype("datetime64[M]")).astype(int) + 1
+    weights[months == 8] *= 2.2
+    weights[(months == 12) & (day_of_month >= 15)] *= 4.0
+    weights[(months == 1) & (day_of_month <= 3)] *= 3.0
+    first_year = int(str(first_day)[:4])
+    for year in range(first_year, first_year + day_count // 365 + 2):
+        sunday = np.datetime64(easter(year), "D")
+        week = (days >= sunday - 4) & (days <= sunday + 4)
+        weights[week] *= 2.5
+    return weights / weights.sum()
+
+
+def _choose(rng, options, size):
+    labels = np.array([label for label, _ in options], dtype=object)
+    shares = np.array([share for _, share in options])
+    return labels[rng.choice(len(labels), size=size, p=shares / shares.sum())]
+
+
+def generate(employee_count, seed=0, years=DEFAULT_YEARS, as_of=None, leave_count=None):
+    """Generates a ``SyntheticData`` for a team of ``employee_count`` people.
+
+    ``years`` of history end a quarter after ``as_of`` (today by default),
+    so there is upcoming leave too; ``leave_count`` defaults to about
+    seven leaves per employee per year.
+    """
+    if not MIN_EMPLOYEES <= employee_count <= MAX_EMPLOYEES:
+        raise ValueError(f"employee_count must be between {MIN_EMPLOYEES} and {MAX_EMPLOYEES}")
+    rng = np.random.default_rng(seed)
+    as_of = np.datetime64(as_of or date.today(), "D")
+    leave_count = leave_count or employee_count * years * LEAVES_PER_EMPLOYEE_YEAR
+
+    # ---- employees ----
+    numbers = np.arange(employee_count)
+    department_shares = 1.0 / np.arange(1, len(DEPARTMENTS) + 1) ** 0.8
+    department = rng.choice(len(DEPARTMENTS), size=employee_count, p=department_shares / department_shares.sum())
+    first = np.array(FIRST_NAMES, dtype=object)[numbers % len(FIRST_NAMES)]
+    surname = np.array(SURNAMES, dtype=object)[(numbers // len(FIRST_NAMES)) % len(SURNAMES)]
+    names = first + " " + surname
+    repeat = numbers // (len(FIRST_NAMES) * len(SURNAMES))
+    names = np.where(repeat > 0, names + " " + (repeat + 1).astype(str).astype(object), names)
+    position = rng.choice(len(POSITIONS), size=employee_count, p=POSITION_WEIGHTS)
+    employees = {
+        "AUUID": np.char.add("emp-", np.char.zfill(numbers.astype(str), 6)).astype(object),
+        "First_Name": names,
+        "Last_Name": surname,
+        "Partner": np.char.add("Partner ", np.array(DEPARTMENTS)[department]).astype(object),
+        "Department": np.array(DEPARTMENTS, dtype=object)[department],
+        "Position": np.array(POSITIONS, dtype=object)[position],
+        "Salary": np.round(rng.lognormal(11.2 + 0.35 * position, 0.2), -2).astype(np.int64),
+    }
+    entitlements = {
+        "employee_id": employees["AUUID"],
+        "annual_leave": 21 + 2 * position,
+        "sick_leave": np.full(employee_count, 14),
+        "compensation_leave": rng.integers(0, 11, size=employee_count),
+        "maternity_leave_days": np.full(employee_count, 90),
+        "paternity_leave_days": np.full(employee_count, 14),
+    }
+
+    # ---- leaves ----
+    type_names = np.array(list(LEAVE_TYPES), dtype=object)
+    shares = np.array([spec[0] for spec in LEAVE_TYPES.values()])
+    type_index = rng.choice(len(type_names), size=leave_count, p=shares / shares.sum())
+
+    history_end = as_of + np.timedelta64(90, "D")
+    first_day = history_end - np.timedelta64(365 * years, "D")
+    day_count = 365 * years
+    seasonal = season_weights(first_day, day_count)
+    flat = np.ones(day_count)
+    flat[((first_day + np.arange(day_count)).astype("int64") + 3) % 7 >= 5] = 0.1
+    flat /= flat.sum()
+    is_sick = type_names[type_index] == "Sick"
+    start = first_day + rng.choice(day_count, size=leave_count, p=seasonal)
+    start[is_sick] = first_day + rng.choice(day_count, size=int(is_sick.sum()), p=flat)
+
+    length = np.ones(leave_count, dtype=np.int64)
+    calendar_days = np.zeros(leave_count, dtype=bool)
+    for index, (mean, maximum, in_calendar_days) in enumerate(spec[1:] for spec in LEAVE_TYPES.values()):
+        mask = type_index == index
+        if in_calendar_days:
+            length[mask] = int(mean)
+            calendar_days[mask] = True
+        else:
+            length[mask] = np.minimum(rng.geometric(1.0 / mean, size=int(mask.sum())), maximum)
+    business_start = np.busday_offset(start, 0, roll="forward")
+    end = np.where(
+        calendar_days,
+        start + (length - 1).astype("timedelta64[D]"),
+        np.busday_offset(business_start, length - 1, roll="forward"),
+    )
+    start = np.where(calendar_days, start, business_start)
+
+    future = start > as_of
+    status = np.empty(leave_count, dtype=object)
+    status[future] = _choose(rng, FUTURE_STATUSES, int(future.sum()))
+    status[~future] = _choose(rng, PAST_STATUSES, int((~future).sum()))
+    decline_reason = np.where(status == "Declined", _choose(rng, [(r, 1) for r in DECLINE_REASONS], leave_count), None)
+    recall_reason = np.where(status == "Recalled", _choose(rng, [(r, 1) for r in RECALL_REASONS], leave_count), None)
+    half_day = (type_names[type_index] == "Annual") & (length == 1) & (rng.random(leave_count) < HALF_DAY_SHARE)
+
+    # Ids follow start dates, as requests are mostly filed in date order.
+    order = np.argsort(start, kind="stable")
+    leaves = {
+        "id": np.arange(1, leave_count + 1),
+        "employee_id": employees["AUUID"][rng.integers(0, employee_count, size=leave_count)][order],
+        "leave_type": type_names[type_index][order],
+        "start_date": np.datetime_as_string(start[order]).astype(object),
+        "end_date": np.datetime_as_string(end[order]).astype(object),
+        "description": np.char.add(type_names[type_index][order].astype(str), " leave").astype(object),
+        "attachment": (is_sick & (length > 2))[order],
+        "status": status[order],
+        "decline_reason": decline_reason[order],
+        "recall_reason": recall_reason[order],
+        "start_half_day": half_day[order],
+        "end_half_day": np.zeros(leave_count, dtype=bool),
+    }
+    return SyntheticData(employees, entitlements, leaves)
+
+
+# ---- loaders ----
+
+SQLITE_COLUMNS = {
+    "employees": ("employee_table", {
+        "id": "AUUID", "name": "First_Name", "surname": "Last_Name", "partner": "Partner",
+        "department": "Department", "position": "Position", "salary": "Salary",
+    }),
+    "leave_entitlements": ("leave_entitlements", {
+        column: column for column in ("employee_id", "annual_leave", "sick_leave", "compensation_leave",
+                                      "maternity_leave_days", "paternity_leave_days")
+    }),
+    "leaves": ("off_roll_leave", {
+        column: column for column in ("id", "employee_id", "leave_type", "start_date", "end_date", "description",
+                                      "attachment", "status", "decline_reason", "recall_reason",
+                                      "start_half_day", "end_half_day")
+    }),
+}
+
+
+def load_sqlite(backend, data):
+    """Bulk-loads ``data`` into a ``SQLiteBackend``, replacing its rows.
+
+    Secondary indexes are dropped for the load and rebuilt afterwards, then
+    ``leave_stats`` and the planner statistics are refreshed.
+    """
+    from leave_store.sqlite_backend import INDEXES
+
+    with backend.transaction() as conn:
+        for statement in INDEXES:
+            conn.execute(f"DROP INDEX IF EXISTS {INDEX_NAME.search(statement).group(1)}")
+        for table, (source, columns) in SQLITE_COLUMNS.items():
+            conn.execute(f"DELETE FROM {table}")
+            conn.executemany(
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                data.tuples(source, list(columns.values()))
+            )
+        for statement in INDEXES:
+            conn.execute(statement)
+    backend.rebuild_leave_stats()
+    backend.execute("ANALYZE")
+
+
+def write_json(data, directory):
+    """Writes one ``<table>.json`` array per table, for ``load_json``."""
+    os.makedirs(directory, exist_ok=True)
+    for table in TABLES:
+        with open(os.path.join(directory, f"{table}.json"), "w") as handle:
+            json.dump(data.records(table), handle)
+
+
+def load_json(client, directory):
+    """Loads the ``write_json`` files into a ``PostgRESTStandIn``."""
+    for table in TABLES:
+        with open(os.path.join(directory, f"{table}.json")) as handle:
+            client.load(table, json.load(handle))
+
+
+def load_standin(client, data):
+    """Loads ``data`` straight into a ``PostgRESTStandIn``."""
+    for table in TABLES:
+        client.load(table, data.records(table))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic organisation and leave history.")
+    parser.add_argument("--employees", type=int, default=500, help=f"team size ({MIN_EMPLOYEES}-{MAX_EMPLOYEES})")
+    parser.add_argument("--leaves", type=int, default=None, help="number of leaves (default ~7 per employee-year)")
+    parser.add_argument("--years", type=int, default=DEFAULT_YEARS, help="years of history")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--as-of", type=date.fromisoformat, default=None, help="reference date (default today)")
+    parser.add_argument("--sqlite", help="SQLite database file to load")
+    parser.add_argument("--json", help="directory to write <table>.json files to")
+    args = parser.parse_args(argv)
+    if not args.sqlite and not args.json:
+        parser.error("give --sqlite and/or --json")
+
+    tick = time.perf_counter()
+    data = generate(args.employees, args.seed, args.years, args.as_of, args.leaves)
+    print(f"Generated {data.employee_count} employees and {len(data)} leaves in {time.perf_counter() - tick:.1f}s")
+    if args.sqlite:
+        from leave_store.sqlite_backend import SQLiteBackend
+        tick = time.perf_counter()
+        backend = SQLiteBackend(args.sqlite)
+        load_sqlite(backend, data)
+        backend.pool.close()
+        print(f"Loaded {args.sqlite} in {time.perf_counter() - tick:.1f}s")
+    if args.json:
+        tick = time.perf_counter()
+        write_json(data, args.json)
+        print(f"Wrote {args.json} in {time.perf_counter() - tick:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,295 +1,23 @@
 # manager_view.py
 import streamlit as st
+from collections import Counter
 from datetime import date, timedelta, datetime
-from supabase import create_client, Client
 import pandas as pd # Still useful for DataFrame conversion
 
-# Initialize Supabase client
-@st.cache_resource
-def init_supabase():
-    """Initialize Supabase client with credentials from Streamlit secrets."""
-    url = st.secrets["SUPABASE_URL"]
-    key = st.secrets["SUPABASE_KEY"]
-    supabase: Client = create_client(url, key)
-    return supabase
-
-
-
-def get_employee_by_name(employee_name):
-    """Fetches employee details by name from Supabase."""
-    supabase = init_supabase()
-    try:
-        response = supabase.table("employee_table").select("AUUID, First_Name").eq("First_Name", employee_name).execute()
-        if response.data:
-            # Supabase returns a list of dictionaries, fetchone equivalent
-            return response.data[0]
-        return None
-    except Exception as e:
-        st.error(f"Error fetching employee by name: {str(e)}")
-        return None
-
-def apply_for_leave(employee_id, leave_type, start_date, end_date, description, attachment):
-    """Adds a new leave application to the Supabase database."""
-    supabase = init_supabase()
-    try:
-        response = supabase.table("off_roll_leave").insert({
-            "employee_id": employee_id,
-            "leave_type": leave_type,
-            "start_date": start_date.isoformat(),
-            "end_date": end_date.isoformat(),
-            "description": description,
-            "attachment": bool(attachment),
-            "status": "Pending"
-        }).execute()
-        if response.data:
-            return True, "Leave request submitted successfully!"
-        return False, "Failed to submit leave request"
-    except Exception as e:
-        return False, f"Error submitting leave request: {str(e)}"
-
-def get_leave_history(employee_id):
-    """Fetches the leave history for a specific employee from Supabase."""
-    supabase = init_supabase()
-    try:
-        response = supabase.table("off_roll_leave").select(
-            "leave_type, start_date, end_date, description, status, decline_reason, recall_leave"
-        ).eq("employee_id", employee_id).order("start_date", desc=True).execute()
-
-        if response.data:
-            # Convert to list of tuples for consistency with original SQLite output format
-            history = []
-            for row in response.data:
-                history.append((
-                    row['leave_type'],
-                    row['start_date'],
-                    row['end_date'],
-                    row['description'],
-                    row['status'],
-                    row.get('decline_reason'),
-                    row.get('recall_reason')
-                ))
-            return history
-        return []
-    except Exception as e:
-        st.error(f"Error fetching leave history: {str(e)}")
-        return []
-
-def get_all_pending_leaves():
-    """Fetches all leave requests with a 'Pending' status for the manager from Supabase."""
-    supabase = init_supabase()
-    try:
-        # Join leaves with employees to get employee name
-        response = supabase.table("off_roll_leave").select(
-            "AUUID, employee_id, leave_type, start_date, end_date, description, employee_table(First_Name)"
-        ).eq("status", "Pending").execute()
-
-        if response.data:
-            pending_leaves = []
-            for row in response.data:
-                # Extract employee name from the nested 'employees' dictionary
-                employee_name = row['employee_table']['First_Name'] if row['employee_table'] else None
-                pending_leaves.append({
-                    "id": row['employee_id'],
-                    "employee_name": employee_name,
-                    "leave_type": row['leave_type'],
-                    "start_date": row['start_date'],
-                    "end_date": row['end_date'],
-                    "description": row['description']
-                })
-            return pending_leaves
-        return []
-    except Exception as e:
-        st.error(f"Error fetching pending leaves: {str(e)}")
-        return []
-
-def get_approved_leaves():
-    """Fetches all leave requests with an 'Approved' status from Supabase."""
-    supabase = init_supabase()
-    try:
-        response = supabase.table("off_roll_leave").select(
-            "AUUID, employee_id, leave_type, start_date, end_date, description, employee_table(First_Name)"
-        ).eq("status", "Approved").execute()
-
-        if response.data:
-            approved_leaves = []
-            for row in response.data:
-                employee_name = row['employee_table']['First_Name'] if row['employee_table'] else None
-                approved_leaves.append({
-                    "id": row['AUUID'],
-                    "employee_name": employee_name,
-                    "leave_type": row['leave_type'],
-                    "start_date": row['start_date'],
-                    "end_date": row['end_date'],
-                    "description": row['description']
-                })
-            return approved_leaves
-        return []
-    except Exception as e:
-        st.error(f"Error fetching approved leaves: {str(e)}")
-        return []
-
-def update_leave_status(employee_id, new_status, reason=None):
-    """Updates the status of a leave request in Supabase."""
-    supabase = init_supabase()
-    update_data = {"status": new_status}
-    if new_status == "Declined":
-        update_data["decline_reason"] = reason
-    elif new_status == "Recalled":
-        update_data["recall_leave"] = reason
-    elif new_status == "Withdrawn": # Added for consistency with withdraw_leave
-        update_data["recall_leave"] = reason
-
-    try:
-        response = supabase.table("off_roll_leave").update(update_data).eq("employee_id", employee_id).execute()
-        if response.data:
-            return True, f"Leave status updated to {new_status}"
-        return False, "Failed to update leave status"
-    except Exception as e:
-        return False, f"Error updating leave status: {str(e)}"
-
-def get_team_leaves(status_filter=None, leave_type_filter=None, employee_filter=None):
-    """Fetches all team leaves with optional filters for the manager's dashboard from Supabase."""
-    supabase = init_supabase()
-    try:
-        query = supabase.table("off_roll_leave").select(
-            "employee_id, leave_type, start_date, end_date, status, description, decline_reason, employee_table(First_Name)"
-        )
-
-        if status_filter:
-            query = query.in_("status", status_filter)
-        if leave_type_filter:
-            query = query.in_("leave_type", leave_type_filter) # Corrected potential typo: ensure it's not `query = query = query.in_`
-        if employee_filter and employee_filter != "All Team Members":
-            query = query.eq("employee_table.First_Name", employee_filter)
-
-        response = query.execute()
-
-        if response.data:
-            leaves = []
-            for row in response.data:
-                employee_name = row['employee_table']['First_Name'] if row['employee_table'] else None
-                leaves.append({ # <--- THIS IS THE KEY CHANGE! Now creating a dictionary
-                    "employee_name": employee_name, # Add the key "employee_name":
-                    "leave_type": row['leave_type'],
-                    "start_date": row['start_date'],
-                    "end_date": row['end_date'],
-                    "status": row['status'],
-                    "description": row['description'],
-                    "decline_reason": row.get('decline_reason')
-                })
-            return leaves
-        return []
-    except Exception as e:
-        st.error(f"Error fetching team leaves: {str(e)}")
-        return []
-
-def get_all_employees_from_db():
-    """Gets a unique list of all employees from the employees table in Supabase."""
-    supabase = init_supabase()
-    try:
-        response = supabase.table("employee_table").select("First_Name").order("First_Name", desc=False).execute()
-        if response.data:
-            employees = [row['First_Name'] for row in response.data]
-            return employees
-        return []
-    except Exception as e:
-        st.error(f"Error fetching employees: {str(e)}")
-        return []
-
-def get_all_leaves():
-    """Fetches all leave records from Supabase, joining with employee names."""
-    supabase = init_supabase()
-    try:
-        response = supabase.table("off_roll_leave").select(
-            "AUUID, leave_type, start_date, end_date, description, status, employee_table(First_Name)"
-        ).execute()
-
-        if response.data:
-            leaves = []
-            for row in response.data:
-                employee_name = row['employee_table']['First Name'] if row['employee_table'] else None
-                leaves.append({
-                    "id": row["AUUID"],
-                    "name": employee_name,
-                    "type": row["leave_type"],
-                    "start": row["start_date"],
-                    "end": row["end_date"],
-                    "description": row["description"],
-                    "status": row["status"]
-                })
-            return leaves
-        return []
-    except Exception as e:
-        st.error(f"Error fetching all leaves: {str(e)}")
-        return []
-
-def withdraw_leave(leave_id, recall_reason=None):
-    """Marks a leave request as Withdrawn in Supabase with an optional reason."""
-    # This calls update_leave_status for consistency
-    return update_leave_status(employee_id, "Withdrawn", recall_reason)
-
-def get_latest_leave_entry():
-    """Fetches the details of the most recently added leave entry from Supabase."""
-    supabase = init_supabase()
-    try:
-        response = supabase.table("off_roll_leave").select(
-            "leave_type, start_date, end_date, description, status, decline_reason, recall_reason, employee_table(First_Name)"
-        ).order("id", desc=True).limit(1).execute()
-
-        if response.data:
-            row = response.data[0]
-            employee_name = row['employee_table']['First_Name'] if row['employees'] else None
-            return {
-                "employee_name": employee_name,
-                "leave_type": row['leave_type'],
-                "start_date": row['start_date'],
-                "end_date": row['end_date'],
-                "description": row['description'],
-                "status": row['status'],
-                "decline_reason": row.get('decline_reason'),
-                "recall_reason": row.get('recall_reason')
-            }
-        return None
-    except Exception as e:
-        st.error(f"Error fetching latest leave entry: {str(e)}")
-        return None
-
-def get_employee_leave_entitlements(employee_id):
-    """Fetches leave entitlements for a given employee from Supabase."""
-    supabase = init_supabase()
-    try:
-        response = supabase.table("leave_entitlements").select("*").eq("employee_id", employee_id).execute()
-        if response.data:
-            return response.data[0] # Return the first matching record
-        return None
-    except Exception as e:
-        st.error(f"Error fetching employee leave entitlements: {str(e)}")
-        return None
-
-def get_employee_used_leave(employee_id, leave_type=None):
-    """Calculates total used leave days for an employee, optionally by type, from Supabase."""
-    supabase = init_supabase()
-    try:
-        query = supabase.table("off_roll_leave").select("start_date, end_date").eq("employee_id", employee_id).eq("status", "Approved")
-        if leave_type:
-            query = query.eq("leave_type", leave_type)
-
-        response = query.execute()
-        used_days = 0
-        if response.data:
-            for record in response.data:
-                start = datetime.fromisoformat(record['start_date'])
-                end = datetime.fromisoformat(record['end_date'])
-                used_days += (end - start).days + 1 # +1 to include start and end day
-        return int(used_days)
-    except Exception as e:
-        st.error(f"Error calculating used leave: {str(e)}")
-        return 0
-
-# Initialize DB (ensure this runs only once per session)
-#if 'db_initialized_supabase' not in st.session_state:
-#    init_db_supabase()
-#    st.session_state['db_initialized_supabase'] = True
+from leave_store import (
+    DEFAULT_PAGE_SIZE,
+    PAGE_SIZES,
+    get_leave_snapshot,
+    get_employee_directory,
+    get_team_leaves_frame,
+    update_leave_status,
+    update_leave_statuses,
+    search_employees,
+    get_team_leave_balances,
+    get_leave_stats,
+    load_page_data,
+    timed,
+)
 
 st.set_page_config(layout="wide") # Use wide layout for better display
 
@@ -351,17 +79,96 @@ st.html("""
 </div>
 """)
 
-def pending_leaves_view():
+def bulk_result_report():
+    """Shows the per-request outcome of the last bulk action, once, after its rerun."""
+    report = st.session_state.pop("bulk_report", None)
+    if not report:
+        return
+    succeeded = [label for label, (ok, _) in report["results"] if ok]
+    failed = [(label, message) for label, (ok, message) in report["results"] if not ok]
+    if succeeded:
+        st.success(f"{report['action']} {len(succeeded)} request(s).")
+    if failed:
+        st.error(f"{len(failed)} request(s) could not be updated.")
+        with st.expander("Failed requests", expanded=True):
+            for label, message in failed:
+                st.write(f"**{label}:** {message}")
+
+def bulk_actions_form(pending_leaves):
+    labels = {
+        leave["id"]: f"{leave['employee_name']} ({leave['leave_type']}) - {leave['start_date']} to {leave['end_date']}"
+        for leave in pending_leaves
+    }
+    with st.form("bulk_actions"):
+        st.subheader("Bulk Actions")
+        select_all = st.checkbox(f"Select all {len(pending_leaves)} pending requests")
+        selected_ids = st.multiselect("Requests", list(labels), format_func=labels.get)
+        action = st.radio("Action", ["Approve", "Decline"], horizontal=True)
+        decline_reason = st.text_input("Reason for declining (required to decline):")
+        submitted = st.form_submit_button("Apply to selected")
+
+    if not submitted:
+        return
+    leave_ids = list(labels) if select_all else selected_ids
+    if not leave_ids:
+        st.warning("Select at least one request.")
+        return
+    if action == "Decline" and not decline_reason:
+        st.warning("A reason is required to decline requests.")
+        return
+
+    new_status = "Approved" if action == "Approve" else "Declined"
+    results = update_leave_statuses(
+        leave_ids, new_status,
+        reason=decline_reason if new_status == "Declined" else None,
+        expected_status="Pending"
+    )
+    st.session_state["bulk_report"] = {
+        "action": new_status,
+        "results": [(labels[leave_id], results[leave_id]) for leave_id in leave_ids],
+    }
+    st.rerun()
+
+# Names listed in a coverage warning; the count covers the rest.
+MAX_COVERAGE_NAMES = 8
+
+def coverage_warning(team_intervals, department, leave):
+    """Shows how many of the requester's department are already on approved leave during the request.
+
+    ``team_intervals`` is None when the employee directory could not be loaded.
+    """
+    if team_intervals is None or not department or leave["start"] is None or leave["end"] is None:
+        st.caption("ℹ️ Team coverage could not be checked for this request.")
+        return
+    employee_id = leave["employee_id"]
+    index = team_intervals.get(department)
+    # A known department with no approved leave has no index: nobody overlaps.
+    count = index.count_overlapping(leave["start"], leave["end"], exclude_employee=employee_id) if index else 0
+    if not count:
+        st.caption("✅ No teammates are on approved leave during these dates.")
+        return
+    overlapping = index.overlapping(leave["start"], leave["end"], exclude_employee=employee_id,
+                                    limit=MAX_COVERAGE_NAMES)
+    names = ", ".join(dict.fromkeys(row["employee_name"] for row in overlapping))
+    more = f" and {count - len(overlapping)} more" if count > len(overlapping) else ""
+    st.warning(f"⚠️ {count} approved teammate leave(s) overlap these dates: {names}{more}")
+
+@timed("pending_leaves_view")
+def pending_leaves_view(snapshot):
     st.header("Pending Leave Requests for Review")
-    pending_leaves = get_all_pending_leaves()
+    bulk_result_report()
+    pending_leaves = snapshot.pending()
 
     if not pending_leaves:
         st.success("✨ All caught up! There are no pending leave requests.")
         return
 
+    bulk_actions_form(pending_leaves)
+    directory = get_employee_directory()
+    team_intervals = snapshot.team_intervals(directory) if directory is not None else None
+
     for leave in pending_leaves:
-        # Access by key name since row_factory is set to sqlite3.Row
-        employee_id = leave["id"]
+        leave_id = leave["id"]
         employee = leave["employee_name"]
         leave_type = leave["leave_type"]
         start_date = leave["start_date"]
@@ -373,34 +180,35 @@ def pending_leaves_view():
             st.write(f"**Leave Type:** {leave_type}")
             st.write(f"**Dates:** {start_date} to {end_date}")
             st.write(f"**Reason:** {description}")
+            department = directory.department(leave["employee_id"]) if directory is not None else None
+            coverage_warning(team_intervals, department, leave)
 
             col1, col2 = st.columns([1, 1])
             with col1:
-                if st.button("✅ Approve", key=f"approve_{employee_id}"):
-                    update_leave_status(employee_id, "Approved")
+                if st.button("✅ Approve", key=f"approve_{leave_id}"):
+                    update_leave_status(leave_id, "Approved")
                     st.success(f"Leave for {employee} approved.")
                     st.rerun()
             with col2:
-                if st.button("❌ Decline", key=f"decline_{employee_id}"):
-                    if f"show_reason_{employee_id}" not in st.session_state:
-                        st.session_state[f"show_reason_{employee_id}"] = False
-                    st.session_state[f"show_reason_{employee_id}"] = not st.session_state[f"show_reason_{employee_id}"]
-
-                    if st.session_state[f"show_reason_{employee_id}"]:
-                        decline_reason = st.text_input("Reason for declining:", key=f"reason_{employee_id}")
-                        if st.button("Confirm Decline", key=f"confirm_decline_{employee_id}"):
+                if st.button("❌ Decline", key=f"decline_{leave_id}"):
+                    if f"show_reason_{leave_id}" not in st.session_state:
+                        st.session_state[f"show_reason_{leave_id}"] = False
+                    st.session_state[f"show_reason_{leave_id}"] = not st.session_state[f"show_reason_{leave_id}"]
+
+                    if st.session_state[f"show_reason_{leave_id}"]:
+                        decline_reason = st.text_input("Reason for declining:", key=f"reason_{leave_id}")
+                        if st.button("Confirm Decline", key=f"confirm_decline_{leave_id}"):
                             if decline_reason:
-                                update_leave_status(employee_id, "Declined", reason=decline_reason)
+                                update_leave_status(leave_id, "Declined", reason=decline_reason)
                                 st.error(f"Leave for {employee} declined.")
                                 st.rerun()
                             else:
                                 st.warning("A reason is required to decline a request.")
 
-from datetime import datetime, date
-
-def approved_leaves_for_recall_view():
+@timed("approved_leaves_for_recall_view")
+def approved_leaves_for_recall_view(snapshot):
     st.header("Approved Leaves (for Recall)")
-    approved_leaves = get_approved_leaves()
+    approved_leaves = snapshot.approved()
 
     if not approved_leaves:
         st.info("No approved leaves currently.")
@@ -414,11 +222,9 @@ def approved_leaves_for_recall_view():
         end_date_str = leave["end_date"]
         description = leave["description"]
 
-        # Safe date parsing
-        try:
-            start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
-            end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
-        except ValueError:
+        # Dates are parsed once when the row is fetched; None means they were malformed.
+        start_date, end_date = leave["start"], leave["end"]
+        if start_date is None or end_date is None:
             st.error(f"⚠️ Invalid date format in leave ID {leave_id} for {employee}: {start_date_str} to {end_date_str}")
             continue  # Skip this entry
 
@@ -448,14 +254,33 @@ def approved_leaves_for_recall_view():
                 else:
                     st.error(f"Cannot recall leave for {employee}. Less than 3 days ({days_left} days) remaining or leave has ended.")
 
+# Matches offered by the employee picker; the widget never holds more.
+EMPLOYEE_PICKER_LIMIT = 20
+
+def employee_picker():
+    """Type-to-search employee filter backed by a limited prefix query; returns the chosen id or None.
+
+    Only the matches for the typed text reach the browser, however large
+    the team. The text input reruns on Enter or blur rather than per
+    keystroke, and each prefix's matches are cached.
+    """
+    typed = st.text_input("Search employee", placeholder="Type a name…", key="dashboard_employee_search")
+    matches = search_employees(typed, EMPLOYEE_PICKER_LIMIT) if typed.strip() else []
+    # Options are employee ids, so two people with the same name stay two choices.
+    name_counts = Counter(employee["name"] for employee in matches)
+    labels = {None: "All Team Members"}
+    for employee in matches:
+        name = employee["name"]
+        labels[employee["id"]] = name if name_counts[name] == 1 else f"{name} ({employee['id']})"
+    return st.selectbox("Filter by Employee", list(labels), index=1 if matches else 0, format_func=labels.get)
+
+@timed("team_leaves_dashboard_view")
 def team_leaves_dashboard_view():
     st.header("Team Leave Dashboard")
 
-    all_employees = ["All Team Members"] + get_all_employees_from_db()
-    
-    col1, col2, col3 = st.columns(3)
+    col1, col2, col3, col4 = st.columns([3, 3, 3, 1])
     with col1:
-        selected_employee = st.selectbox("Filter by Employee", all_employees)
+        selected_employee_id = employee_picker()
     with col2:
         selected_status = st.multiselect("Filter by Status", ["Pending", "Approved", "Declined", "Withdrawn", "Recalled"], default=["Pending", "Approved"])
     with col3:
@@ -463,45 +288,143 @@ def team_leaves_dashboard_view():
         # For full accuracy, you might fetch distinct leave types from the 'leaves' table.
         all_leave_types = ["Annual", "Sick", "Maternity", "Paternity", "Study", "Compassionate", "Unpaid"]
         selected_leave_type = st.multiselect("Filter by Leave Type", all_leave_types)
+    with col4:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, index=PAGE_SIZES.index(DEFAULT_PAGE_SIZE))
 
-    filtered_leaves = get_team_leaves(
+    filters = dict(
         status_filter=selected_status if selected_status else None,
         leave_type_filter=selected_leave_type if selected_leave_type else None,
-        employee_filter=selected_employee if selected_employee != "All Team Members" else None
+        employee_id=selected_employee_id
     )
 
-    if not filtered_leaves:
+    # Keyset pagination: keep the cursor of every page visited so far so
+    # "Previous" can step back; any filter change starts again at page 1.
+    paging_key = (repr(filters), page_size)
+    if st.session_state.get("dashboard_paging_key") != paging_key:
+        st.session_state["dashboard_paging_key"] = paging_key
+        st.session_state["dashboard_cursors"] = [None]
+        st.session_state["dashboard_total"] = None
+    cursors = st.session_state["dashboard_cursors"]
+
+    # Only the first page pays for the count; later pages reuse it.
+    first_page = len(cursors) == 1
+    page = get_team_leaves_frame(**filters, after=cursors[-1], page_size=page_size,
+                                 count="exact" if first_page else None)
+    if first_page:
+        st.session_state["dashboard_total"] = (page.total, page.total_is_estimate)
+    total, total_is_estimate = st.session_state["dashboard_total"] or (None, False)
+
+    if page.rows.empty:
         st.info("No team leaves found matching the selected filters.")
         return
 
-    # Display results in a table for better readability
+    # Display results in a table for better readability. The page is already
+    # a typed DataFrame, so it is handed to Streamlit column by column.
     st.subheader("Filtered Team Leaves")
-    leave_data = []
-    for leave in filtered_leaves:
-        leave_data.append({
-            "Employee": leave["employee_name"],
-            "Leave Type": leave["leave_type"],
-            "Start Date": leave["start_date"],
-            "End Date": leave["end_date"],
-            "Status": leave["status"],
-            "Description": leave["description"],
-            "Decline Reason": leave["decline_reason"] if leave["decline_reason"] else "N/A"
-        })
-
-    st.dataframe(leave_data, use_container_width=True)
+    leave_data = page.rows.drop(columns=["id", "employee_id"]).rename(columns={
+        "employee_name": "Employee",
+        "leave_type": "Leave Type",
+        "start_date": "Start Date",
+        "end_date": "End Date",
+        "status": "Status",
+        "description": "Description",
+        "decline_reason": "Decline Reason",
+    })
+    reasons = leave_data["Decline Reason"]
+    leave_data["Decline Reason"] = reasons.mask(reasons.isna() | (reasons == ""), "N/A")
+
+    st.dataframe(
+        leave_data,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Start Date": st.column_config.DateColumn(format="YYYY-MM-DD"),
+            "End Date": st.column_config.DateColumn(format="YYYY-MM-DD"),
+        }
+    )
+
+    first_row = (len(cursors) - 1) * page_size + 1
+    shown = f"Rows {first_row}–{first_row + len(page.rows) - 1}"
+    if total is not None:
+        shown += f" of {'~' if total_is_estimate else ''}{total}"
+    nav_prev, nav_label, nav_next = st.columns([1, 4, 1])
+    with nav_prev:
+        if st.button("◀ Previous", key="dashboard_prev", disabled=first_page):
+            cursors.pop()
+            st.rerun()
+    with nav_label:
+        st.caption(shown)
+    with nav_next:
+        if st.button("Next ▶", key="dashboard_next", disabled=page.next_cursor is None):
+            cursors.append(page.next_cursor)
+            st.rerun()
+
+@timed("leave_balances_view")
+def leave_balances_view(balances):
+    st.header("Team Leave Balances")
+
+    if balances is None or balances.empty:
+        st.info("No leave entitlements or approved leaves found.")
+        return
+
+    st.dataframe(
+        balances.rename(columns={
+            "employee_name": "Employee",
+            "leave_type": "Leave Type",
+            "entitled": "Entitled",
+            "used": "Used",
+            "remaining": "Remaining",
+        }).drop(columns=["employee_id"]),
+        use_container_width=True,
+        hide_index=True
+    )
+
+@timed("kpi_tiles")
+def kpi_tiles(year_stats, pending_stats):
+    """Headline counts read from the leave_stats summary rather than the leave table.
+
+    ``year_stats`` are this year's rows; ``pending_stats`` the Pending rows of every year.
+    """
+    year = date.today().year
+
+    def total(field, status, stats=year_stats):
+        return sum(row[field] for row in stats if row["status"] == status)
+
+    days_taken = total("days", "Approved")
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Pending Requests", total("requests", "Pending", pending_stats))
+    col2.metric(f"Approved in {year}", total("requests", "Approved"))
+    col3.metric(f"Days Taken in {year}", f"{days_taken:g}")
+    col4.metric(f"Declined in {year}", total("requests", "Declined"))
 
 # Main app structure with tabs for manager
-tab1, tab2, tab3 = st.tabs(["Pending Requests", "Approved Leaves (Recall)", "Team Leave Dashboard"])
+# One fetch per rerun for the pending and recall tabs; the dashboard pages
+# through the full history on the server instead. The reads below do not
+# depend on each other, so they are issued together.
+page_data = load_page_data({
+    "snapshot": get_leave_snapshot,
+    "year_stats": lambda: get_leave_stats(year=date.today().year),
+    "pending_stats": lambda: get_leave_stats(status="Pending"),
+    # Entitlements are per year, so only this year's leave is set against them.
+    "balances": lambda: get_team_leave_balances(year=date.today().year),
+})
+snapshot = page_data["snapshot"]
+kpi_tiles(page_data["year_stats"], page_data["pending_stats"])
+
+tab1, tab2, tab3, tab4 = st.tabs(["Pending Requests", "Approved Leaves (Recall)", "Team Leave Dashboard", "Leave Balances"])
 
 with tab1:
-    pending_leaves_view()
+    pending_leaves_view(snapshot)
 
 with tab2:
-    approved_leaves_for_recall_view()
+    approved_leaves_for_recall_view(snapshot)
 
 with tab3:
     team_leaves_dashboard_view()
 
+with tab4:
+    leave_balances_view(page_data["balances"])
+
 # Footer (existing)
 st.markdown("---")
 st.html("""
@@ -0,0 +1,314 @@
+# leave_store/__init__.py
+"""Shared data-access layer for the manager pages.
+
+Every page imports its leave and employee queries from here instead of
+carrying its own copy. The backend is chosen from Streamlit secrets:
+
+    LEAVE_BACKEND = "supabase"          # default, uses SUPABASE_URL / SUPABASE_KEY
+    LEAVE_BACKEND = "supabase-sync"     # reads from a delta-synced in-memory copy
+    LEAVE_BACKEND = "supabase-replica"  # reads from a local SQLite replica (REPLICA_PATH)
+    LEAVE_BACKEND = "sqlite"            # uses DATABASE_PATH
+
+and is created once per process with ``st.cache_resource`` so all sessions
+and pages share the same client / connection. Reads go through a shared
+TTL cache (see ``leave_store.cache``) that writes invalidate.
+
+Leave is charged in working days, maternity and paternity leave in calendar
+days (see ``leave_store.durations``):
+
+    HOLIDAY_CALENDAR = "KE"             # public holidays by country, "NONE" for weekends only
+    HOLIDAY_CALENDAR = "PUBLIC_HOLIDAYS"  # the Supabase public_holidays table (Supabase backends only)
+    HOLIDAYS = ["2025-03-31"]           # extra one-off holidays
+
+Pages load their independent reads together unless CONCURRENT_PAGE_LOADS =
+false (kept as a switch to compare against the serial path).
+
+Every query and page render is timed into ``RECORDER`` (see
+``leave_store.metrics``); the sidebar's performance panel shows the current
+rerun and exports the totals.
+"""
+import streamlit as st
+
+from .base import LeaveBackend, TEAM_FILTER_ALL, HISTORY_FIELDS
+from .cache import CachedBackend
+from .calendar_range import MonthPrefetcher, adjacent_months, month_bounds, months_between, parse_dates_set
+from .concurrency import run_concurrently, run_serially
+from .directory import EmployeeDirectory
+from .durations import (DEFAULT_COUNTRY, PUBLIC_HOLIDAYS_TABLE, HolidayCalendar, holidays_from_dates,
+                        register_holiday_rule)
+from .frames import empty_leave_frame
+from .metrics import RECORDER, InstrumentedClient, current_session, timed
+from .overlaps import LeaveIntervalIndex
+from .pagination import DEFAULT_PAGE_SIZE, PAGE_SIZES, LeavePage, page_cursor
+from .records import Employee, LeaveHistoryEntry, LeaveRecord
+from .snapshot import LeaveSnapshot, snapshot_window
+from .timeline import AbsenceTimeline
+
+DEFAULT_DATABASE_PATH = "leave_management.db"
+
+
+@st.cache_resource
+def get_backend():
+    """Creates the configured backend once and shares it across sessions."""
+    return CachedBackend(_create_backend())
+
+
+@st.cache_resource
+def get_month_prefetcher():
+    """Background pool that warms the calendar's neighbouring months."""
+    return MonthPrefetcher()
+
+
+def _holiday_calendar(remote=None):
+    """The configured ``HolidayCalendar``; the ``public_holidays`` source is read through ``remote``."""
+    country = st.secrets.get("HOLIDAY_CALENDAR", DEFAULT_COUNTRY)
+    if country == PUBLIC_HOLIDAYS_TABLE:
+        if remote is None:
+            raise ValueError(f"HOLIDAY_CALENDAR = {PUBLIC_HOLIDAYS_TABLE} needs a Supabase LEAVE_BACKEND")
+        register_holiday_rule(PUBLIC_HOLIDAYS_TABLE, holidays_from_dates(remote.get_public_holidays()))
+    return HolidayCalendar(country, st.secrets.get("HOLIDAYS", ()))
+
+
+def _create_backend():
+    # Backends take the calendar when created: SQLite may rebuild leave_stats
+    # while migrating, and must count days with the configured holidays.
+    kind = st.secrets.get("LEAVE_BACKEND", "supabase")
+    if kind == "sqlite":
+        from .sqlite_backend import SQLiteBackend
+        return SQLiteBackend(st.secrets.get("DATABASE_PATH", DEFAULT_DATABASE_PATH), calendar=_holiday_calendar())
+    if kind in ("supabase", "supabase-sync", "supabase-replica"):
+        from supabase import create_client
+        from .supabase_backend import SupabaseBackend
+        remote = SupabaseBackend(InstrumentedClient(create_client(st.secrets["SUPABASE_URL"], st.secrets["SUPABASE_KEY"])))
+        remote.calendar = _holiday_calendar(remote)
+        if kind == "supabase":
+            return remote
+        if kind == "supabase-replica":
+            from .replica import DEFAULT_REFRESH_SECONDS, DEFAULT_REPLICA_PATH, ReplicaBackend
+            return ReplicaBackend(
+                remote,
+                replica_path=st.secrets.get("REPLICA_PATH", DEFAULT_REPLICA_PATH),
+                refresh_seconds=st.secrets.get("REPLICA_REFRESH_SECONDS", DEFAULT_REFRESH_SECONDS)
+            )
+        from .sync import DEFAULT_MAX_STALENESS, DeltaSync, MemoryReplica, SyncedBackend
+        return SyncedBackend(
+            remote,
+            DeltaSync(remote.client, MemoryReplica()),
+            max_staleness=st.secrets.get("SYNC_MAX_STALENESS", DEFAULT_MAX_STALENESS)
+        )
+    raise ValueError(f"Unknown LEAVE_BACKEND: {kind}")
+
+
+def load_page_data(calls):
+    """Runs a page's independent facade reads, concurrently unless CONCURRENT_PAGE_LOADS is false.
+
+    ``calls`` maps names to zero-argument callables; returns ``{name: result}``.
+    """
+    if st.secrets.get("CONCURRENT_PAGE_LOADS", True):
+        return run_concurrently(calls)
+    return run_serially(calls)
+
+def get_employee_by_name(employee_name):
+    """Fetches employee details by name."""
+    try:
+        return get_backend().get_employee_by_name(employee_name)
+    except Exception as e:
+        st.error(f"Error fetching employee by name: {str(e)}")
+        return None
+
+def apply_for_leave(employee_id, leave_type, start_date, end_date, description, attachment,
+                    start_half_day=False, end_half_day=False):
+    """Adds a new leave application."""
+    try:
+        return get_backend().apply_for_leave(employee_id, leave_type, start_date, end_date, description, attachment,
+                                             start_half_day, end_half_day)
+    except Exception as e:
+        return False, f"Error submitting leave request: {str(e)}"
+
+def get_leave_history(employee_id):
+    """Fetches the leave history for a specific employee."""
+    try:
+        return get_backend().get_leave_history(employee_id)
+    except Exception as e:
+        st.error(f"Error fetching leave history: {str(e)}")
+        return []
+
+def get_all_pending_leaves():
+    """Fetches all leave requests with a 'Pending' status for the manager."""
+    try:
+        return get_backend().get_all_pending_leaves()
+    except Exception as e:
+        st.error(f"Error fetching pending leaves: {str(e)}")
+        return []
+
+def get_approved_leaves():
+    """Fetches all leave requests with an 'Approved' status."""
+    try:
+        return get_backend().get_approved_leaves()
+    except Exception as e:
+        st.error(f"Error fetching approved leaves: {str(e)}")
+        return []
+
+def update_leave_status(leave_id, new_status, reason=None):
+    """Updates the status of a leave request (Approve, Decline, Recall, Withdraw)."""
+    try:
+        return get_backend().update_leave_status(leave_id, new_status, reason)
+    except Exception as e:
+        return False, f"Error updating leave status: {str(e)}"
+
+def update_leave_statuses(leave_ids, new_status, reason=None, expected_status=None):
+    """Updates many leave requests in one round trip; returns ``{leave_id: (success, message)}``."""
+    leave_ids = list(leave_ids)
+    try:
+        return get_backend().update_leave_statuses(leave_ids, new_status, reason, expected_status)
+    except Exception as e:
+        return {leave_id: (False, f"Error updating leave status: {str(e)}") for leave_id in leave_ids}
+
+def get_team_leaves(status_filter=None, leave_type_filter=None, employee_filter=None, employee_id=None):
+    """Fetches all team leaves with optional filters for the manager's dashboard."""
+    try:
+        return get_backend().get_team_leaves(status_filter, leave_type_filter, employee_filter, employee_id)
+    except Exception as e:
+        st.error(f"Error fetching team leaves: {str(e)}")
+        return []
+
+def get_team_leaves_page(status_filter=None, leave_type_filter=None, employee_filter=None,
+                         after=None, page_size=DEFAULT_PAGE_SIZE, count="exact", employee_id=None):
+    """Fetches one page of team leaves ordered by start date, after the given keyset cursor."""
+    try:
+        return get_backend().get_team_leaves_page(status_filter, leave_type_filter, employee_filter,
+                                                  after, page_size, count, employee_id)
+    except Exception as e:
+        st.error(f"Error fetching team leaves: {str(e)}")
+        return LeavePage([], None, None, False)
+
+def get_team_leaves_frame(status_filter=None, leave_type_filter=None, employee_filter=None,
+                          after=None, page_size=DEFAULT_PAGE_SIZE, count="exact", employee_id=None):
+    """Like ``get_team_leaves_page``, with the rows as a typed DataFrame ready for ``st.dataframe``."""
+    try:
+        return get_backend().get_team_leaves_frame(status_filter, leave_type_filter, employee_filter,
+                                                   after, page_size, count, employee_id)
+    except Exception as e:
+        st.error(f"Error fetching team leaves: {str(e)}")
+        return LeavePage(empty_leave_frame(), None, None, False)
+
+def get_leave_snapshot(window_days=None):
+    """Loads pending leaves plus every leave overlapping the snapshot window, indexed in memory.
+
+    Call once per rerun and derive the tab lists from the returned snapshot.
+    """
+    window_start, window_end = snapshot_window() if window_days is None else snapshot_window(window_days=window_days)
+    try:
+        return get_backend().get_leave_snapshot(window_start, window_end)
+    except Exception as e:
+        st.error(f"Error fetching leaves: {str(e)}")
+        return LeaveSnapshot([], window_start, window_end)
+
+def get_employee_directory():
+    """Shared ``EmployeeDirectory`` of the roster, or None if it cannot be loaded."""
+    try:
+        return get_backend().get_employee_directory()
+    except Exception as e:
+        st.error(f"Error fetching employee directory: {str(e)}")
+        return None
+
+def search_employees(prefix, limit=None):
+    """Employees whose name, or a word of it, starts with ``prefix``."""
+    try:
+        return get_backend().search_employees(prefix, limit)
+    except Exception as e:
+        st.error(f"Error searching employees: {str(e)}")
+        return []
+
+def get_all_employees_from_db():
+    """Gets a unique list of all employee names."""
+    try:
+        return get_backend().get_all_employees_from_db()
+    except Exception as e:
+        st.error(f"Error fetching employees: {str(e)}")
+        return []
+
+def get_all_leaves():
+    """Fetches all leave records, joined with employee names."""
+    try:
+        return get_backend().get_all_leaves()
+    except Exception as e:
+        st.error(f"Error fetching all leaves: {str(e)}")
+        return []
+
+def withdraw_leave(leave_id, recall_reason=None):
+    """Marks a leave request as Withdrawn with an optional reason."""
+    return update_leave_status(leave_id, "Withdrawn", recall_reason)
+
+def get_latest_leave_entry():
+    """Fetches the details of the most recently added leave entry."""
+    try:
+        return get_backend().get_latest_leave_entry()
+    except Exception as e:
+        st.error(f"Error fetching latest leave entry: {str(e)}")
+        return None
+
+def get_employee_leave_entitlements(employee_id):
+    """Fetches leave entitlements for a given employee."""
+    try:
+        return get_backend().get_employee_leave_entitlements(employee_id)
+    except Exception as e:
+        st.error(f"Error fetching employee leave entitlements: {str(e)}")
+        return None
+
+def get_team_leave_balances(employee_ids=None, year=None):
+    """Entitled, used and remaining days per employee and leave type, for the whole team in one DataFrame."""
+    try:
+        return get_backend().get_team_leave_balances(employee_ids, year)
+    except Exception as e:
+        st.error(f"Error calculating leave balances: {str(e)}")
+        return None
+
+def get_calendar_leaves(range_start, range_end, status_filter=("Approved",)):
+    """Fetches the leaves overlapping the visible calendar range, month by month, and prefetches the adjacent months."""
+    try:
+        backend = get_backend()
+        status_filter = list(status_filter) if status_filter else None
+        start, end = range_start.isoformat(), range_end.isoformat()
+        rows = {}
+        for first, last in months_between(range_start, range_end):
+            for row in backend.get_leaves_in_range(first, last, status_filter):
+                if row["start_date"] <= end and row["end_date"] >= start:
+                    rows[row["id"]] = row
+        get_month_prefetcher().prefetch(backend, adjacent_months(range_start, range_end), status_filter)
+        return sorted(rows.values(), key=page_cursor)
+    except Exception as e:
+        st.error(f"Error fetching calendar leaves: {str(e)}")
+        return []
+
+def get_leave_stats(year=None, status=None):
+    """Fetches the per-employee, per-type, per-status request and day counts from ``leave_stats``."""
+    try:
+        return get_backend().get_leave_stats(year, status)
+    except Exception as e:
+        st.error(f"Error fetching leave statistics: {str(e)}")
+        return []
+
+def rebuild_leave_stats():
+    """Recomputes the ``leave_stats`` summary from the leave table."""
+    try:
+        get_backend().rebuild_leave_stats()
+        return True, "Leave statistics rebuilt"
+    except Exception as e:
+        return False, f"Error rebuilding leave statistics: {str(e)}"
+
+def get_absence_timeline(range_start, range_end):
+    """People on approved leave per day between two dates, by leave type and department."""
+    try:
+        return get_backend().get_absence_timeline(range_start, range_end)
+    except Exception as e:
+        st.error(f"Error building absence timeline: {str(e)}")
+        return None
+
+def get_employee_used_leave(employee_id, leave_type=None):
+    """Calculates total used leave days for an employee, optionally by type."""
+    try:
+        return get_backend().get_employee_used_leave(employee_id, leave_type)
+    except Exception as e:
+        st.error(f"Error calculating used leave: {str(e)}")
+        return 0
@@ -0,0 +1,95 @@
+# leave_store/balances.py
+"""Team-wide leave balances computed in one vectorized pass.
+
+``get_employee_used_leave`` answers one employee at a time; a balance table
+built from it costs one query per employee plus per-row date parsing in
+Python. Here the approved leaves and the entitlement rows of the whole team
+are fetched in two queries and reduced with pandas; durations are the days
+charged by ``durations.HolidayCalendar.leave_days`` (working days, or
+calendar days for maternity and paternity leave).
+"""
+from datetime import date
+
+import pandas as pd
+
+from .durations import HolidayCalendar, total_days
+
+# Leave type -> column of the leave_entitlements table holding its allowance.
+ENTITLEMENT_COLUMNS = {
+    "Annual": "annual_leave",
+    "Sick": "sick_leave",
+    "Compensation": "compensation_leave",
+    "Maternity": "maternity_leave_days",
+    "Paternity": "paternity_leave_days",
+}
+
+BALANCE_COLUMNS = ["employee_id", "employee_name", "leave_type", "entitled", "used", "remaining"]
+APPROVED_LEAVE_COLUMNS = [
+    "employee_id", "employee_name", "leave_type", "start_date", "end_date", "start_half_day", "end_half_day"
+]
+
+
+def year_bounds(year):
+    """First and last day of ``year``."""
+    return date(year, 1, 1), date(year, 12, 31)
+
+
+def _parse_dates(values):
+    return pd.to_datetime(values.str.slice(0, 10), format="%Y-%m-%d", errors="coerce")
+
+
+def leave_durations(leaves, calendar):
+    """Days charged for each row of an approved-leaves DataFrame."""
+    return calendar.leave_days(
+        leaves["leave_type"].to_numpy(dtype=object),
+        _parse_dates(leaves["start_date"]).to_numpy(dtype="datetime64[D]"),
+        _parse_dates(leaves["end_date"]).to_numpy(dtype="datetime64[D]"),
+        leaves["start_half_day"].fillna(False).astype(bool).to_numpy(),
+        leaves["end_half_day"].fillna(False).astype(bool).to_numpy(),
+    )
+
+
+def used_leave_days(approved_rows, calendar=None, leave_type=None):
+    """Total days charged by the approved leave rows, optionally for one leave type."""
+    leaves = pd.DataFrame.from_records(approved_rows, columns=APPROVED_LEAVE_COLUMNS)
+    if leave_type:
+        leaves = leaves[leaves["leave_type"] == leave_type]
+    return total_days(leave_durations(leaves, calendar or HolidayCalendar()))
+
+
+def compute_leave_balances(approved_rows, entitlement_rows, year=None, calendar=None):
+    """Builds the balance table from approved leave rows and entitlement rows.
+
+    ``approved_rows`` need ``employee_id``, ``leave_type``, ``start_date`` and
+    ``end_date`` (plus ``employee_name`` and the half-day flags when known);
+    ``entitlement_rows`` are ``leave_entitlements`` rows. Returns one row per
+    (employee, leave type) with entitled, used and remaining days; types
+    without an entitlement column have no ``entitled``/``remaining`` value.
+    """
+    leaves = pd.DataFrame.from_records(approved_rows, columns=APPROVED_LEAVE_COLUMNS)
+    leaves["used"] = leave_durations(leaves, calendar or HolidayCalendar())
+    if year is not None:
+        leaves = leaves[_parse_dates(leaves["start_date"]).dt.year == year]
+    used = leaves.groupby(["employee_id", "leave_type"], sort=False, as_index=False)["used"].sum()
+
+    entitlements = pd.DataFrame.from_records(entitlement_rows)
+    if entitlements.empty:
+        entitled = pd.DataFrame(columns=["employee_id", "leave_type", "entitled"])
+        names = pd.DataFrame(columns=["employee_id", "employee_name"])
+    else:
+        columns = {column: leave_type for leave_type, column in ENTITLEMENT_COLUMNS.items() if column in entitlements}
+        entitled = entitlements.melt(
+            id_vars="employee_id", value_vars=list(columns), var_name="leave_type", value_name="entitled"
+        )
+        entitled["leave_type"] = entitled["leave_type"].map(columns)
+        names = entitlements.reindex(columns=["employee_id", "employee_name"])
+
+    balances = entitled.merge(used, on=["employee_id", "leave_type"], how="outer")
+    balances["used"] = balances["used"].fillna(0)
+    balances["entitled"] = pd.to_numeric(balances["entitled"])
+    balances["remaining"] = balances["entitled"] - balances["used"]
+
+    names = pd.concat([names, leaves[["employee_id", "employee_name"]]], ignore_index=True)
+    names = names.dropna(subset=["employee_name"]).drop_duplicates("employee_id")
+    balances = balances.merge(names, on="employee_id", how="left")
+    return balances.reindex(columns=BALANCE_COLUMNS).sort_values(["employee_name", "leave_type"], ignore_index=True)
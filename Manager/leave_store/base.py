@@ -0,0 +1,189 @@
+# leave_store/base.py
+"""Backend interface shared by the Supabase and SQLite leave stores."""
+from .pagination import DEFAULT_PAGE_SIZE
+from .snapshot import LeaveSnapshot
+
+# Row shapes returned by every backend. Pages only rely on these keys, so a
+# backend is free to store the data however it likes as long as it maps
+# its rows onto them.
+LEAVE_SUMMARY_FIELDS = ("id", "employee_id", "employee_name", "leave_type", "start_date", "end_date", "description")
+TEAM_LEAVE_FIELDS = LEAVE_SUMMARY_FIELDS + ("status", "decline_reason")
+HISTORY_FIELDS = ("leave_type", "start_date", "end_date", "description", "status", "decline_reason", "recall_reason")
+
+TEAM_FILTER_ALL = "All Team Members"
+
+
+class LeaveBackend:
+    """Abstract data-access backend for leave requests and employees.
+
+    Implementations raise on failure; the module-level functions in
+    ``leave_store`` turn those errors into the messages the pages show.
+    """
+
+    name = "abstract"
+    # ``durations.HolidayCalendar`` used to charge leave;
+    # None means the default (Kenyan) calendar.
+    calendar = None
+
+    def get_employee_by_name(self, employee_name):
+        """Returns ``{"id", "name"}`` for the employee, or None."""
+        raise NotImplementedError
+
+    def apply_for_leave(self, employee_id, leave_type, start_date, end_date, description, attachment,
+                        start_half_day=False, end_half_day=False):
+        """Inserts a new Pending leave request; the flags mark a half first/last day."""
+        raise NotImplementedError
+
+    def get_leave_history(self, employee_id):
+        """Returns the employee's leaves as ``LeaveHistoryEntry`` tuples (``HISTORY_FIELDS``), newest first."""
+        raise NotImplementedError
+
+    def get_all_pending_leaves(self):
+        """Returns every Pending leave as a dict keyed by ``LEAVE_SUMMARY_FIELDS``."""
+        raise NotImplementedError
+
+    def get_approved_leaves(self):
+        """Returns every Approved leave as a dict keyed by ``LEAVE_SUMMARY_FIELDS``."""
+        raise NotImplementedError
+
+    def update_leave_status(self, leave_id, new_status, reason=None):
+        """Sets the status of a single leave and records the decline/recall reason."""
+        raise NotImplementedError
+
+    def update_leave_statuses(self, leave_ids, new_status, reason=None, expected_status=None):
+        """Sets the status of many leaves in one round trip.
+
+        Only leaves currently in ``expected_status`` (when given) are changed.
+        Returns ``{leave_id: (success, message)}`` for every requested id.
+        """
+        raise NotImplementedError
+
+    def get_team_leaves(self, status_filter=None, leave_type_filter=None, employee_filter=None, employee_id=None):
+        """Returns team leaves as ``LeaveRecord`` rows matching the optional filters.
+
+        ``employee_filter`` matches every employee with that name; ``employee_id`` one employee.
+        """
+        raise NotImplementedError
+
+    def get_team_leaves_page(self, status_filter=None, leave_type_filter=None, employee_filter=None,
+                             after=None, page_size=DEFAULT_PAGE_SIZE, count="exact", employee_id=None):
+        """Returns one ``LeavePage`` of team leaves ordered by ``(start_date, id)``, starting after the cursor."""
+        raise NotImplementedError
+
+    def get_team_leaves_frame(self, status_filter=None, leave_type_filter=None, employee_filter=None,
+                              after=None, page_size=DEFAULT_PAGE_SIZE, count="exact", employee_id=None):
+        """Same page as ``get_team_leaves_page`` with ``rows`` as a typed DataFrame (see ``frames``)."""
+        from .frames import leave_frame_from_records
+        page = self.get_team_leaves_page(status_filter, leave_type_filter, employee_filter, after, page_size, count,
+                                         employee_id)
+        return page._replace(rows=leave_frame_from_records(page.rows))
+
+    def get_snapshot_leaves(self, window_start, window_end):
+        """Returns every Pending leave plus every leave overlapping the window, keyed by ``TEAM_LEAVE_FIELDS``."""
+        raise NotImplementedError
+
+    def get_leaves_in_range(self, range_start, range_end, status_filter=None):
+        """Returns the leaves overlapping ``[range_start, range_end]`` keyed by ``TEAM_LEAVE_FIELDS``,
+        ordered by ``(start_date, id)``."""
+        raise NotImplementedError
+
+    def get_leave_snapshot(self, window_start, window_end):
+        """Loads the snapshot rows and indexes them into a ``LeaveSnapshot``."""
+        return LeaveSnapshot(self.get_snapshot_leaves(window_start, window_end), window_start, window_end)
+
+    def get_all_employees_from_db(self):
+        """Returns the sorted list of employee names."""
+        raise NotImplementedError
+
+    def get_employees(self):
+        """Returns every employee as ``{"id", "name"}``, ordered by name."""
+        raise NotImplementedError
+
+    def get_employee_directory(self):
+        """``directory.EmployeeDirectory`` over the whole roster."""
+        from .directory import EmployeeDirectory
+        return EmployeeDirectory(self.get_employees())
+
+    def search_employees(self, prefix, limit=None):
+        """Up to ``limit`` ``{"id", "name"}`` employees whose name, or a word of it, starts with ``prefix``.
+
+        Backends with a server override this with a limited prefix query;
+        the default searches the in-memory directory.
+        """
+        from .directory import DEFAULT_SEARCH_LIMIT
+        return self.get_employee_directory().search(prefix, limit or DEFAULT_SEARCH_LIMIT)
+
+    def get_all_leaves(self):
+        """Returns every leave in the compact ``id/name/type/start/end`` shape."""
+        raise NotImplementedError
+
+    def get_latest_leave_entry(self):
+        """Returns the most recently created leave, or None."""
+        raise NotImplementedError
+
+    def get_employee_leave_entitlements(self, employee_id):
+        """Returns the entitlement row for the employee, or None."""
+        raise NotImplementedError
+
+    def get_employee_used_leave(self, employee_id, leave_type=None):
+        """Returns the number of approved days of leave charged to the employee (see ``durations``)."""
+        from .balances import used_leave_days
+        return used_leave_days(self.get_approved_leave_rows([employee_id]), self.calendar, leave_type)
+
+    def get_leave_stats(self, year=None, status=None):
+        """Returns ``leave_stats`` rows (``stats.STATS_COLUMNS``), optionally for one year and/or status."""
+        raise NotImplementedError
+
+    def rebuild_leave_stats(self):
+        """Recomputes ``leave_stats`` from the leave table; returns the number of rows written."""
+        raise NotImplementedError
+
+    def get_approved_leave_rows(self, employee_ids=None, range_start=None, range_end=None):
+        """Returns ``employee_id, employee_name, department, leave_type, start_date, end_date``
+        and the ``start_half_day``/``end_half_day`` flags of every approved leave, or only of
+        those overlapping ``[range_start, range_end]`` when the range is given."""
+        raise NotImplementedError
+
+    def get_leave_entitlements(self, employee_ids=None):
+        """Returns every ``leave_entitlements`` row, with ``employee_name`` added."""
+        raise NotImplementedError
+
+    def get_team_leave_balances(self, employee_ids=None, year=None):
+        """Returns the team balance DataFrame built from two bulk queries.
+
+        With ``year``, only leave starting in that year counts, and only leave
+        overlapping the year is fetched.
+        """
+        from .balances import compute_leave_balances, year_bounds
+        approved = self.get_approved_leave_rows(employee_ids, *year_bounds(year)) if year is not None \
+            else self.get_approved_leave_rows(employee_ids)
+        return compute_leave_balances(approved, self.get_leave_entitlements(employee_ids), year, self.calendar)
+
+    def get_absence_timeline(self, range_start, range_end):
+        """Returns the ``AbsenceTimeline`` of approved leave between the two dates."""
+        from .timeline import compute_absence_timeline
+        rows = self.get_approved_leave_rows(range_start=range_start, range_end=range_end)
+        return compute_absence_timeline(rows, range_start, range_end)
+
+
+def bulk_update_report(leave_ids, updated_ids, new_status, expected_status=None):
+    """Builds the per-leave result of a bulk status update from the ids actually changed."""
+    updated_ids = set(updated_ids)
+    if expected_status:
+        failure = f"Not updated: leave is no longer {expected_status} or does not exist"
+    else:
+        failure = "Not updated: leave does not exist"
+    return {
+        leave_id: (True, f"Leave status updated to {new_status}") if leave_id in updated_ids else (False, failure)
+        for leave_id in leave_ids
+    }
+
+
+def status_update_fields(new_status, reason=None):
+    """Builds the column updates for a status change, shared by every backend."""
+    update_data = {"status": new_status}
+    if new_status == "Declined":
+        update_data["decline_reason"] = reason
+    elif new_status in ("Recalled", "Withdrawn"):
+        update_data["recall_reason"] = reason
+    return update_data
@@ -0,0 +1,370 @@
+# leave_store/cache.py
+"""Read-through TTL cache with write-through invalidation for a LeaveBackend.
+
+Each cached read is stored with a per-query TTL and a set of tags naming the
+data it depends on (``leaves:Pending``, ``employee:<id>``, ...). Writes drop
+only the entries whose tags they touch, so a manager approving one request
+refetches the pending and approved lists but keeps the employee roster and
+everybody else's balances. A read whose tags are invalidated while it is
+loading is returned but not stored, so it cannot put back what the write
+just made stale.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from .base import LeaveBackend
+from .pagination import DEFAULT_PAGE_SIZE
+
+# Seconds each query stays fresh. Writes made through this process invalidate
+# immediately; the TTL only bounds staleness from writes made elsewhere
+# (e.g. the employee app inserting a new request).
+QUERY_TTLS = {
+    "get_leave_history": 120,
+    "get_all_pending_leaves": 30,
+    "get_approved_leaves": 60,
+    "get_team_leaves": 60,
+    "get_team_leaves_page": 60,
+    "get_team_leaves_frame": 60,
+    "get_leaves_in_range": 60,
+    "get_leave_snapshot": 30,
+    "get_employee_directory": 600,
+    "search_employees": 600,
+    "get_all_leaves": 60,
+    "get_latest_leave_entry": 30,
+    "get_employee_leave_entitlements": 600,
+    "get_employee_used_leave": 120,
+    "get_team_leave_balances": 120,
+    "get_absence_timeline": 120,
+    "get_leave_stats": 30,
+}
+
+MAX_ENTRIES = 512
+# Leave owners remembered for targeted invalidation; the least recently
+# seen are forgotten first and fall back to dropping every employee entry.
+MAX_LEAVE_OWNERS = 50_000
+
+_MISSING = object()
+
+ALL_LEAVES = "leaves:*"
+EMPLOYEES = "employees"
+
+# Statuses a leave can be in before moving to the given status, so an update
+# only invalidates the lists it can actually have left.
+PREVIOUS_STATUSES = {
+    "Approved": ("Pending",),
+    "Declined": ("Pending",),
+    "Recalled": ("Approved",),
+    "Withdrawn": ("Pending", "Approved"),
+}
+
+
+def status_tag(status):
+    return f"leaves:{status}"
+
+
+def employee_tag(employee_id):
+    return f"employee:{employee_id}"
+
+
+def entitlement_tag(employee_id):
+    return f"entitlements:{employee_id}"
+
+
+def _team_filter_key(status_filter, leave_type_filter, employee_filter, employee_id=None):
+    """Returns the cache key arguments and tags for a team-leaves query."""
+    args = (
+        tuple(sorted(status_filter)) if status_filter else None,
+        tuple(sorted(leave_type_filter)) if leave_type_filter else None,
+        employee_filter,
+        employee_id,
+    )
+    if status_filter:
+        tags = [status_tag(status) for status in status_filter]
+    else:
+        tags = [ALL_LEAVES]
+    tags.append(EMPLOYEES)
+    return args, tags
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after a per-entry TTL and can be dropped by tag."""
+
+    def __init__(self, max_entries=MAX_ENTRIES, clock=time.monotonic):
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries = OrderedDict()  # key -> (expires_at, value, tags)
+        self._tags = {}                # tag -> set of keys
+        # Invalidation counter, and its value when each tag / tag prefix was
+        # last invalidated, so a load that overlapped an invalidation of its
+        # tags is not stored (see ``generation``).
+        self._generation = 0
+        self._invalidated_tags = {}
+        self._invalidated_prefixes = {}
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        """Returns the cached value, or ``default`` if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            if entry[0] <= self._clock():
+                self._discard(key)
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def generation(self):
+        """Token taken before loading a value; pass it to ``set`` as ``since``."""
+        with self._lock:
+            return self._generation
+
+    def _invalidated_since(self, tags, since):
+        if self._invalidated_prefixes.get("", -1) > since:
+            return True
+        for tag in tags:
+            if self._invalidated_tags.get(tag, -1) > since:
+                return True
+            if any(tag.startswith(prefix) and generation > since
+                   for prefix, generation in self._invalidated_prefixes.items()):
+                return True
+        return False
+
+    def set(self, key, value, ttl, tags=(), since=None):
+        """Stores the value; with ``since``, not if any of its tags was invalidated after that ``generation``.
+
+        Returns whether the value was stored.
+        """
+        with self._lock:
+            if since is not None and self._invalidated_since(tags, since):
+                return False
+            self._discard(key)
+            self._entries[key] = (self._clock() + ttl, value, frozenset(tags))
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._discard(next(iter(self._entries)))
+            return True
+
+    def invalidate(self, *tags):
+        """Drops every entry carrying any of the given tags."""
+        with self._lock:
+            self._generation += 1
+            for tag in tags:
+                self._invalidated_tags[tag] = self._generation
+                for key in list(self._tags.get(tag, ())):
+                    self._discard(key)
+
+    def invalidate_prefix(self, prefix):
+        """Drops every entry carrying a tag that starts with ``prefix``."""
+        with self._lock:
+            self._generation += 1
+            self._invalidated_prefixes[prefix] = self._generation
+            self.invalidate(*[tag for tag in self._tags if tag.startswith(prefix)])
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._invalidated_prefixes[""] = self._generation
+            self._entries.clear()
+            self._tags.clear()
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class CachedBackend(LeaveBackend):
+    """Wraps another backend, caching its reads and invalidating them on writes.
+
+    Cached values are shared between sessions and must be treated as
+    read-only by callers.
+    """
+
+    def __init__(self, backend, cache=None, ttls=None, max_leave_owners=MAX_LEAVE_OWNERS):
+        self.backend = backend
+        self.name = backend.name
+        self.cache = cache if cache is not None else TTLCache()
+        self.ttls = dict(QUERY_TTLS, **(ttls or {}))
+        # leave id -> employee id, learnt from cached rows so status updates
+        # can invalidate the owner's history and balances without a lookup.
+        self._leave_owners = OrderedDict()
+        self._owners_lock = threading.Lock()
+        self.max_leave_owners = max_leave_owners
+
+    def _cached(self, query, args, tags, load):
+        key = (query,) + args
+        value = self.cache.get(key, _MISSING)
+        if value is _MISSING:
+            # A write invalidating these tags while ``load`` runs may not be
+            # in the loaded value, so that value is returned but not cached.
+            since = self.cache.generation()
+            value = load()
+            self.cache.set(key, value, self.ttls[query], tags, since=since)
+        return value
+
+    def _remember_owners(self, rows):
+        self._remember_owner_pairs((row.get("id"), row.get("employee_id")) for row in rows)
+        return rows
+
+    def _remember_owner_pairs(self, pairs):
+        with self._owners_lock:
+            for leave_id, employee_id in pairs:
+                if leave_id is not None and employee_id is not None:
+                    self._leave_owners[leave_id] = employee_id
+                    self._leave_owners.move_to_end(leave_id)
+            while len(self._leave_owners) > self.max_leave_owners:
+                self._leave_owners.popitem(last=False)
+
+    # ---- reads ----
+
+    def get_employee_directory(self):
+        return self._cached("get_employee_directory", (), (EMPLOYEES,), self.backend.get_employee_directory)
+
+    def get_employee_by_name(self, employee_name):
+        # Answered from the shared directory: no round trip per name.
+        return self.get_employee_directory().lookup(employee_name)
+
+    def get_leave_history(self, employee_id):
+        return self._cached("get_leave_history", (employee_id,), (employee_tag(employee_id),),
+                            lambda: self.backend.get_leave_history(employee_id))
+
+    def get_all_pending_leaves(self):
+        return self._cached("get_all_pending_leaves", (), (status_tag("Pending"), EMPLOYEES),
+                            lambda: self._remember_owners(self.backend.get_all_pending_leaves()))
+
+    def get_approved_leaves(self):
+        return self._cached("get_approved_leaves", (), (status_tag("Approved"), EMPLOYEES),
+                            lambda: self._remember_owners(self.backend.get_approved_leaves()))
+
+    def get_team_leaves(self, status_filter=None, leave_type_filter=None, employee_filter=None, employee_id=None):
+        args, tags = _team_filter_key(status_filter, leave_type_filter, employee_filter, employee_id)
+        return self._cached("get_team_leaves", args, tags,
+                            lambda: self._remember_owners(
+                                self.backend.get_team_leaves(status_filter, leave_type_filter, employee_filter,
+                                                             employee_id)))
+
+    def get_team_leaves_page(self, status_filter=None, leave_type_filter=None, employee_filter=None,
+                             after=None, page_size=DEFAULT_PAGE_SIZE, count="exact", employee_id=None):
+        args, tags = _team_filter_key(status_filter, leave_type_filter, employee_filter, employee_id)
+
+        def load():
+            page = self.backend.get_team_leaves_page(status_filter, leave_type_filter, employee_filter,
+                                                     after, page_size, count, employee_id)
+            self._remember_owners(page.rows)
+            return page
+        return self._cached("get_team_leaves_page", args + (after, page_size, count), tags, load)
+
+    def get_team_leaves_frame(self, status_filter=None, leave_type_filter=None, employee_filter=None,
+                              after=None, page_size=DEFAULT_PAGE_SIZE, count="exact", employee_id=None):
+        args, tags = _team_filter_key(status_filter, leave_type_filter, employee_filter, employee_id)
+
+        def load():
+            page = self.backend.get_team_leaves_frame(status_filter, leave_type_filter, employee_filter,
+                                                      after, page_size, count, employee_id)
+            self._remember_owner_pairs(zip(page.rows["id"].tolist(), page.rows["employee_id"].tolist()))
+            return page
+        return self._cached("get_team_leaves_frame", args + (after, page_size, count), tags, load)
+
+    def get_leaves_in_range(self, range_start, range_end, status_filter=None):
+        args, tags = _team_filter_key(status_filter, None, None)
+        return self._cached("get_leaves_in_range", (range_start, range_end, args[0]), tags,
+                            lambda: self._remember_owners(
+                                self.backend.get_leaves_in_range(range_start, range_end, status_filter)))
+
+    def get_leave_snapshot(self, window_start, window_end):
+        def load():
+            snapshot = self.backend.get_leave_snapshot(window_start, window_end)
+            self._remember_owners(snapshot.rows)
+            return snapshot
+        return self._cached("get_leave_snapshot", (window_start, window_end), (ALL_LEAVES, EMPLOYEES), load)
+
+    def get_all_employees_from_db(self):
+        return self.get_employee_directory().names
+
+    def search_employees(self, prefix, limit=None):
+        # Keyed on the normalised text, so "Ami", "ami" and "ami " share an entry.
+        key = " ".join(prefix.casefold().split())
+        return self._cached("search_employees", (key, limit), (EMPLOYEES,),
+                            lambda: self.backend.search_employees(key, limit))
+
+    def get_all_leaves(self):
+        return self._cached("get_all_leaves", (), (ALL_LEAVES, EMPLOYEES), self.backend.get_all_leaves)
+
+    def get_latest_leave_entry(self):
+        return self._cached("get_latest_leave_entry", (), (ALL_LEAVES, EMPLOYEES),
+                            self.backend.get_latest_leave_entry)
+
+    def get_employee_leave_entitlements(self, employee_id):
+        return self._cached("get_employee_leave_entitlements", (employee_id,), (entitlement_tag(employee_id),),
+                            lambda: self.backend.get_employee_leave_entitlements(employee_id))
+
+    def get_employee_used_leave(self, employee_id, leave_type=None):
+        return self._cached("get_employee_used_leave", (employee_id, leave_type), (employee_tag(employee_id),),
+                            lambda: self.backend.get_employee_used_leave(employee_id, leave_type))
+
+    def get_team_leave_balances(self, employee_ids=None, year=None):
+        args = (tuple(sorted(employee_ids)) if employee_ids is not None else None, year)
+        return self._cached("get_team_leave_balances", args, (status_tag("Approved"), EMPLOYEES),
+                            lambda: self.backend.get_team_leave_balances(employee_ids, year))
+
+    def get_leave_stats(self, year=None, status=None):
+        return self._cached("get_leave_stats", (year, status), (ALL_LEAVES,),
+                            lambda: self.backend.get_leave_stats(year, status))
+
+    def get_absence_timeline(self, range_start, range_end):
+        return self._cached("get_absence_timeline", (range_start, range_end), (status_tag("Approved"), EMPLOYEES),
+                            lambda: self.backend.get_absence_timeline(range_start, range_end))
+
+    # ---- writes ----
+
+    def rebuild_leave_stats(self):
+        result = self.backend.rebuild_leave_stats()
+        self.cache.invalidate(ALL_LEAVES)
+        return result
+
+    def apply_for_leave(self, employee_id, leave_type, start_date, end_date, description, attachment,
+                        start_half_day=False, end_half_day=False):
+        result = self.backend.apply_for_leave(employee_id, leave_type, start_date, end_date, description, attachment,
+                                              start_half_day, end_half_day)
+        self.cache.invalidate(status_tag("Pending"), ALL_LEAVES, employee_tag(employee_id))
+        return result
+
+    def update_leave_status(self, leave_id, new_status, reason=None):
+        result = self.backend.update_leave_status(leave_id, new_status, reason)
+        self.invalidate_status_change([leave_id], new_status)
+        return result
+
+    def update_leave_statuses(self, leave_ids, new_status, reason=None, expected_status=None):
+        leave_ids = list(leave_ids)
+        results = self.backend.update_leave_statuses(leave_ids, new_status, reason, expected_status)
+        self.invalidate_status_change(leave_ids, new_status)
+        return results
+
+    def invalidate_status_change(self, leave_ids, new_status):
+        """Drops the entries a status change of the given leaves can have made stale."""
+        statuses = (new_status,) + PREVIOUS_STATUSES.get(new_status, ())
+        tags = [status_tag(status) for status in statuses] + [ALL_LEAVES]
+        with self._owners_lock:
+            owners = [self._leave_owners.get(leave_id) for leave_id in leave_ids]
+        tags.extend(employee_tag(owner) for owner in owners if owner is not None)
+        self.cache.invalidate(*tags)
+        if None in owners:
+            # Unknown owner: fall back to every per-employee entry.
+            self.cache.invalidate_prefix("employee:")
@@ -0,0 +1,85 @@
+# leave_store/calendar_range.py
+"""Month buckets for the team calendar's visible-range queries.
+
+The calendar only asks for leaves overlapping the dates it shows. Ranges
+are widened to whole calendar months before they hit the backend, so the
+six-week grid of one month and the next share cache entries, and the
+months either side of the view are loaded in the background while the
+current one is on screen.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+logger = logging.getLogger(__name__)
+
+PREFETCH_WORKERS = 2
+
+
+def month_bounds(day):
+    """Returns the first and last day of the month containing ``day``."""
+    first = day.replace(day=1)
+    following = (first + timedelta(days=32)).replace(day=1)
+    return first, following - timedelta(days=1)
+
+
+def months_between(range_start, range_end):
+    """Returns ``(first, last)`` of every month overlapping ``[range_start, range_end]``."""
+    months = []
+    first, last = month_bounds(range_start)
+    while first <= range_end:
+        months.append((first, last))
+        first, last = month_bounds(last + timedelta(days=1))
+    return months
+
+
+def adjacent_months(range_start, range_end):
+    """Returns the month before ``range_start`` and the month after ``range_end``."""
+    previous_first, _ = month_bounds(range_start)
+    _, next_last = month_bounds(range_end)
+    return [month_bounds(previous_first - timedelta(days=1)), month_bounds(next_last + timedelta(days=1))]
+
+
+def parse_dates_set(state):
+    """Extracts the visible ``(start, end)`` dates from the calendar's ``datesSet`` callback, or None.
+
+    FullCalendar reports ``end`` as exclusive; the returned end is the last
+    visible day.
+    """
+    dates_set = (state or {}).get("datesSet") if isinstance(state, dict) else None
+    if not dates_set:
+        return None
+    try:
+        start = date.fromisoformat(dates_set["start"][:10])
+        end = date.fromisoformat(dates_set["end"][:10]) - timedelta(days=1)
+    except (KeyError, TypeError, ValueError):
+        return None
+    return start, max(start, end)
+
+
+class MonthPrefetcher:
+    """Warms month buckets on a small background pool, skipping ones already in flight."""
+
+    def __init__(self, workers=PREFETCH_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="leave-calendar-prefetch")
+        self._pending = set()
+        self._lock = threading.Lock()
+
+    def prefetch(self, backend, months, status_filter=None):
+        for first, last in months:
+            key = (first, last, tuple(status_filter or ()))
+            with self._lock:
+                if key in self._pending:
+                    continue
+                self._pending.add(key)
+            self._executor.submit(self._load, backend, key, status_filter)
+
+    def _load(self, backend, key, status_filter):
+        try:
+            backend.get_leaves_in_range(key[0], key[1], status_filter)
+        except Exception:
+            logger.exception("Calendar prefetch failed")
+        finally:
+            with self._lock:
+                self._pending.discard(key)
@@ -0,0 +1,36 @@
+# leave_store/concurrency.py
+"""Issues a page's independent reads at the same time.
+
+A page built from several backend reads otherwise waits for each round trip
+in turn. ``run_concurrently`` starts them together on a short-lived thread
+pool, so the page waits for the slowest one only. Worker threads are given
+the caller's Streamlit script context, so ``st.error`` from a failing read
+still reaches the page.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+MAX_WORKERS = 8
+
+
+def run_serially(calls):
+    """Runs the zero-argument callables one after another; returns ``{name: result}``."""
+    return {name: call() for name, call in calls.items()}
+
+
+def run_concurrently(calls, max_workers=MAX_WORKERS):
+    """Runs the zero-argument callables at once; returns ``{name: result}`` once all finish."""
+    if len(calls) < 2:
+        return run_serially(calls)
+    ctx = get_script_run_ctx()
+
+    def attach_context():
+        if ctx is not None:
+            add_script_run_ctx(threading.current_thread(), ctx)
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(calls)), initializer=attach_context,
+                            thread_name_prefix="leave-page-load") as executor:
+        futures = {name: executor.submit(call) for name, call in calls.items()}
+        return {name: future.result() for name, future in futures.items()}
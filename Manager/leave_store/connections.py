@@ -0,0 +1,122 @@
+# leave_store/connections.py
+"""Long-lived SQLite connections shared across Streamlit sessions.
+
+Streamlit runs every rerun on a fresh script thread, so thread-local
+connections would be reopened (file open, schema parse, cold page cache) on
+nearly every interaction. Instead a small pool of persistent connections is
+checked out per operation; each keeps its prepared-statement cache and warm
+pages between reruns.
+"""
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from .metrics import InstrumentedConnection
+
+DEFAULT_POOL_SIZE = 4
+# Prepared statements kept per connection, keyed by SQL text.
+STATEMENT_CACHE_SIZE = 256
+CHECKOUT_TIMEOUT = 30
+
+
+class SQLiteConnectionPool:
+    """Fixed-size pool of SQLite connections with a context-managed transaction API.
+
+    A thread that already holds a connection gets the same one back from
+    nested ``connection()``/``transaction()`` calls, so helpers can be
+    composed inside one transaction.
+    """
+
+    def __init__(self, database_path, size=DEFAULT_POOL_SIZE, configure=None):
+        self.database_path = database_path
+        self.size = size
+        self._configure = configure
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._create_lock = threading.Lock()
+        self._local = threading.local()
+        if database_path == ":memory:":
+            # Each connection to ":memory:" is a separate database, so an
+            # in-memory store is served by one persistent connection.
+            self.size = 1
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.database_path,
+            check_same_thread=False,
+            isolation_level=None,  # transactions are managed explicitly below
+            cached_statements=STATEMENT_CACHE_SIZE,
+            factory=InstrumentedConnection,  # every statement is timed (see metrics.py)
+        )
+        conn.row_factory = sqlite3.Row
+        if self._configure:
+            self._configure(conn)
+        return conn
+
+    def _checkout(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._create_lock:
+            if self._created < self.size:
+                self._created += 1
+                return self._connect()
+        return self._idle.get(timeout=CHECKOUT_TIMEOUT)
+
+    @contextmanager
+    def connection(self):
+        """Yields a pooled connection for the duration of the block."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            yield conn
+            return
+        conn = self._checkout()
+        self._local.conn = conn
+        try:
+            yield conn
+        finally:
+            self._local.conn = None
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle.put(conn)
+
+    @contextmanager
+    def transaction(self):
+        """Runs the block atomically: commits on success, rolls back on error.
+
+        The outermost call takes the write lock up front (BEGIN IMMEDIATE);
+        nested calls become savepoints.
+        """
+        with self.connection() as conn:
+            if conn.in_transaction:
+                savepoint = f"sp_{id(conn)}_{getattr(self._local, 'depth', 0)}"
+                self._local.depth = getattr(self._local, "depth", 0) + 1
+                conn.execute(f"SAVEPOINT {savepoint}")
+                try:
+                    yield conn
+                except BaseException:
+                    conn.execute(f"ROLLBACK TO {savepoint}")
+                    conn.execute(f"RELEASE {savepoint}")
+                    raise
+                else:
+                    conn.execute(f"RELEASE {savepoint}")
+                finally:
+                    self._local.depth -= 1
+                return
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            else:
+                conn.commit()
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
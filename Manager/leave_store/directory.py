@@ -0,0 +1,73 @@
+# leave_store/directory.py
+"""In-memory employee directory for name resolution and typeahead.
+
+The roster is fetched once (``LeaveBackend.get_employees``) and indexed
+twice: a dict from case-folded name to employee for exact lookups, and a
+sorted list of case-folded name suffixes for prefix search with
+``bisect``. Both answer in microseconds for tens of thousands of
+employees. ``CachedBackend`` shares one directory between sessions and
+rebuilds it when the roster cache entry expires or is invalidated.
+"""
+from bisect import bisect_left
+
+DEFAULT_SEARCH_LIMIT = 20
+
+
+def like_escape(text):
+    """Escapes LIKE/ILIKE wildcards so typed text only matches literally."""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class EmployeeDirectory:
+    """Case-insensitive name index over ``{"id", "name"}`` employee rows."""
+
+    def __init__(self, employees):
+        self._by_name = {}
+        self._departments = {}
+        entries = []
+        for employee in employees:
+            self._departments[employee["id"]] = employee.get("department")
+            name = employee["name"]
+            if not name:
+                continue
+            key = name.casefold()
+            # Like the NOCASE lookup it replaces, the first employee with a name wins.
+            self._by_name.setdefault(key, employee)
+            # Index every word onwards, so "kam" finds "Amina Kamau" too.
+            words = key.split()
+            for position in range(len(words)):
+                entries.append((" ".join(words[position:]), name, employee["id"]))
+        entries.sort()
+        self._keys = [entry[0] for entry in entries]
+        self._entries = entries
+        self.names = sorted({entry[1] for entry in entries})
+
+    def __len__(self):
+        return len(self._by_name)
+
+    def lookup(self, name):
+        """Returns ``{"id", "name"}`` for the name, ignoring case, or None."""
+        if not name:
+            return None
+        return self._by_name.get(name.casefold())
+
+    def department(self, employee_id):
+        """The employee's department, or None when unknown."""
+        return self._departments.get(employee_id)
+
+    def search(self, prefix, limit=DEFAULT_SEARCH_LIMIT):
+        """Up to ``limit`` employees whose name, or a word of it, starts with ``prefix``.
+
+        Results come in order of the matching text, so the scan stops after
+        ``limit`` hits however common the prefix is.
+        """
+        key = " ".join(prefix.casefold().split())
+        if not key:
+            return []
+        matches = {}
+        for position in range(bisect_left(self._keys, key), len(self._keys)):
+            if len(matches) >= limit or not self._keys[position].startswith(key):
+                break
+            _, name, employee_id = self._entries[position]
+            matches.setdefault(employee_id, name)
+        return [{"id": employee_id, "name": name} for employee_id, name in matches.items()]
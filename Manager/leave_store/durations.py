@@ -0,0 +1,151 @@
+# leave_store/durations.py
+"""Leave durations in business or calendar days.
+
+Most leave is charged per working day: weekends and public holidays inside
+a leave are free, and a leave may start or end on a half day. Durations are
+computed for whole arrays at once with ``numpy.busday_count`` against a
+``HolidayCalendar`` chosen by country (``HOLIDAY_CALENDAR`` secret).
+Built-in rules cover Kenya ("KE") and weekends only ("NONE"); other
+countries are added with ``register_holiday_rule``, for instance from a list
+of dates kept in the Supabase ``public_holidays`` table (``holidays_from_dates``).
+Maternity and paternity entitlements are calendar days, so those types are
+charged every day of the leave (``CALENDAR_DAY_LEAVE_TYPES``).
+"""
+from datetime import date, timedelta
+
+import numpy as np
+from dateutil.easter import easter
+
+DEFAULT_COUNTRY = "KE"
+# Monday to Friday.
+DEFAULT_WEEKMASK = "1111100"
+# Leave types whose entitlement, and so whose charge, is in calendar days.
+CALENDAR_DAY_LEAVE_TYPES = frozenset({"Maternity", "Paternity"})
+
+
+def _kenya_holidays(year):
+    """Kenyan public holidays; those falling on a Sunday are observed on the Monday."""
+    fixed = [
+        date(year, 1, 1),    # New Year's Day
+        date(year, 5, 1),    # Labour Day
+        date(year, 6, 1),    # Madaraka Day
+        date(year, 10, 10),  # Mazingira Day
+        date(year, 10, 20),  # Mashujaa Day
+        date(year, 12, 12),  # Jamhuri Day
+        date(year, 12, 25),  # Christmas Day
+        date(year, 12, 26),  # Boxing Day
+    ]
+    observed = [day + timedelta(days=1) for day in fixed if day.weekday() == 6]
+    easter_sunday = easter(year)
+    return fixed + observed + [easter_sunday - timedelta(days=2), easter_sunday + timedelta(days=1)]
+
+
+# Country code -> function returning that year's public holidays. Holidays
+# announced at short notice (e.g. Idd-ul-Fitr) go in HOLIDAYS instead.
+HOLIDAY_RULES = {
+    "KE": _kenya_holidays,
+    "NONE": lambda year: [],
+}
+# HOLIDAY_CALENDAR value that reads the holidays from the public_holidays table.
+PUBLIC_HOLIDAYS_TABLE = "PUBLIC_HOLIDAYS"
+
+
+def register_holiday_rule(country, rule):
+    """Adds or replaces the rule for ``country``: a function from a year to its holidays."""
+    HOLIDAY_RULES[country] = rule
+
+
+def holidays_from_dates(days):
+    """Holiday rule over a fixed list of dates (``date`` objects or ISO strings)."""
+    by_year = {}
+    for day in days:
+        day = date.fromisoformat(str(day)[:10])
+        by_year.setdefault(day.year, []).append(day)
+    return lambda year: by_year.get(year, [])
+
+
+class HolidayCalendar:
+    """Working-day calendar: a weekmask plus a country's public holidays and any extra dates."""
+
+    def __init__(self, country=DEFAULT_COUNTRY, extra_holidays=(), weekmask=DEFAULT_WEEKMASK,
+                 calendar_day_types=CALENDAR_DAY_LEAVE_TYPES):
+        if country not in HOLIDAY_RULES:
+            raise ValueError(f"Unknown holiday calendar: {country}")
+        self.country = country
+        self.weekmask = weekmask
+        self.calendar_day_types = frozenset(calendar_day_types)
+        self.extra_holidays = [date.fromisoformat(str(day)[:10]) for day in extra_holidays]
+        self._calendars = {}
+
+    def holidays(self, first_year, last_year):
+        """Returns the sorted, de-duplicated holidays of the years as ``datetime64[D]``."""
+        days = [day for year in range(first_year, last_year + 1) for day in HOLIDAY_RULES[self.country](year)]
+        days += [day for day in self.extra_holidays if first_year <= day.year <= last_year]
+        return np.unique(np.array(days, dtype="datetime64[D]"))
+
+    def busdaycalendar(self, first_year, last_year):
+        """Returns the ``numpy.busdaycalendar`` for the years, built once per range."""
+        key = (first_year, last_year)
+        if key not in self._calendars:
+            self._calendars[key] = np.busdaycalendar(
+                weekmask=self.weekmask, holidays=self.holidays(first_year, last_year)
+            )
+        return self._calendars[key]
+
+    def business_days(self, start, end, start_half_day=None, end_half_day=None):
+        """Working days charged for each ``start``-``end`` leave, both ends inclusive.
+
+        ``start``/``end`` are array-likes of dates (NaT allowed, giving NaN);
+        the optional half-day flags take half a day off the first/last day
+        when that day is a working day. Returns a float array.
+        """
+        start = np.asarray(start, dtype="datetime64[D]")
+        end = np.asarray(end, dtype="datetime64[D]")
+        days = np.full(start.shape, np.nan)
+        valid = ~(np.isnat(start) | np.isnat(end)) & (end >= start)
+        if not valid.any():
+            return days
+        start, end = start[valid], end[valid]
+        years = np.concatenate([start, end]).astype("datetime64[Y]").astype(int) + 1970
+        # A year of margin keeps the cached calendar stable across nearby queries.
+        calendar = self.busdaycalendar(int(years.min()) - 1, int(years.max()) + 1)
+
+        counted = np.busday_count(start, end + np.timedelta64(1, "D"), busdaycal=calendar).astype(float)
+        if start_half_day is not None:
+            flags = np.asarray(start_half_day, dtype=bool)[valid]
+            counted -= 0.5 * (flags & np.is_busday(start, busdaycal=calendar))
+        if end_half_day is not None:
+            flags = np.asarray(end_half_day, dtype=bool)[valid]
+            # A one-day leave flagged at both ends is still half a day.
+            if start_half_day is not None:
+                flags &= ~(np.asarray(start_half_day, dtype=bool)[valid] & (start == end))
+            counted -= 0.5 * (flags & np.is_busday(end, busdaycal=calendar))
+        days[valid] = counted
+        return days
+
+    def calendar_days(self, start, end, start_half_day=None, end_half_day=None):
+        """Every day of each ``start``-``end`` leave, both ends inclusive, less any half days."""
+        start = np.asarray(start, dtype="datetime64[D]")
+        end = np.asarray(end, dtype="datetime64[D]")
+        days = np.full(start.shape, np.nan)
+        valid = ~(np.isnat(start) | np.isnat(end)) & (end >= start)
+        days[valid] = (end[valid] - start[valid]).astype("int64") + 1
+        start_half = np.asarray(start_half_day, dtype=bool) if start_half_day is not None else np.zeros(start.shape, bool)
+        end_half = np.asarray(end_half_day, dtype=bool) if end_half_day is not None else np.zeros(start.shape, bool)
+        # As with business days, a one-day leave flagged at both ends is still half a day.
+        end_half = end_half & ~(start_half & (start == end))
+        return days - 0.5 * start_half - 0.5 * end_half
+
+    def leave_days(self, leave_types, start, end, start_half_day=None, end_half_day=None):
+        """Days charged for each leave: calendar days for ``calendar_day_types``, business days otherwise."""
+        in_calendar_days = np.isin(np.asarray(leave_types, dtype=object), list(self.calendar_day_types))
+        business = self.business_days(start, end, start_half_day, end_half_day)
+        if not in_calendar_days.any():
+            return business
+        return np.where(in_calendar_days, self.calendar_days(start, end, start_half_day, end_half_day), business)
+
+
+def total_days(days):
+    """Sums an array of durations, as an int when there are no half days."""
+    total = float(np.nansum(days))
+    return int(total) if total.is_integer() else total
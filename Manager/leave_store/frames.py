@@ -0,0 +1,50 @@
+# leave_store/frames.py
+"""Team leaves as typed, column-oriented DataFrames for ``st.dataframe``.
+
+A list of row objects costs one Python object per row and field and is
+converted column by column again when Streamlit serialises it to Arrow.
+Here the fetched rows (``sqlite3.Row`` tuples or PostgREST JSON rows) go
+straight into a DataFrame in ``TEAM_LEAVE_FIELDS`` order; status and
+leave type become categoricals (one small dictionary plus integer codes)
+and the dates ``datetime64``, which Arrow takes over without per-row
+conversion.
+"""
+import pandas as pd
+
+from .base import TEAM_LEAVE_FIELDS
+
+CATEGORICAL_COLUMNS = ("leave_type", "status")
+DATE_COLUMNS = ("start_date", "end_date")
+
+
+def typed_leave_frame(frame):
+    """Converts a ``TEAM_LEAVE_FIELDS`` frame in place to categorical status/leave type and datetime64 dates."""
+    for column in CATEGORICAL_COLUMNS:
+        frame[column] = frame[column].astype("category")
+    for column in DATE_COLUMNS:
+        # Timestamps from PostgREST are cut to their date, like ``records.parse_day``.
+        frame[column] = pd.to_datetime(frame[column].astype("string").str.slice(0, 10), format="%Y-%m-%d",
+                                       errors="coerce")
+    return frame
+
+
+def leave_frame_from_tuples(rows):
+    """Typed frame from rows whose values are in ``TEAM_LEAVE_FIELDS`` order (e.g. ``sqlite3.Row``)."""
+    return typed_leave_frame(pd.DataFrame.from_records(rows, columns=TEAM_LEAVE_FIELDS))
+
+
+def leave_frame_from_records(rows, **columns):
+    """Typed frame from mappings keyed by ``TEAM_LEAVE_FIELDS``, built column by column.
+
+    ``columns`` supplies whole columns the rows do not carry under their
+    field name, e.g. ``employee_name`` taken from a PostgREST embed.
+    """
+    return typed_leave_frame(pd.DataFrame(
+        {field: columns[field] if field in columns else [row.get(field) for row in rows]
+         for field in TEAM_LEAVE_FIELDS},
+        columns=TEAM_LEAVE_FIELDS
+    ))
+
+
+def empty_leave_frame():
+    return leave_frame_from_tuples([])
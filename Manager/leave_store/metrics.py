@@ -0,0 +1,324 @@
+# leave_store/metrics.py
+"""Timings of data-layer queries and page renders.
+
+Every SQLite statement (connections come from ``InstrumentedConnection``)
+and every PostgREST request (the client is wrapped in
+``InstrumentedClient``) is recorded with its wall time, row count and an
+estimate of its payload size; pages time their views with ``timed``.
+
+``RECORDER`` keeps running totals per operation, exported as Prometheus
+text, and the most recent events tagged with the Streamlit session that
+caused them, exported as JSON lines and shown in the sidebar debug panel.
+"""
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache, wraps
+
+try:
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+except ImportError:  # benchmarks and command-line tools run without Streamlit
+    get_script_run_ctx = None
+
+MAX_EVENTS = 2000
+# Payload sizes are extrapolated from the JSON size of this many rows.
+PAYLOAD_SAMPLE_ROWS = 20
+# Rows fetched at a time when a SQLite cursor is iterated.
+ITERATION_BATCH = 256
+METRIC_PREFIX = "leave_store"
+
+SQL_OPERATION = re.compile(r"^\s*(\w+)", re.IGNORECASE)
+SQL_TABLE = re.compile(r"\b(?:FROM|INTO|UPDATE|TABLE|ON)\s+(\w+)", re.IGNORECASE)
+REQUEST_VERBS = ("select", "insert", "update", "upsert", "delete")
+
+
+def current_session():
+    """The Streamlit session id of the running script, or None outside a session."""
+    ctx = get_script_run_ctx() if get_script_run_ctx else None
+    return ctx.session_id if ctx is not None else None
+
+
+def estimate_payload(rows):
+    """Approximate JSON size in bytes of a list of rows, from a sample of them."""
+    if not rows:
+        return 0
+    sample = [tuple(row) if isinstance(row, sqlite3.Row) else row for row in rows[:PAYLOAD_SAMPLE_ROWS]]
+    return len(json.dumps(sample, default=str)) * len(rows) // len(sample)
+
+
+@lru_cache(maxsize=512)
+def sql_operation(sql):
+    """Short label for a statement, e.g. ``select leaves`` or ``insert leave_stats``."""
+    verb = SQL_OPERATION.match(sql)
+    table = SQL_TABLE.search(sql)
+    label = verb.group(1).lower() if verb else "sql"
+    return f"{label} {table.group(1)}" if table else label
+
+
+class MetricEvent:
+    """One timed query or render."""
+
+    def __init__(self, kind, backend, operation, seconds, rows=0, payload_bytes=0, statement=None, session=None):
+        self.kind = kind
+        self.backend = backend
+        self.operation = operation
+        self.seconds = seconds
+        self.rows = rows
+        self.payload_bytes = payload_bytes
+        self.statement = statement
+        self.session = session
+        self.timestamp = time.time()
+
+    def as_dict(self):
+        return {
+            "timestamp": round(self.timestamp, 6),
+            "kind": self.kind,
+            "backend": self.backend,
+            "operation": self.operation,
+            "seconds": round(self.seconds, 6),
+            "rows": self.rows,
+            "payload_bytes": self.payload_bytes,
+            "statement": self.statement,
+            "session": self.session,
+        }
+
+
+class MetricsRecorder:
+    """Thread-safe store of recent events and cumulative per-operation totals."""
+
+    def __init__(self, max_events=MAX_EVENTS):
+        self.events = deque(maxlen=max_events)
+        # (kind, backend, operation) -> [count, seconds, rows, payload bytes]
+        self.totals = {}
+        self._rerun_started = {}
+        self._lock = threading.Lock()
+
+    def _add(self, event, count, seconds, rows, payload_bytes):
+        totals = self.totals.setdefault((event.kind, event.backend, event.operation), [0, 0.0, 0, 0])
+        totals[0] += count
+        totals[1] += seconds
+        totals[2] += rows
+        totals[3] += payload_bytes
+
+    def record(self, kind, backend, operation, seconds, rows=0, payload_bytes=0, statement=None):
+        event = MetricEvent(kind, backend, operation, seconds, rows, payload_bytes, statement, current_session())
+        with self._lock:
+            self.events.append(event)
+            self._add(event, 1, seconds, rows, payload_bytes)
+        return event
+
+    def extend(self, event, seconds, rows=0, payload_bytes=0):
+        """Adds time and rows spent fetching to an already recorded query."""
+        with self._lock:
+            event.seconds += seconds
+            event.rows += rows
+            event.payload_bytes += payload_bytes
+            self._add(event, 0, seconds, rows, payload_bytes)
+
+    @contextmanager
+    def timer(self, kind, backend, operation):
+        tick = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(kind, backend, operation, time.perf_counter() - tick)
+
+    @contextmanager
+    def rerun(self, page):
+        """Times one script run of ``page`` and marks where this session's rerun events start."""
+        self._rerun_started[current_session()] = time.time()
+        with self.timer("render", "page", f"rerun {page}"):
+            yield
+
+    def rerun_events(self, session=None):
+        """Events of the session's latest rerun, oldest first."""
+        started = self._rerun_started.get(session, 0)
+        with self._lock:
+            return [event for event in self.events if event.session == session and event.timestamp >= started]
+
+    def to_jsonl(self, events=None):
+        with self._lock:
+            events = list(self.events) if events is None else events
+        return "".join(json.dumps(event.as_dict()) + "\n" for event in events)
+
+    def to_prometheus(self):
+        """Cumulative totals in the Prometheus text exposition format."""
+        with self._lock:
+            totals = sorted(self.totals.items())
+        series = (
+            ("duration_seconds", "summary", "Wall time", lambda total: (("_count", total[0]), ("_sum", total[1]))),
+            ("rows_total", "counter", "Rows returned or written", lambda total: (("", total[2]),)),
+            ("payload_bytes_total", "counter", "Estimated JSON payload", lambda total: (("", total[3]),)),
+        )
+        lines = []
+        for kind in ("query", "render"):
+            for name, metric_type, description, samples in series:
+                if kind == "render" and name != "duration_seconds":
+                    continue
+                metric = f"{METRIC_PREFIX}_{kind}_{name}"
+                lines.append(f"# HELP {metric} {description}, per leave_store {kind} operation.")
+                lines.append(f"# TYPE {metric} {metric_type}")
+                for (event_kind, backend, operation), total in totals:
+                    if event_kind != kind:
+                        continue
+                    labels = f'backend="{_label_value(backend)}",operation="{_label_value(operation)}"'
+                    for suffix, value in samples(total):
+                        value = round(value, 6) if isinstance(value, float) else value
+                        lines.append(f"{metric}{suffix}{{{labels}}} {value}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self.events.clear()
+            self.totals.clear()
+            self._rerun_started.clear()
+
+
+def _label_value(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+RECORDER = MetricsRecorder()
+
+
+def timed(view):
+    """Decorator recording each call of a page view under the name ``view``."""
+    def decorate(render):
+        @wraps(render)
+        def wrapper(*args, **kwargs):
+            with RECORDER.timer("render", "page", view):
+                return render(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# ---- SQLite ----
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that records each statement, including the time spent fetching its rows."""
+
+    _event = None
+
+    def execute(self, sql, parameters=()):
+        tick = time.perf_counter()
+        super().execute(sql, parameters)
+        self._event = RECORDER.record("query", "sqlite", sql_operation(sql), time.perf_counter() - tick,
+                                      max(self.rowcount, 0), statement=sql)
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        tick = time.perf_counter()
+        super().executemany(sql, seq_of_parameters)
+        self._event = RECORDER.record("query", "sqlite", sql_operation(sql), time.perf_counter() - tick,
+                                      max(self.rowcount, 0), statement=sql)
+        return self
+
+    def _fetched(self, seconds, rows):
+        if self._event is not None:
+            RECORDER.extend(self._event, seconds, len(rows), estimate_payload(rows))
+
+    def fetchall(self):
+        tick = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(time.perf_counter() - tick, rows)
+        return rows
+
+    def fetchmany(self, size=None):
+        tick = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._fetched(time.perf_counter() - tick, rows)
+        return rows
+
+    def fetchone(self):
+        tick = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(time.perf_counter() - tick, [row] if row is not None else [])
+        return row
+
+    def __iter__(self):
+        return self._iterate()
+
+    def _iterate(self):
+        # Fetch in batches so iterating stays close to the speed of the C cursor.
+        seconds, count, sample = 0.0, 0, []
+        try:
+            while True:
+                tick = time.perf_counter()
+                batch = sqlite3.Cursor.fetchmany(self, ITERATION_BATCH)
+                seconds += time.perf_counter() - tick
+                if not batch:
+                    return
+                count += len(batch)
+                sample = sample or batch
+                yield from batch
+        finally:
+            if self._event is not None:
+                payload = estimate_payload(sample) * count // len(sample) if sample else 0
+                RECORDER.extend(self._event, seconds, count, payload)
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection whose cursors, including those of ``execute``, are instrumented."""
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+# ---- PostgREST ----
+
+class InstrumentedRequest:
+    """Wraps a supabase-py request builder; ``execute()`` is timed and recorded."""
+
+    def __init__(self, request, resource, verb=None):
+        self._request = request
+        self._resource = resource
+        self._verb = verb
+
+    def __getattr__(self, name):
+        attr = getattr(self._request, name)
+        verb = name if name in REQUEST_VERBS else self._verb
+        if not callable(attr):
+            # Builder properties such as ``not_`` return another builder.
+            return InstrumentedRequest(attr, self._resource, verb) if hasattr(attr, "execute") else attr
+
+        @wraps(attr)
+        def call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            return InstrumentedRequest(result, self._resource, verb) if hasattr(result, "execute") else result
+        return call
+
+    def execute(self):
+        tick = time.perf_counter()
+        response = self._request.execute()
+        seconds = time.perf_counter() - tick
+        data = getattr(response, "data", None)
+        rows = data if isinstance(data, list) else [data] if data is not None else []
+        RECORDER.record("query", "supabase", f"{self._verb or 'request'} {self._resource}", seconds,
+                        len(rows), estimate_payload(rows))
+        return response
+
+
+class InstrumentedClient:
+    """Wraps a Supabase client so every ``table()`` and ``rpc()`` request is recorded."""
+
+    def __init__(self, client):
+        self._client = client
+
+    def table(self, name):
+        return InstrumentedRequest(self._client.table(name), name)
+
+    def rpc(self, name, *args, **kwargs):
+        return InstrumentedRequest(self._client.rpc(name, *args, **kwargs), name, "rpc")
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
@@ -0,0 +1,109 @@
+# leave_store/overlaps.py
+"""Interval index answering "who is off between these dates" without a full scan.
+
+A leave overlaps ``[start, end]`` when it starts on or before ``end`` and
+ends on or after ``start``. Counting needs no candidates at all: leaves
+started by ``end`` minus leaves already ended before ``start``, two bisects
+over the sorted starts and ends.
+
+Listing the overlapping rows cannot bisect on start alone, since a single
+long leave would widen the window for every query. Leaves are therefore
+bucketed by length in powers of two and each bucket sorted by start; in a
+bucket whose leaves are at most ``longest`` days long only those starting
+in ``[start - longest, end]`` can qualify, and because every leave in it
+is at least half that long most of those candidates do overlap. A query
+costs a few bisects per bucket plus roughly the rows it returns.
+"""
+from bisect import bisect_left, bisect_right
+from datetime import date
+from heapq import merge
+from itertools import islice
+
+
+def _day(value):
+    if isinstance(value, date):
+        return value.toordinal()
+    return date.fromisoformat(str(value)[:10]).toordinal()
+
+
+def _row_days(row):
+    # ``LeaveRecord`` rows carry their dates already parsed; plain dicts only the ISO strings.
+    return _day(row.get("start") or row["start_date"]), _day(row.get("end") or row["end_date"])
+
+
+class _LengthBucket:
+    """Leaves of similar length sorted by start, as positions into the index's rows."""
+
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+        self.positions = []
+        self.longest = 0
+
+    def add(self, start, end, position):
+        self.starts.append(start)
+        self.ends.append(end)
+        self.positions.append(position)
+        self.longest = max(self.longest, end - start)
+
+    def overlapping(self, start, end):
+        low = bisect_left(self.starts, start - self.longest)
+        high = bisect_right(self.starts, end)
+        return (self.positions[index] for index in range(low, high) if self.ends[index] >= start)
+
+
+class LeaveIntervalIndex:
+    """Sorted start/end arrays over leave rows with ``start_date``/``end_date``.
+
+    Query bounds may be ``date`` objects or ISO strings.
+    """
+
+    def __init__(self, rows):
+        intervals = []
+        for row in rows:
+            try:
+                start, end = _row_days(row)
+            except (TypeError, ValueError):
+                continue
+            if end >= start:
+                intervals.append((start, end, row))
+        intervals.sort(key=lambda interval: interval[0])
+        self.starts = [start for start, _, _ in intervals]
+        self.ends = [end for _, end, _ in intervals]
+        self.rows = [row for _, _, row in intervals]
+        self.longest = max((end - start for start, end, _ in intervals), default=0)
+        # Ends sorted on their own give overlap counts in two bisects.
+        self._sorted_ends = sorted(self.ends)
+        buckets = {}
+        self._by_employee = {}
+        for position, (start, end, row) in enumerate(intervals):
+            buckets.setdefault((end - start).bit_length(), _LengthBucket()).add(start, end, position)
+            self._by_employee.setdefault(row.get("employee_id"), []).append((start, end))
+        self._buckets = list(buckets.values())
+
+    def __len__(self):
+        return len(self.rows)
+
+    def overlapping(self, start_date, end_date, exclude_employee=None, limit=None):
+        """Returns the rows overlapping ``[start_date, end_date]``, ordered by start date.
+
+        ``limit`` stops after the first rows, e.g. for a short list of names.
+        """
+        start, end = _day(start_date), _day(end_date)
+        # Each bucket yields positions in start order, so merging them lazily keeps ``limit`` cheap.
+        positions = merge(*(bucket.overlapping(start, end) for bucket in self._buckets))
+        rows = (self.rows[position] for position in positions)
+        if exclude_employee is not None:
+            rows = (row for row in rows if row["employee_id"] != exclude_employee)
+        return list(islice(rows, limit))
+
+    def count_overlapping(self, start_date, end_date, exclude_employee=None):
+        """Number of leaves overlapping ``[start_date, end_date]``: started by the end minus already ended."""
+        start, end = _day(start_date), _day(end_date)
+        count = bisect_right(self.starts, end) - bisect_left(self._sorted_ends, start)
+        if exclude_employee is not None:
+            count -= sum(
+                1 for own_start, own_end in self._by_employee.get(exclude_employee, ())
+                if own_start <= end and own_end >= start
+            )
+        return count
@@ -0,0 +1,30 @@
+# leave_store/pagination.py
+"""Keyset pagination over leaves ordered by ``(start_date, id)``.
+
+A cursor is the ``(start_date, id)`` pair of the last row on a page; the
+next page asks for rows strictly after it, so every page costs the same
+no matter how deep into the history the manager has scrolled.
+"""
+from collections import namedtuple
+
+DEFAULT_PAGE_SIZE = 50
+PAGE_SIZES = (25, 50, 100, 250)
+
+# How the total is counted: "exact" runs a COUNT, "estimated" lets
+# Supabase fall back to planner statistics on large tables, None skips it.
+COUNT_MODES = ("exact", "estimated", None)
+
+LeavePage = namedtuple("LeavePage", ["rows", "next_cursor", "total", "total_is_estimate"])
+
+
+def page_cursor(row):
+    """Returns the cursor pointing just after ``row``."""
+    return (row["start_date"], row["id"])
+
+
+def split_page(rows, page_size):
+    """Splits a ``page_size + 1`` fetch into the page rows and the next cursor."""
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        return rows, page_cursor(rows[-1])
+    return rows, None
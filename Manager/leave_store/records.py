@@ -0,0 +1,87 @@
+# leave_store/records.py
+"""Compact, read-only row objects for leaves and employees.
+
+Backends build one ``LeaveRecord`` per leave at ingest instead of a dict.
+``__slots__`` makes a cached row a fraction of a dict's size, and the ISO
+dates are parsed once into ``start``/``end`` (``datetime.date``, None when
+missing or malformed), so views and indexes never re-parse them. Records
+are mappings over the old dict keys, so ``row["employee_name"]``,
+``row.get(...)``, ``dict(row)`` and DataFrames built from rows keep
+working. They are shared through the cache and must not be modified.
+"""
+from collections import namedtuple
+from collections.abc import Mapping
+from datetime import date
+
+from .base import HISTORY_FIELDS, TEAM_LEAVE_FIELDS
+
+EMPLOYEE_FIELDS = ("id", "name", "department")
+
+# One row of ``get_leave_history``: still a tuple in ``HISTORY_FIELDS`` order.
+LeaveHistoryEntry = namedtuple("LeaveHistoryEntry", HISTORY_FIELDS)
+
+
+def parse_day(value):
+    """``date`` for an ISO date or timestamp string (or a date), None if missing or malformed."""
+    if isinstance(value, date):
+        return value
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value[:10] if isinstance(value, str) else str(value)[:10])
+    except ValueError:
+        return None
+
+
+class _Record(Mapping):
+    """Mapping over ``FIELDS`` stored in slots; extra slots are readable by key too."""
+
+    __slots__ = ()
+    FIELDS = ()
+
+    def __getitem__(self, key):
+        if key in self.__slots__:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self.FIELDS)
+
+    def __len__(self):
+        return len(self.FIELDS)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(f'{field}={getattr(self, field)!r}' for field in self.FIELDS)})"
+
+
+class LeaveRecord(_Record):
+    """A leave as the pages see it, with ``start``/``end`` parsed once."""
+
+    __slots__ = TEAM_LEAVE_FIELDS + ("start", "end")
+    FIELDS = TEAM_LEAVE_FIELDS
+
+    def __init__(self, id, employee_id, employee_name, leave_type, start_date, end_date, description=None,
+                 status=None, decline_reason=None):
+        self.id = id
+        self.employee_id = employee_id
+        self.employee_name = employee_name
+        self.leave_type = leave_type
+        self.start_date = start_date
+        self.end_date = end_date
+        self.description = description
+        self.status = status
+        self.decline_reason = decline_reason
+        self.start = parse_day(start_date)
+        self.end = parse_day(end_date)
+
+
+class Employee(_Record):
+    """An employee's id, display name and department (None where not fetched)."""
+
+    __slots__ = EMPLOYEE_FIELDS
+    FIELDS = EMPLOYEE_FIELDS
+
+    def __init__(self, id, name, department=None):
+        self.id = id
+        self.name = name
+        self.department = department
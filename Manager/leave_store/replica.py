@@ -0,0 +1,212 @@
+# leave_store/replica.py
+"""Local SQLite read replica of the Supabase leave tables.
+
+``SQLiteReplica`` is a ``DeltaSync`` target that writes synced rows into the
+SQLite schema from ``sqlite_backend`` (plus a ``sync_state`` table holding the
+watermarks, so a restart resumes incrementally). A daemon thread keeps it
+fresh, and ``ReplicaBackend`` answers the heavy manager reads from the local
+file while writes still go to Supabase.
+"""
+import logging
+import threading
+
+from .sqlite_backend import SQLiteBackend
+from .sync import DeltaSync, SyncedBackend
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REPLICA_PATH = "leave_replica.db"
+DEFAULT_REFRESH_SECONDS = 30
+
+SYNC_STATE_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS sync_state (
+        name TEXT PRIMARY KEY,
+        watermark TEXT
+    )
+'''
+
+
+def employee_row(row):
+    """Maps an ``employee_table`` row onto the SQLite ``employees`` columns."""
+    return (
+        row["AUUID"],
+        row.get("First_Name") or "",
+        row.get("Last_Name") or row.get("Surname"),
+        row.get("Partner") or "",
+        row.get("Department") or "",
+        row.get("Position") or "",
+        row.get("Salary") or 0,
+        row.get("Profile_Pic"),
+    )
+
+
+def leave_row(row):
+    """Maps an ``off_roll_leave`` row onto the SQLite ``leaves`` columns."""
+    return (
+        row["id"],
+        row["employee_id"],
+        row["leave_type"],
+        row["start_date"],
+        row["end_date"],
+        row.get("description"),
+        bool(row.get("attachment")),
+        row["status"],
+        row.get("decline_reason"),
+        row.get("recall_reason"),
+        bool(row.get("start_half_day")),
+        bool(row.get("end_half_day")),
+    )
+
+
+UPSERTS = {
+    "employee_table": (
+        "INSERT OR REPLACE INTO employees (id, name, surname, partner, department, position, salary, profile_pic) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        employee_row,
+    ),
+    "off_roll_leave": (
+        "INSERT OR REPLACE INTO leaves (id, employee_id, leave_type, start_date, end_date, description, attachment, "
+        "status, decline_reason, recall_reason, start_half_day, end_half_day) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        leave_row,
+    ),
+}
+# Current local copy of the given keys, in the same column order as UPSERTS.
+STORED = {
+    "employee_table": "SELECT id, name, surname, partner, department, position, salary, profile_pic "
+                      "FROM employees WHERE id IN ({})",
+    "off_roll_leave": "SELECT id, employee_id, leave_type, start_date, end_date, description, attachment, status, "
+                      "decline_reason, recall_reason, start_half_day, end_half_day FROM leaves WHERE id IN ({})",
+}
+DELETES = {
+    "employee_table": "DELETE FROM employees WHERE id = ?",
+    "off_roll_leave": "DELETE FROM leaves WHERE id = ?",
+}
+KEYS = {
+    "employee_table": "SELECT id FROM employees",
+    "off_roll_leave": "SELECT id FROM leaves",
+}
+
+
+class SQLiteReplica:
+    """``DeltaSync`` target that stores the synced tables in a SQLiteBackend's database."""
+
+    def __init__(self, local):
+        self.local = local
+        self.local.execute(SYNC_STATE_SCHEMA)
+
+    def get_watermark(self, name):
+        rows = self.local.fetchall("SELECT watermark FROM sync_state WHERE name = ?", (name,))
+        return rows[0][0] if rows else None
+
+    def set_watermark(self, name, value):
+        self.local.execute("INSERT OR REPLACE INTO sync_state (name, watermark) VALUES (?, ?)", (name, value))
+
+    def upsert(self, table, rows):
+        """Writes the rows that differ from the local copy; returns how many did."""
+        query, to_params = UPSERTS[table]
+        params = [to_params(row) for row in rows]
+        if not params:
+            return 0
+        keys = [row[0] for row in params]
+        stored = {
+            row[0]: tuple(row)
+            for row in self.local.fetchall(STORED[table].format(",".join("?" * len(keys))), keys)
+        }
+        # SQLite hands booleans back as 0/1, which compare equal to False/True.
+        changed = [row for row in params if stored.get(row[0]) != row]
+        if changed:
+            self.local.executemany(query, changed)
+        return len(changed)
+
+    def keys(self, table):
+        return [row[0] for row in self.local.fetchall(KEYS[table])]
+
+    def delete(self, table, keys):
+        """Removes the rows still present; returns how many were."""
+        return max(self.local.executemany(DELETES[table], [(key,) for key in keys]).rowcount, 0)
+
+
+class ReplicaRefresher:
+    """Daemon thread running ``sync.refresh()`` every ``interval`` seconds."""
+
+    def __init__(self, sync, interval=DEFAULT_REFRESH_SECONDS):
+        self.sync = sync
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="leave-replica-refresher", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.sync.refresh()
+            except Exception:
+                logger.exception("Leave replica refresh failed")
+
+
+class ReplicaBackend(SyncedBackend):
+    """Serves reads from the local SQLite replica; writes go to Supabase.
+
+    The replica is loaded once on creation and then kept fresh by a
+    ``ReplicaRefresher``; writes refresh it synchronously so the writer sees
+    the change on the next rerun.
+    """
+
+    def __init__(self, remote, replica_path=DEFAULT_REPLICA_PATH, refresh_seconds=DEFAULT_REFRESH_SECONDS):
+        self.local = SQLiteBackend(replica_path, calendar=remote.calendar)
+        sync = DeltaSync(remote.client, SQLiteReplica(self.local))
+        super().__init__(remote, sync)
+        self.name = f"{remote.name}-replica"
+        sync.refresh()
+        self.refresher = ReplicaRefresher(sync, refresh_seconds).start()
+
+    def get_employee_by_name(self, employee_name):
+        return self.local.get_employee_by_name(employee_name)
+
+    def get_leave_history(self, employee_id):
+        return self.local.get_leave_history(employee_id)
+
+    def get_all_pending_leaves(self):
+        return self.local.get_all_pending_leaves()
+
+    def get_approved_leaves(self):
+        return self.local.get_approved_leaves()
+
+    def get_team_leaves(self, status_filter=None, leave_type_filter=None, employee_filter=None, employee_id=None):
+        return self.local.get_team_leaves(status_filter, leave_type_filter, employee_filter, employee_id)
+
+    def get_team_leaves_page(self, *args, **kwargs):
+        return self.local.get_team_leaves_page(*args, **kwargs)
+
+    def get_team_leaves_frame(self, *args, **kwargs):
+        return self.local.get_team_leaves_frame(*args, **kwargs)
+
+    def get_snapshot_leaves(self, window_start, window_end):
+        return self.local.get_snapshot_leaves(window_start, window_end)
+
+    def get_leaves_in_range(self, range_start, range_end, status_filter=None):
+        return self.local.get_leaves_in_range(range_start, range_end, status_filter)
+
+    def get_all_employees_from_db(self):
+        return self.local.get_all_employees_from_db()
+
+    def get_employees(self):
+        return self.local.get_employees()
+
+    def search_employees(self, prefix, limit=None):
+        return self.local.search_employees(prefix, limit)
+
+    def get_all_leaves(self):
+        return self.local.get_all_leaves()
+
+    def get_latest_leave_entry(self):
+        return self.local.get_latest_leave_entry()
+
+    def get_approved_leave_rows(self, employee_ids=None, range_start=None, range_end=None):
+        return self.local.get_approved_leave_rows(employee_ids, range_start, range_end)
@@ -0,0 +1,98 @@
+# leave_store/snapshot.py
+"""One-fetch-per-rerun view of the leaves the manager pages work with.
+
+The pending, approved and team dashboard tabs all look at overlapping rows
+of the same table. Instead of one query per tab, the page loads a
+``LeaveSnapshot`` once and each tab derives its list from the in-memory
+partitions below.
+"""
+from datetime import date, timedelta
+
+from .overlaps import LeaveIntervalIndex
+
+# Leaves ending before / starting after this many days from today are left
+# out of the snapshot. Pending requests are always included.
+SNAPSHOT_WINDOW_DAYS = 365
+
+
+def snapshot_window(today=None, window_days=SNAPSHOT_WINDOW_DAYS):
+    """Returns the ``(start, end)`` dates bounding a snapshot taken today."""
+    today = today or date.today()
+    return today - timedelta(days=window_days), today + timedelta(days=window_days)
+
+
+class LeaveSnapshot:
+    """Leave rows held in memory with indexes by status, leave type and employee.
+
+    Rows are dicts keyed by ``TEAM_LEAVE_FIELDS`` and kept ordered by start
+    date; every derived list preserves that order.
+    """
+
+    def __init__(self, rows, window_start=None, window_end=None):
+        self.rows = sorted(rows, key=lambda row: (row["start_date"], row["id"]))
+        self.window_start = window_start
+        self.window_end = window_end
+        self.by_status = {}
+        self.by_leave_type = {}
+        self.by_employee = {}
+        self.by_employee_id = {}
+        self._approved_intervals = None
+        self._team_intervals = (None, None)
+        for position, row in enumerate(self.rows):
+            self.by_status.setdefault(row["status"], []).append(position)
+            self.by_leave_type.setdefault(row["leave_type"], []).append(position)
+            self.by_employee.setdefault(row["employee_name"], []).append(position)
+            self.by_employee_id.setdefault(row["employee_id"], []).append(position)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def with_status(self, status):
+        return [self.rows[position] for position in self.by_status.get(status, ())]
+
+    def pending(self):
+        return self.with_status("Pending")
+
+    def approved(self):
+        return self.with_status("Approved")
+
+    def approved_intervals(self):
+        """``LeaveIntervalIndex`` over the approved leaves, built on first use."""
+        if self._approved_intervals is None:
+            self._approved_intervals = LeaveIntervalIndex(self.approved())
+        return self._approved_intervals
+
+    def team_intervals(self, directory):
+        """``{department: LeaveIntervalIndex}`` over the approved leaves, departments taken from ``directory``.
+
+        Built on first use and again only when a different directory is passed.
+        """
+        built_for, indexes = self._team_intervals
+        if built_for is not directory:
+            by_department = {}
+            for row in self.approved():
+                by_department.setdefault(directory.department(row["employee_id"]), []).append(row)
+            indexes = {department: LeaveIntervalIndex(rows) for department, rows in by_department.items()}
+            self._team_intervals = (directory, indexes)
+        return indexes
+
+    def filter(self, status_filter=None, leave_type_filter=None, employee_filter=None, employee_id=None):
+        """Same filters as ``get_team_leaves``, answered from the partitions."""
+        candidates = None
+        for index, wanted in (
+            (self.by_status, status_filter),
+            (self.by_leave_type, leave_type_filter),
+            (self.by_employee, [employee_filter] if employee_filter else None),
+            (self.by_employee_id, [employee_id] if employee_id is not None else None),
+        ):
+            if not wanted:
+                continue
+            positions = set()
+            for key in wanted:
+                positions.update(index.get(key, ()))
+            candidates = positions if candidates is None else candidates & positions
+            if not candidates:
+                return []
+        if candidates is None:
+            return list(self.rows)
+        return [self.rows[position] for position in sorted(candidates)]
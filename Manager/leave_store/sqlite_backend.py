@@ -0,0 +1,426 @@
+# leave_store/sqlite_backend.py
+from .base import LeaveBackend, TEAM_FILTER_ALL, bulk_update_report, status_update_fields
+from .connections import DEFAULT_POOL_SIZE, SQLiteConnectionPool
+from .directory import DEFAULT_SEARCH_LIMIT, like_escape
+from .frames import leave_frame_from_tuples
+from .pagination import DEFAULT_PAGE_SIZE, LeavePage, split_page
+from .records import Employee, LeaveHistoryEntry, LeaveRecord
+from .stats import STATS_SOURCE_COLUMNS, apply_stats_change, rebuild_stats
+
+SCHEMA = (
+    '''
+    CREATE TABLE IF NOT EXISTS employees (
+        id TEXT PRIMARY KEY,
+        name TEXT NOT NULL,
+        surname TEXT,
+        partner TEXT NOT NULL,
+        department TEXT NOT NULL,
+        position TEXT NOT NULL,
+        salary INTEGER NOT NULL,
+        profile_pic TEXT
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS leave_entitlements (
+        employee_id TEXT PRIMARY KEY,
+        annual_leave INTEGER NOT NULL,
+        sick_leave INTEGER NOT NULL,
+        compensation_leave INTEGER NOT NULL,
+        maternity_leave_days INTEGER NOT NULL,
+        paternity_leave_days INTEGER NOT NULL,
+        FOREIGN KEY(employee_id) REFERENCES employees(id)
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS leaves (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        employee_id TEXT NOT NULL,
+        leave_type TEXT NOT NULL,
+        start_date DATE NOT NULL,
+        end_date DATE NOT NULL,
+        description TEXT,
+        attachment BOOLEAN,
+        status TEXT NOT NULL,
+        decline_reason TEXT,
+        recall_reason TEXT,
+        start_half_day BOOLEAN NOT NULL DEFAULT 0,
+        end_half_day BOOLEAN NOT NULL DEFAULT 0,
+        FOREIGN KEY(employee_id) REFERENCES employees(id)
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS leave_stats (
+        employee_id TEXT NOT NULL,
+        leave_type TEXT NOT NULL,
+        year INTEGER NOT NULL,
+        status TEXT NOT NULL,
+        requests INTEGER NOT NULL,
+        days REAL NOT NULL,
+        PRIMARY KEY (employee_id, leave_type, year, status)
+    )
+    ''',
+)
+
+# Secondary indexes. The leaves indexes cover the status lists, the keyset
+# dashboard order and the per-employee used-leave sums without touching the
+# table; the NOCASE index serves get_employee_by_name.
+INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_leaves_status_start ON leaves (status, start_date)",
+    "CREATE INDEX IF NOT EXISTS idx_leaves_employee_status_type "
+    "ON leaves (employee_id, status, leave_type, start_date, end_date)",
+    "CREATE INDEX IF NOT EXISTS idx_leaves_start ON leaves (start_date)",
+    "CREATE INDEX IF NOT EXISTS idx_employees_name_nocase ON employees (name COLLATE NOCASE)",
+)
+
+# Bumped whenever init_db learns a new migration; stored in PRAGMA user_version.
+SCHEMA_VERSION = 4
+
+# Page cache per connection, in KiB (negative cache_size means KiB in SQLite).
+CACHE_SIZE_KIB = 64 * 1024
+
+# Columns in ``TEAM_LEAVE_FIELDS`` order, so rows map straight onto ``LeaveRecord``.
+TEAM_LEAVE_SELECT = """
+    SELECT l.id, l.employee_id, e.name AS employee_name, l.leave_type, l.start_date, l.end_date,
+           l.description, l.status, l.decline_reason
+    FROM leaves l
+    JOIN employees e ON l.employee_id = e.id
+"""
+
+LEAVE_SUMMARY_SELECT = """
+    SELECT l.id, l.employee_id, e.name AS employee_name, l.leave_type, l.start_date, l.end_date, l.description
+    FROM leaves l
+    JOIN employees e ON l.employee_id = e.id
+"""
+
+
+def configure_connection(conn):
+    """Applies the per-connection pragmas: relaxed fsync under WAL and a sized page cache."""
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KIB}")
+    conn.execute("PRAGMA temp_store = MEMORY")
+
+
+def init_db(conn, calendar=None):
+    """Creates the tables and indexes, switches to WAL and migrates older databases in place.
+
+    ``calendar`` is the ``HolidayCalendar`` the backend charges leave with,
+    so a migration that rebuilds ``leave_stats`` counts days the same way.
+    """
+    # WAL lets readers proceed while a writer commits. It is persistent, so
+    # this also converts existing rollback-journal files; :memory: databases
+    # simply stay in "memory" mode.
+    conn.execute("PRAGMA journal_mode = WAL")
+    c = conn.cursor()
+    for statement in SCHEMA:
+        c.execute(statement)
+    version = c.execute("PRAGMA user_version").fetchone()[0]
+    if version < 1:
+        # Databases created before the indexes existed: build them and
+        # refresh the planner statistics so they are picked up straight away.
+        for statement in INDEXES:
+            c.execute(statement)
+        c.execute("ANALYZE")
+    if version < 2 and "start_half_day" not in {row[1] for row in c.execute("PRAGMA table_info(leaves)")}:
+        # Half-day flags for working-day durations (see durations.py).
+        c.execute("ALTER TABLE leaves ADD COLUMN start_half_day BOOLEAN NOT NULL DEFAULT 0")
+        c.execute("ALTER TABLE leaves ADD COLUMN end_half_day BOOLEAN NOT NULL DEFAULT 0")
+    if version < 4:
+        # leave_stats is new (3), or holds maternity/paternity leave in
+        # working rather than calendar days (4): fill it from the leaves.
+        rebuild_stats(c, calendar)
+    if version < SCHEMA_VERSION:
+        c.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    conn.commit()
+
+
+class SQLiteBackend(LeaveBackend):
+    """Leave store backed by a local SQLite file.
+
+    Queries run on a pool of persistent connections shared by every
+    Streamlit session (see ``connections.SQLiteConnectionPool``); under WAL
+    readers on different connections no longer wait for each other or for a
+    writer.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, database_path, pool_size=DEFAULT_POOL_SIZE, calendar=None):
+        self.database_path = database_path
+        self.calendar = calendar
+        self.pool = SQLiteConnectionPool(database_path, size=pool_size, configure=configure_connection)
+        with self.pool.connection() as conn:
+            init_db(conn, calendar)
+
+    def _fetchall(self, query, params=()):
+        with self.pool.connection() as conn:
+            return conn.execute(query, params).fetchall()
+
+    def _fetchone(self, query, params=()):
+        with self.pool.connection() as conn:
+            return conn.execute(query, params).fetchone()
+
+    def _write(self, query, params=()):
+        with self.pool.transaction() as conn:
+            return conn.execute(query, params)
+
+    def transaction(self):
+        """Context manager running the enclosed statements atomically on one connection.
+
+        Calls to this backend made inside the block join the same transaction.
+        """
+        return self.pool.transaction()
+
+    def fetchall(self, query, params=()):
+        """Runs a read query on a pooled connection and returns every row."""
+        return self._fetchall(query, params)
+
+    def execute(self, query, params=()):
+        """Runs one write statement in its own transaction."""
+        return self._write(query, params)
+
+    def executemany(self, query, seq_of_params):
+        """Runs one statement for many parameter rows in a single transaction."""
+        with self.pool.transaction() as conn:
+            return conn.executemany(query, seq_of_params)
+
+    def get_employee_by_name(self, employee_name):
+        row = self._fetchone("SELECT id, name FROM employees WHERE name = ? COLLATE NOCASE", (employee_name,))
+        return Employee(*row) if row else None
+
+    def apply_for_leave(self, employee_id, leave_type, start_date, end_date, description, attachment,
+                        start_half_day=False, end_half_day=False):
+        with self.pool.transaction() as conn:
+            conn.execute('''
+                INSERT INTO leaves (employee_id, leave_type, start_date, end_date, description, attachment,
+                                    start_half_day, end_half_day, status)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'Pending')
+            ''', (employee_id, leave_type, start_date.isoformat(), end_date.isoformat(), description,
+                  bool(attachment), bool(start_half_day), bool(end_half_day)))
+            apply_stats_change(conn, [{
+                "employee_id": employee_id,
+                "leave_type": leave_type,
+                "start_date": start_date.isoformat(),
+                "end_date": end_date.isoformat(),
+                "status": "Pending",
+                "start_half_day": start_half_day,
+                "end_half_day": end_half_day
+            }], self.calendar)
+        return True, "Leave request submitted successfully!"
+
+    def get_leave_history(self, employee_id):
+        rows = self._fetchall(
+            "SELECT leave_type, start_date, end_date, description, status, decline_reason, recall_reason "
+            "FROM leaves WHERE employee_id = ? ORDER BY start_date DESC",
+            (employee_id,)
+        )
+        return [LeaveHistoryEntry(*row) for row in rows]
+
+    def get_all_pending_leaves(self):
+        rows = self._fetchall(LEAVE_SUMMARY_SELECT + " WHERE l.status = 'Pending'")
+        return [LeaveRecord(*row, status="Pending") for row in rows]
+
+    def get_approved_leaves(self):
+        rows = self._fetchall(LEAVE_SUMMARY_SELECT + " WHERE l.status = 'Approved'")
+        return [LeaveRecord(*row, status="Approved") for row in rows]
+
+    def update_leave_status(self, leave_id, new_status, reason=None):
+        success, message = self.update_leave_statuses([leave_id], new_status, reason)[leave_id]
+        if success:
+            return True, message
+        return False, "Failed to update leave status"
+
+    def update_leave_statuses(self, leave_ids, new_status, reason=None, expected_status=None):
+        leave_ids = list(leave_ids)
+        if not leave_ids:
+            return {}
+        update_data = status_update_fields(new_status, reason)
+        assignments = ", ".join(f"{column} = ?" for column in update_data)
+        placeholders = ','.join('?' * len(leave_ids))
+        query = f"SELECT id, {', '.join(STATS_SOURCE_COLUMNS)} FROM leaves WHERE id IN ({placeholders})"
+        params = list(leave_ids)
+        if expected_status:
+            query += " AND status = ?"
+            params.append(expected_status)
+        with self.pool.transaction() as conn:
+            # Same transaction: rows found here are exactly the ones updated,
+            # and leave_stats moves them from their old status to the new one.
+            old_rows = [dict(row) for row in conn.execute(query, params)]
+            updated_ids = [row["id"] for row in old_rows]
+            conn.executemany(
+                f"UPDATE leaves SET {assignments} WHERE id = ?",
+                [(*update_data.values(), leave_id) for leave_id in updated_ids]
+            )
+            apply_stats_change(conn, old_rows, self.calendar, sign=-1)
+            apply_stats_change(conn, [dict(row, status=new_status) for row in old_rows], self.calendar)
+        return bulk_update_report(leave_ids, updated_ids, new_status, expected_status)
+
+    def get_team_leaves(self, status_filter=None, leave_type_filter=None, employee_filter=None, employee_id=None):
+        where, params = self._team_filters(status_filter, leave_type_filter, employee_filter, employee_id)
+        return [LeaveRecord(*row) for row in self._fetchall(TEAM_LEAVE_SELECT + where, params)]
+
+    def get_team_leaves_page(self, status_filter=None, leave_type_filter=None, employee_filter=None,
+                             after=None, page_size=DEFAULT_PAGE_SIZE, count="exact", employee_id=None):
+        rows, next_cursor, total = self._team_leaves_page(status_filter, leave_type_filter, employee_filter,
+                                                          after, page_size, count, employee_id)
+        return LeavePage([LeaveRecord(*row) for row in rows], next_cursor, total, False)
+
+    def get_team_leaves_frame(self, status_filter=None, leave_type_filter=None, employee_filter=None,
+                              after=None, page_size=DEFAULT_PAGE_SIZE, count="exact", employee_id=None):
+        # The fetched rows go into the DataFrame as they are, with no record per row.
+        rows, next_cursor, total = self._team_leaves_page(status_filter, leave_type_filter, employee_filter,
+                                                          after, page_size, count, employee_id)
+        return LeavePage(leave_frame_from_tuples(rows), next_cursor, total, False)
+
+    def _team_leaves_page(self, status_filter, leave_type_filter, employee_filter, after, page_size, count,
+                          employee_id=None):
+        """Returns the raw rows of one page, the next cursor and the total (or None)."""
+        where, params = self._team_filters(status_filter, leave_type_filter, employee_filter, employee_id)
+        total = None
+        if count:
+            # SQLite has no planner estimate, so both modes count exactly.
+            total = self._fetchone(
+                "SELECT COUNT(*) FROM leaves l JOIN employees e ON l.employee_id = e.id" + where, params
+            )[0]
+        page_where, page_params = where, list(params)
+        if after:
+            page_where += " AND (l.start_date > ? OR (l.start_date = ? AND l.id > ?))"
+            page_params.extend([after[0], after[0], after[1]])
+        rows = self._fetchall(
+            TEAM_LEAVE_SELECT + page_where + " ORDER BY l.start_date, l.id LIMIT ?",
+            page_params + [page_size + 1]
+        )
+        rows, next_cursor = split_page(rows, page_size)
+        return rows, next_cursor, total
+
+    @staticmethod
+    def _team_filters(status_filter=None, leave_type_filter=None, employee_filter=None, employee_id=None):
+        query = " WHERE 1=1"
+        params = []
+        if status_filter:
+            placeholders = ','.join('?' * len(status_filter))
+            query += f" AND l.status IN ({placeholders})"
+            params.extend(status_filter)
+        if leave_type_filter:
+            placeholders = ','.join('?' * len(leave_type_filter))
+            query += f" AND l.leave_type IN ({placeholders})"
+            params.extend(leave_type_filter)
+        if employee_filter and employee_filter != TEAM_FILTER_ALL:
+            query += " AND e.name = ?"
+            params.append(employee_filter)
+        if employee_id is not None:
+            query += " AND l.employee_id = ?"
+            params.append(employee_id)
+        return query, params
+
+    def get_snapshot_leaves(self, window_start, window_end):
+        rows = self._fetchall(
+            TEAM_LEAVE_SELECT + " WHERE l.status = 'Pending' OR (l.end_date >= ? AND l.start_date <= ?)",
+            (window_start.isoformat(), window_end.isoformat())
+        )
+        return [LeaveRecord(*row) for row in rows]
+
+    def get_leaves_in_range(self, range_start, range_end, status_filter=None):
+        where, params = self._team_filters(status_filter)
+        rows = self._fetchall(
+            TEAM_LEAVE_SELECT + where + " AND l.start_date <= ? AND l.end_date >= ? ORDER BY l.start_date, l.id",
+            params + [range_end.isoformat(), range_start.isoformat()]
+        )
+        return [LeaveRecord(*row) for row in rows]
+
+    def get_all_employees_from_db(self):
+        return [row[0] for row in self._fetchall("SELECT DISTINCT name FROM employees ORDER BY name")]
+
+    def get_employees(self):
+        return [
+            Employee(*row) for row in self._fetchall("SELECT id, name, department FROM employees ORDER BY name, id")
+        ]
+
+    def search_employees(self, prefix, limit=None):
+        # LIKE ignores ASCII case. The word-start pattern rules out an index,
+        # but only the LIMIT rows leave the database.
+        pattern = like_escape(" ".join(prefix.split()))
+        if not pattern:
+            return []
+        rows = self._fetchall(
+            "SELECT id, name FROM employees WHERE name LIKE ? ESCAPE '\\' OR name LIKE ? ESCAPE '\\' "
+            "ORDER BY name, id LIMIT ?",
+            (f"{pattern}%", f"% {pattern}%", limit or DEFAULT_SEARCH_LIMIT)
+        )
+        return [Employee(*row) for row in rows]
+
+    def get_all_leaves(self):
+        rows = self._fetchall("""
+            SELECT l.id, e.name AS employee_name, l.leave_type, l.start_date, l.end_date, l.description, l.status
+            FROM leaves l
+            JOIN employees e ON l.employee_id = e.id
+        """)
+        return [
+            {
+                "id": row["id"],
+                "name": row["employee_name"],
+                "type": row["leave_type"],
+                "start": row["start_date"],
+                "end": row["end_date"],
+                "description": row["description"],
+                "status": row["status"]
+            }
+            for row in rows
+        ]
+
+    def get_latest_leave_entry(self):
+        row = self._fetchone("""
+            SELECT e.name AS employee_name, l.leave_type, l.start_date, l.end_date, l.description, l.status,
+                   l.decline_reason, l.recall_reason
+            FROM leaves l
+            JOIN employees e ON l.employee_id = e.id
+            ORDER BY l.id DESC LIMIT 1
+        """)
+        return dict(row) if row else None
+
+    def get_employee_leave_entitlements(self, employee_id):
+        row = self._fetchone("SELECT * FROM leave_entitlements WHERE employee_id = ?", (employee_id,))
+        return dict(row) if row else None
+
+    def get_leave_stats(self, year=None, status=None):
+        query = "SELECT * FROM leave_stats WHERE 1=1"
+        params = []
+        if year is not None:
+            query += " AND year = ?"
+            params.append(year)
+        if status is not None:
+            query += " AND status = ?"
+            params.append(status)
+        return [dict(row) for row in self._fetchall(query, params)]
+
+    def rebuild_leave_stats(self):
+        with self.pool.transaction() as conn:
+            return rebuild_stats(conn, self.calendar)
+
+    def get_approved_leave_rows(self, employee_ids=None, range_start=None, range_end=None):
+        query = """
+            SELECT l.employee_id, e.name AS employee_name, e.department, l.leave_type, l.start_date, l.end_date,
+                   l.start_half_day, l.end_half_day
+            FROM leaves l
+            LEFT JOIN employees e ON l.employee_id = e.id
+            WHERE l.status = 'Approved'
+        """
+        params = []
+        if employee_ids is not None:
+            query += f" AND l.employee_id IN ({','.join('?' * len(employee_ids))})"
+            params.extend(employee_ids)
+        if range_start is not None and range_end is not None:
+            query += " AND l.start_date <= ? AND l.end_date >= ?"
+            params.extend([range_end.isoformat(), range_start.isoformat()])
+        return [dict(row) for row in self._fetchall(query, params)]
+
+    def get_leave_entitlements(self, employee_ids=None):
+        query = """
+            SELECT le.*, e.name AS employee_name
+            FROM leave_entitlements le
+            LEFT JOIN employees e ON le.employee_id = e.id
+        """
+        params = []
+        if employee_ids is not None:
+            query += f" WHERE le.employee_id IN ({','.join('?' * len(employee_ids))})"
+            params.extend(employee_ids)
+        return [dict(row) for row in self._fetchall(query, params)]
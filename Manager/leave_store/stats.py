@@ -0,0 +1,101 @@
+# leave_store/stats.py
+"""``leave_stats``: request and day counts per (employee, leave type, year, status).
+
+The KPI tiles read a handful of these rows instead of scanning the leave
+table. SQLite keeps the table current inside the same transaction as each
+leave write (see ``SQLiteBackend``); Supabase does it with the trigger in
+``sql/leave_stats.sql``. Either can be rebuilt from scratch:
+
+    python -m leave_store.stats --database leave_management.db
+"""
+import argparse
+
+import pandas as pd
+
+from .durations import HolidayCalendar
+
+STATS_KEY = ["employee_id", "leave_type", "year", "status"]
+STATS_COLUMNS = STATS_KEY + ["requests", "days"]
+# Leave columns the summary is computed from.
+STATS_SOURCE_COLUMNS = ["employee_id", "leave_type", "start_date", "end_date", "status",
+                        "start_half_day", "end_half_day"]
+
+STATS_UPSERT = """
+    INSERT INTO leave_stats (employee_id, leave_type, year, status, requests, days)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT (employee_id, leave_type, year, status)
+    DO UPDATE SET requests = requests + excluded.requests, days = days + excluded.days
+"""
+STATS_DELETE_EMPTY = """
+    DELETE FROM leave_stats
+    WHERE employee_id = ? AND leave_type = ? AND year = ? AND status = ? AND requests <= 0
+"""
+
+
+def summarize_leaves(rows, calendar=None, sign=1):
+    """Groups leave rows into ``STATS_COLUMNS`` tuples; ``sign=-1`` gives the rows to subtract.
+
+    The year is that of the start date and days are those charged by
+    ``HolidayCalendar.leave_days``, so the numbers match the balance table.
+    """
+    leaves = pd.DataFrame.from_records(rows, columns=STATS_SOURCE_COLUMNS)
+    if leaves.empty:
+        return []
+    start = pd.to_datetime(leaves["start_date"].str.slice(0, 10), format="%Y-%m-%d", errors="coerce")
+    end = pd.to_datetime(leaves["end_date"].str.slice(0, 10), format="%Y-%m-%d", errors="coerce")
+    leaves["year"] = start.dt.year
+    leaves["requests"] = 1
+    leaves["days"] = (calendar or HolidayCalendar()).leave_days(
+        leaves["leave_type"].to_numpy(dtype=object),
+        start.to_numpy(dtype="datetime64[D]"),
+        end.to_numpy(dtype="datetime64[D]"),
+        leaves["start_half_day"].fillna(False).astype(bool).to_numpy(),
+        leaves["end_half_day"].fillna(False).astype(bool).to_numpy(),
+    )
+    grouped = leaves.dropna(subset=["year"]).groupby(STATS_KEY, sort=False, as_index=False)[["requests", "days"]].sum()
+    return [
+        (employee_id, leave_type, int(year), status, sign * int(requests), sign * float(days))
+        for employee_id, leave_type, year, status, requests, days in grouped.itertuples(index=False)
+    ]
+
+
+def apply_stats_change(conn, rows, calendar=None, sign=1):
+    """Adds (or with ``sign=-1`` removes) the rows' contribution to ``leave_stats`` on ``conn``.
+
+    Returns the number of ``leave_stats`` keys touched.
+    """
+    changes = summarize_leaves(rows, calendar, sign)
+    if changes:
+        conn.executemany(STATS_UPSERT, changes)
+    if sign < 0:
+        # Only the keys just decremented can have dropped to zero.
+        conn.executemany(STATS_DELETE_EMPTY, [change[:len(STATS_KEY)] for change in changes])
+    return len(changes)
+
+
+def rebuild_stats(conn, calendar=None):
+    """Recomputes ``leave_stats`` from the whole leave table; call inside a transaction.
+
+    Returns the number of ``leave_stats`` rows written, as the Supabase
+    ``rebuild_leave_stats()`` function does.
+    """
+    rows = [dict(row) for row in conn.execute(f"SELECT {', '.join(STATS_SOURCE_COLUMNS)} FROM leaves")]
+    conn.execute("DELETE FROM leave_stats")
+    return apply_stats_change(conn, rows, calendar)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rebuild the leave_stats summary of a SQLite leave database.")
+    parser.add_argument("--database", default="leave_management.db", help="SQLite database file")
+    parser.add_argument("--holiday-calendar", default=None, help="holiday calendar country code")
+    args = parser.parse_args(argv)
+
+    from .sqlite_backend import SQLiteBackend
+    # The calendar goes in before the schema migration, which may rebuild the stats itself.
+    calendar = HolidayCalendar(args.holiday_calendar) if args.holiday_calendar else None
+    backend = SQLiteBackend(args.database, calendar=calendar)
+    print(f"Rebuilt {backend.rebuild_leave_stats()} leave_stats rows in {args.database}")
+
+
+if __name__ == "__main__":
+    main()
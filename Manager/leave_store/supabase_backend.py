@@ -0,0 +1,344 @@
+# leave_store/supabase_backend.py
+from .base import LeaveBackend, TEAM_FILTER_ALL, bulk_update_report, status_update_fields
+from .directory import DEFAULT_SEARCH_LIMIT, like_escape
+from .durations import HolidayCalendar
+from .frames import leave_frame_from_records
+from .pagination import DEFAULT_PAGE_SIZE, LeavePage, split_page
+from .records import Employee, LeaveHistoryEntry, LeaveRecord
+
+LEAVE_SUMMARY_COLUMNS = "id, employee_id, leave_type, start_date, end_date, description, employee_table(First_Name)"
+# PostgREST caps each response (1000 rows on Supabase by default), so bulk
+# reads are fetched in ranges of this size.
+BULK_PAGE_SIZE = 1000
+TEAM_LEAVE_COLUMNS = "id, employee_id, leave_type, start_date, end_date, status, description, decline_reason, employee_table(First_Name)"
+# With an inner embed PostgREST drops leaves whose employee fails the embed
+# filter; a plain embed would only null the embed and still return the row.
+TEAM_LEAVE_COLUMNS_INNER = TEAM_LEAVE_COLUMNS.replace("employee_table(", "employee_table!inner(")
+
+
+def _employee_name(row):
+    """Extracts the employee name from the nested ``employee_table`` embed."""
+    employee = row.get("employee_table")
+    return employee["First_Name"] if employee else None
+
+
+def _team_leave(row):
+    return _leave_summary(row, row["status"], row.get("decline_reason"))
+
+
+def _leave_summary(row, status=None, decline_reason=None):
+    return LeaveRecord(row["id"], row["employee_id"], _employee_name(row), row["leave_type"], row["start_date"],
+                       row["end_date"], row["description"], status, decline_reason)
+
+
+def _quoted(value):
+    """``value`` as a double-quoted PostgREST filter value; inside quotes a backslash escapes the next character."""
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _team_columns(employee_filter):
+    if employee_filter and employee_filter != TEAM_FILTER_ALL:
+        return TEAM_LEAVE_COLUMNS_INNER
+    return TEAM_LEAVE_COLUMNS
+
+
+class SupabaseBackend(LeaveBackend):
+    """Leave store backed by the Supabase ``off_roll_leave`` and ``employee_table`` tables.
+
+    The client keeps one HTTP connection pool for the whole process, so the
+    backend must be created once (see ``leave_store.get_backend``) rather than
+    per call. Recall and withdrawal reasons are stored in ``recall_reason``;
+    ``sql/recall_reason.sql`` migrates databases still using ``recall_leave``.
+    """
+
+    name = "supabase"
+
+    def __init__(self, client, calendar=None):
+        self.client = client
+        self.calendar = calendar
+
+    def _select_all(self, build_query):
+        """Runs ``build_query()`` range by range until every matching row is fetched."""
+        rows = []
+        while True:
+            response = build_query().range(len(rows), len(rows) + BULK_PAGE_SIZE - 1).execute()
+            batch = response.data or []
+            rows.extend(batch)
+            if len(batch) < BULK_PAGE_SIZE:
+                return rows
+
+    def get_employee_by_name(self, employee_name):
+        response = self.client.table("employee_table").select("AUUID, First_Name").eq("First_Name", employee_name).execute()
+        if response.data:
+            row = response.data[0]
+            return Employee(row["AUUID"], row["First_Name"])
+        return None
+
+    def apply_for_leave(self, employee_id, leave_type, start_date, end_date, description, attachment,
+                        start_half_day=False, end_half_day=False):
+        response = self.client.table("off_roll_leave").insert({
+            "employee_id": employee_id,
+            "leave_type": leave_type,
+            "start_date": start_date.isoformat(),
+            "end_date": end_date.isoformat(),
+            "description": description,
+            "attachment": bool(attachment),
+            "start_half_day": bool(start_half_day),
+            "end_half_day": bool(end_half_day),
+            "status": "Pending"
+        }).execute()
+        if response.data:
+            return True, "Leave request submitted successfully!"
+        return False, "Failed to submit leave request"
+
+    def get_leave_history(self, employee_id):
+        response = self.client.table("off_roll_leave").select(
+            "leave_type, start_date, end_date, description, status, decline_reason, recall_reason"
+        ).eq("employee_id", employee_id).order("start_date", desc=True).execute()
+        return [
+            LeaveHistoryEntry(
+                row['leave_type'],
+                row['start_date'],
+                row['end_date'],
+                row['description'],
+                row['status'],
+                row.get('decline_reason'),
+                row.get('recall_reason')
+            )
+            for row in response.data or []
+        ]
+
+    def get_all_pending_leaves(self):
+        rows = self._select_all(
+            lambda: self.client.table("off_roll_leave").select(LEAVE_SUMMARY_COLUMNS).eq("status", "Pending")
+            .order("start_date").order("id")
+        )
+        return [_leave_summary(row, "Pending") for row in rows]
+
+    def get_approved_leaves(self):
+        rows = self._select_all(
+            lambda: self.client.table("off_roll_leave").select(LEAVE_SUMMARY_COLUMNS).eq("status", "Approved")
+            .order("start_date").order("id")
+        )
+        return [_leave_summary(row, "Approved") for row in rows]
+
+    def update_leave_status(self, leave_id, new_status, reason=None):
+        update_data = status_update_fields(new_status, reason)
+        response = self.client.table("off_roll_leave").update(update_data).eq("id", leave_id).execute()
+        if response.data:
+            return True, f"Leave status updated to {new_status}"
+        return False, "Failed to update leave status"
+
+    def update_leave_statuses(self, leave_ids, new_status, reason=None, expected_status=None):
+        leave_ids = list(leave_ids)
+        if not leave_ids:
+            return {}
+        query = self.client.table("off_roll_leave").update(status_update_fields(new_status, reason)).in_("id", leave_ids)
+        if expected_status:
+            query = query.eq("status", expected_status)
+        response = query.execute()
+        updated_ids = [row["id"] for row in response.data or []]
+        return bulk_update_report(leave_ids, updated_ids, new_status, expected_status)
+
+    def get_team_leaves(self, status_filter=None, leave_type_filter=None, employee_filter=None, employee_id=None):
+        def build_query():
+            query = self.client.table("off_roll_leave").select(_team_columns(employee_filter))
+            query = self._team_filters(query, status_filter, leave_type_filter, employee_filter, employee_id)
+            return query.order("start_date").order("id")
+        return [_team_leave(row) for row in self._select_all(build_query)]
+
+    def get_team_leaves_page(self, status_filter=None, leave_type_filter=None, employee_filter=None,
+                             after=None, page_size=DEFAULT_PAGE_SIZE, count="exact", employee_id=None):
+        rows, next_cursor, total = self._team_leaves_page(status_filter, leave_type_filter, employee_filter,
+                                                          after, page_size, count, employee_id)
+        return LeavePage([_team_leave(row) for row in rows], next_cursor, total, count == "estimated")
+
+    def get_team_leaves_frame(self, status_filter=None, leave_type_filter=None, employee_filter=None,
+                              after=None, page_size=DEFAULT_PAGE_SIZE, count="exact", employee_id=None):
+        rows, next_cursor, total = self._team_leaves_page(status_filter, leave_type_filter, employee_filter,
+                                                          after, page_size, count, employee_id)
+        frame = leave_frame_from_records(rows, employee_name=[_employee_name(row) for row in rows])
+        return LeavePage(frame, next_cursor, total, count == "estimated")
+
+    def _team_leaves_page(self, status_filter, leave_type_filter, employee_filter, after, page_size, count,
+                          employee_id=None):
+        """Returns the JSON rows of one page, the next cursor and the total (or None)."""
+        if count:
+            query = self.client.table("off_roll_leave").select(_team_columns(employee_filter), count=count)
+        else:
+            query = self.client.table("off_roll_leave").select(_team_columns(employee_filter))
+        query = self._team_filters(query, status_filter, leave_type_filter, employee_filter, employee_id)
+        if after:
+            query = query.or_(f"start_date.gt.{after[0]},and(start_date.eq.{after[0]},id.gt.{after[1]})")
+        response = query.order("start_date").order("id").limit(page_size + 1).execute()
+        rows, next_cursor = split_page(response.data or [], page_size)
+        return rows, next_cursor, response.count if count else None
+
+    def _team_filters(self, query, status_filter=None, leave_type_filter=None, employee_filter=None,
+                      employee_id=None):
+        """Applies the team filters; an employee filter needs a query selecting ``_team_columns``."""
+        if status_filter:
+            query = query.in_("status", status_filter)
+        if leave_type_filter:
+            query = query.in_("leave_type", leave_type_filter)
+        if employee_filter and employee_filter != TEAM_FILTER_ALL:
+            # Names are not unique, so the filter stays on the inner embed:
+            # every employee with the name matches, as on SQLite.
+            query = query.eq("employee_table.First_Name", employee_filter)
+        if employee_id is not None:
+            query = query.eq("employee_id", employee_id)
+        return query
+
+    def get_snapshot_leaves(self, window_start, window_end):
+        # Ranged and ordered: one plain request would stop at the PostgREST
+        # row cap and silently drop whatever it did not reach, Pending included.
+        def build_query():
+            return self.client.table("off_roll_leave").select(TEAM_LEAVE_COLUMNS).or_(
+                f"status.eq.Pending,and(end_date.gte.{window_start.isoformat()},start_date.lte.{window_end.isoformat()})"
+            ).order("start_date").order("id")
+        return [_team_leave(row) for row in self._select_all(build_query)]
+
+    def get_leaves_in_range(self, range_start, range_end, status_filter=None):
+        def build_query():
+            query = self._team_filters(self.client.table("off_roll_leave").select(TEAM_LEAVE_COLUMNS), status_filter)
+            return query.lte("start_date", range_end.isoformat()).gte("end_date", range_start.isoformat()) \
+                .order("start_date").order("id")
+        return [_team_leave(row) for row in self._select_all(build_query)]
+
+    def get_all_employees_from_db(self):
+        rows = self._select_all(
+            lambda: self.client.table("employee_table").select("First_Name").order("First_Name").order("AUUID")
+        )
+        return [row['First_Name'] for row in rows]
+
+    def get_employees(self):
+        rows = self._select_all(
+            lambda: self.client.table("employee_table").select("AUUID, First_Name, Department")
+            .order("First_Name").order("AUUID")
+        )
+        return [Employee(row["AUUID"], row["First_Name"], row.get("Department")) for row in rows]
+
+    def search_employees(self, prefix, limit=None):
+        pattern = like_escape(" ".join(prefix.split()))
+        if not pattern:
+            return []
+        response = self.client.table("employee_table").select("AUUID, First_Name") \
+            .or_(f"First_Name.ilike.{_quoted(pattern + '*')},First_Name.ilike.{_quoted('* ' + pattern + '*')}") \
+            .order("First_Name").order("AUUID").limit(limit or DEFAULT_SEARCH_LIMIT).execute()
+        return [Employee(row["AUUID"], row["First_Name"]) for row in response.data or []]
+
+    def get_all_leaves(self):
+        rows = self._select_all(
+            lambda: self.client.table("off_roll_leave").select(
+                "id, leave_type, start_date, end_date, description, status, employee_table(First_Name)"
+            ).order("id")
+        )
+        return [
+            {
+                "id": row["id"],
+                "name": _employee_name(row),
+                "type": row["leave_type"],
+                "start": row["start_date"],
+                "end": row["end_date"],
+                "description": row["description"],
+                "status": row["status"]
+            }
+            for row in rows
+        ]
+
+    def get_latest_leave_entry(self):
+        response = self.client.table("off_roll_leave").select(
+            "leave_type, start_date, end_date, description, status, decline_reason, recall_reason, employee_table(First_Name)"
+        ).order("id", desc=True).limit(1).execute()
+        if not response.data:
+            return None
+        row = response.data[0]
+        return {
+            "employee_name": _employee_name(row),
+            "leave_type": row['leave_type'],
+            "start_date": row['start_date'],
+            "end_date": row['end_date'],
+            "description": row['description'],
+            "status": row['status'],
+            "decline_reason": row.get('decline_reason'),
+            "recall_reason": row.get('recall_reason')
+        }
+
+    def get_employee_leave_entitlements(self, employee_id):
+        response = self.client.table("leave_entitlements").select("*").eq("employee_id", employee_id).execute()
+        if response.data:
+            return response.data[0]
+        return None
+
+    def get_leave_stats(self, year=None, status=None):
+        def build_query():
+            query = self.client.table("leave_stats").select("employee_id, leave_type, year, status, requests, days")
+            if year is not None:
+                query = query.eq("year", year)
+            if status is not None:
+                query = query.eq("status", status)
+            return query.order("employee_id").order("leave_type").order("status")
+        return self._select_all(build_query)
+
+    def rebuild_leave_stats(self):
+        return self.client.rpc("rebuild_leave_stats").execute().data
+
+    def get_public_holidays(self):
+        """Returns every day in ``public_holidays`` as an ISO string, oldest first."""
+        rows = self._select_all(lambda: self.client.table("public_holidays").select("day").order("day"))
+        return [row["day"] for row in rows]
+
+    def sync_public_holidays(self, first_year, last_year, calendar=None):
+        """Writes the holiday calendar's days for the years to ``public_holidays`` and rebuilds ``leave_stats``.
+
+        The ``leave_stats`` trigger counts those days as days off, like the
+        SQLite backend does with its ``HolidayCalendar``.
+        """
+        calendar = calendar or self.calendar or HolidayCalendar()
+        days = {str(day) for day in calendar.holidays(first_year, last_year)}
+        stored = self.client.table("public_holidays").select("day") \
+            .gte("day", f"{first_year}-01-01").lte("day", f"{last_year}-12-31").execute().data or []
+        stale = sorted({row["day"] for row in stored} - days)
+        if stale:
+            self.client.table("public_holidays").delete().in_("day", stale).execute()
+        if days:
+            self.client.table("public_holidays").upsert([{"day": day} for day in sorted(days)]).execute()
+        return self.rebuild_leave_stats()
+
+    def get_approved_leave_rows(self, employee_ids=None, range_start=None, range_end=None):
+        def build_query():
+            query = self.client.table("off_roll_leave").select(
+                "employee_id, leave_type, start_date, end_date, start_half_day, end_half_day, "
+                "employee_table(First_Name, Department)"
+            ).eq("status", "Approved")
+            if employee_ids is not None:
+                query = query.in_("employee_id", list(employee_ids))
+            if range_start is not None and range_end is not None:
+                query = query.lte("start_date", range_end.isoformat()).gte("end_date", range_start.isoformat())
+            return query.order("id")
+        return [
+            {
+                "employee_id": row["employee_id"],
+                "employee_name": _employee_name(row),
+                "department": (row.get("employee_table") or {}).get("Department"),
+                "leave_type": row["leave_type"],
+                "start_date": row["start_date"],
+                "end_date": row["end_date"],
+                "start_half_day": row.get("start_half_day"),
+                "end_half_day": row.get("end_half_day")
+            }
+            for row in self._select_all(build_query)
+        ]
+
+    def get_leave_entitlements(self, employee_ids=None):
+        def build_query():
+            query = self.client.table("leave_entitlements").select("*, employee_table(First_Name)")
+            if employee_ids is not None:
+                query = query.in_("employee_id", list(employee_ids))
+            return query.order("employee_id")
+        rows = []
+        for row in self._select_all(build_query):
+            row["employee_name"] = _employee_name(row)
+            del row["employee_table"]
+            rows.append(row)
+        return rows
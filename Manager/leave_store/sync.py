@@ -0,0 +1,375 @@
+# leave_store/sync.py
+"""Incremental (delta) sync of ``off_roll_leave`` and ``employee_table``.
+
+After one full load, each refresh only pulls rows whose ``updated_at`` is at
+or after the last watermark, plus tombstones for rows deleted since then.
+The Supabase side needs the columns, triggers and tombstone table from
+``sql/delta_sync.sql``.
+
+Tombstones are pruned once they are ``TOMBSTONE_RETENTION`` old. A replica
+that has not synced for ``RELOAD_AFTER`` may have missed pruned tombstones,
+so its next refresh reloads both tables in full and drops every local row
+Supabase no longer has instead of relying on them.
+
+``SyncedBackend`` answers reads from the local copy and sends writes to
+Supabase, so dashboard reads cost no round trip and a refresh costs only the
+rows that changed.
+"""
+import threading
+import time
+from bisect import bisect_right
+from datetime import datetime, timedelta, timezone
+
+from .base import LeaveBackend, TEAM_FILTER_ALL
+from .pagination import DEFAULT_PAGE_SIZE, LeavePage, page_cursor
+from .records import Employee, LeaveHistoryEntry, LeaveRecord
+from .snapshot import LeaveSnapshot
+
+# Synced table -> (primary key column, key type).
+SYNC_TABLES = {
+    "employee_table": ("AUUID", str),
+    "off_roll_leave": ("id", int),
+}
+TOMBSTONE_TABLE = "sync_tombstones"
+# Watermark name under which replicas keep the wall-clock time of their last refresh.
+SYNCED_AT = "synced_at"
+
+BATCH_SIZE = 1000
+# Re-read this far behind the watermark, since updated_at is stamped when a
+# transaction starts, not when it commits. Re-read rows that are unchanged
+# are skipped by the replica, so they cost no write. A row committed more
+# than this after its stamp is still missed until it changes again or the
+# replica reloads; the app writes in single short statements, so only long
+# manual transactions against the tables are exposed to that.
+WATERMARK_OVERLAP = timedelta(seconds=5)
+# Must match the prune_sync_tombstones() default in sql/delta_sync.sql. The
+# day between the two covers clock skew and the prune job's schedule.
+TOMBSTONE_RETENTION = timedelta(days=7)
+RELOAD_AFTER = timedelta(days=6)
+# How stale local reads may get before the next read triggers a refresh.
+DEFAULT_MAX_STALENESS = 15
+
+
+def overlap_watermark(watermark):
+    if watermark is None:
+        return None
+    return (datetime.fromisoformat(watermark) - WATERMARK_OVERLAP).isoformat()
+
+
+class MemoryReplica:
+    """In-process copy of the synced tables, keyed by primary key."""
+
+    def __init__(self):
+        self.tables = {table: {} for table in SYNC_TABLES}
+        self.watermarks = {}
+        self.version = 0
+        self.lock = threading.RLock()
+        self._snapshot = None
+
+    def get_watermark(self, name):
+        return self.watermarks.get(name)
+
+    def set_watermark(self, name, value):
+        self.watermarks[name] = value
+
+    def upsert(self, table, rows):
+        """Stores the rows that differ from the local copy; returns how many did."""
+        key, _ = SYNC_TABLES[table]
+        stored = self.tables[table]
+        with self.lock:
+            changed = [row for row in rows if stored.get(row[key]) != row]
+            for row in changed:
+                stored[row[key]] = row
+            if changed:
+                self.version += 1
+        return len(changed)
+
+    def keys(self, table):
+        with self.lock:
+            return list(self.tables[table])
+
+    def delete(self, table, keys):
+        """Removes the rows still present; returns how many were."""
+        with self.lock:
+            removed = sum(self.tables[table].pop(key, None) is not None for key in keys)
+            if removed:
+                self.version += 1
+        return removed
+
+    # ---- reads ----
+
+    def employee_name(self, employee_id):
+        employee = self.tables["employee_table"].get(employee_id)
+        return employee["First_Name"] if employee else None
+
+    def team_leave(self, row):
+        return LeaveRecord(row["id"], row["employee_id"], self.employee_name(row["employee_id"]), row["leave_type"],
+                           row["start_date"], row["end_date"], row["description"], row["status"],
+                           row.get("decline_reason"))
+
+    def snapshot(self):
+        """Returns every synced leave as a ``LeaveSnapshot``, rebuilt only after changes."""
+        with self.lock:
+            if self._snapshot is None or self._snapshot[0] != self.version:
+                rows = [self.team_leave(row) for row in self.tables["off_roll_leave"].values()]
+                self._snapshot = (self.version, LeaveSnapshot(rows))
+            return self._snapshot[1]
+
+
+class DeltaSync:
+    """Pulls changed rows and tombstones from Supabase into a replica."""
+
+    def __init__(self, client, replica, batch_size=BATCH_SIZE):
+        self.client = client
+        self.replica = replica
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self.last_refresh = None
+
+    def refresh(self):
+        """Applies every change since the last watermark; returns the number of rows that changed locally."""
+        with self._lock:
+            started = datetime.now(timezone.utc)
+            synced_at = self.replica.get_watermark(SYNCED_AT)
+            reload = synced_at is not None and started - datetime.fromisoformat(synced_at) > RELOAD_AFTER
+            applied = 0
+            for table, (key, _) in SYNC_TABLES.items():
+                applied += self._pull_table(table, key, reload)
+            applied += self._pull_tombstones()
+            self.replica.set_watermark(SYNCED_AT, started.isoformat())
+            self.last_refresh = time.monotonic()
+            return applied
+
+    def _batches(self, table, columns, stamp, key, since):
+        """Yields the rows with ``stamp`` at or after ``since``, keyset-paged on ``(stamp, key)``.
+
+        Many rows can share one stamp (a bulk write gets a single ``now()``),
+        so the key breaks ties and no batch is re-read or skipped.
+        """
+        cursor = None
+        while True:
+            query = self.client.table(table).select(columns)
+            if since:
+                query = query.gte(stamp, since)
+            if cursor:
+                query = query.or_(f"{stamp}.gt.{cursor[0]},and({stamp}.eq.{cursor[0]},{key}.gt.{cursor[1]})")
+            rows = query.order(stamp).order(key).limit(self.batch_size).execute().data or []
+            if rows:
+                yield rows
+            if len(rows) < self.batch_size:
+                return
+            cursor = (rows[-1][stamp], rows[-1][key])
+
+    def _pull_table(self, table, key, reload=False):
+        """Upserts the changed rows; ``reload`` reads the whole table and drops local rows it no longer has."""
+        since = None if reload else overlap_watermark(self.replica.get_watermark(table))
+        newest = None
+        seen = set()
+        applied = 0
+        for rows in self._batches(table, "*", "updated_at", key, since):
+            applied += self.replica.upsert(table, rows)
+            if reload:
+                seen.update(row[key] for row in rows)
+            # Batches come ordered by updated_at, so the last row is the newest.
+            newest = rows[-1]["updated_at"]
+        if reload:
+            applied += self.replica.delete(table, [stored for stored in self.replica.keys(table) if stored not in seen])
+        if newest and newest != self.replica.get_watermark(table):
+            self.replica.set_watermark(table, newest)
+        return applied
+
+    def _pull_tombstones(self):
+        since = overlap_watermark(self.replica.get_watermark(TOMBSTONE_TABLE))
+        newest = None
+        removed = 0
+        for tombstones in self._batches(TOMBSTONE_TABLE, "id, table_name, row_id, deleted_at", "deleted_at", "id",
+                                        since):
+            by_table = {}
+            for tombstone in tombstones:
+                if tombstone["table_name"] in SYNC_TABLES:
+                    _, key_type = SYNC_TABLES[tombstone["table_name"]]
+                    by_table.setdefault(tombstone["table_name"], []).append(key_type(tombstone["row_id"]))
+            removed += sum(self.replica.delete(table, keys) for table, keys in by_table.items())
+            newest = tombstones[-1]["deleted_at"]
+        if newest and newest != self.replica.get_watermark(TOMBSTONE_TABLE):
+            self.replica.set_watermark(TOMBSTONE_TABLE, newest)
+        return removed
+
+
+class SyncedBackend(LeaveBackend):
+    """Reads from a delta-synced local copy, writes through to Supabase.
+
+    A read refreshes the copy first when it is older than ``max_staleness``
+    seconds; a write refreshes it straight away so the writer sees its change.
+    """
+
+    def __init__(self, remote, sync, max_staleness=DEFAULT_MAX_STALENESS):
+        self.remote = remote
+        self.calendar = remote.calendar
+        self.sync = sync
+        self.replica = sync.replica
+        self.name = f"{remote.name}-sync"
+        self.max_staleness = max_staleness
+
+    def _fresh_snapshot(self):
+        last = self.sync.last_refresh
+        if last is None or time.monotonic() - last > self.max_staleness:
+            self.sync.refresh()
+        return self.replica.snapshot()
+
+    def _leaves(self):
+        self._fresh_snapshot()
+        with self.replica.lock:
+            return list(self.replica.tables["off_roll_leave"].values())
+
+    # ---- writes go to Supabase, then pull the change back ----
+
+    def apply_for_leave(self, employee_id, leave_type, start_date, end_date, description, attachment,
+                        start_half_day=False, end_half_day=False):
+        result = self.remote.apply_for_leave(employee_id, leave_type, start_date, end_date, description, attachment,
+                                             start_half_day, end_half_day)
+        self.sync.refresh()
+        return result
+
+    def update_leave_status(self, leave_id, new_status, reason=None):
+        result = self.remote.update_leave_status(leave_id, new_status, reason)
+        self.sync.refresh()
+        return result
+
+    def update_leave_statuses(self, leave_ids, new_status, reason=None, expected_status=None):
+        results = self.remote.update_leave_statuses(leave_ids, new_status, reason, expected_status)
+        self.sync.refresh()
+        return results
+
+    # ---- reads from the local copy ----
+
+    def get_employee_by_name(self, employee_name):
+        self._fresh_snapshot()
+        with self.replica.lock:
+            employees = list(self.replica.tables["employee_table"].values())
+        for employee in employees:
+            if employee["First_Name"] == employee_name:
+                return Employee(employee["AUUID"], employee["First_Name"])
+        return None
+
+    def get_leave_history(self, employee_id):
+        rows = sorted(
+            (row for row in self._leaves() if row["employee_id"] == employee_id),
+            key=lambda row: row["start_date"], reverse=True
+        )
+        return [
+            LeaveHistoryEntry(row["leave_type"], row["start_date"], row["end_date"], row["description"],
+                              row["status"], row.get("decline_reason"), row.get("recall_reason"))
+            for row in rows
+        ]
+
+    def get_all_pending_leaves(self):
+        return self._fresh_snapshot().pending()
+
+    def get_approved_leaves(self):
+        return self._fresh_snapshot().approved()
+
+    def get_team_leaves(self, status_filter=None, leave_type_filter=None, employee_filter=None, employee_id=None):
+        if employee_filter == TEAM_FILTER_ALL:
+            employee_filter = None
+        return self._fresh_snapshot().filter(status_filter, leave_type_filter, employee_filter, employee_id)
+
+    def get_team_leaves_page(self, status_filter=None, leave_type_filter=None, employee_filter=None,
+                             after=None, page_size=DEFAULT_PAGE_SIZE, count="exact", employee_id=None):
+        rows = self.get_team_leaves(status_filter, leave_type_filter, employee_filter, employee_id)
+        # Rows are already ordered by (start_date, id).
+        start = bisect_right(rows, tuple(after), key=page_cursor) if after else 0
+        page = rows[start:start + page_size]
+        next_cursor = page_cursor(page[-1]) if start + page_size < len(rows) else None
+        return LeavePage(page, next_cursor, len(rows) if count else None, False)
+
+    def get_snapshot_leaves(self, window_start, window_end):
+        start, end = window_start.isoformat(), window_end.isoformat()
+        return [
+            row for row in self._fresh_snapshot().rows
+            if row["status"] == "Pending" or (row["end_date"] >= start and row["start_date"] <= end)
+        ]
+
+    def get_leaves_in_range(self, range_start, range_end, status_filter=None):
+        start, end = range_start.isoformat(), range_end.isoformat()
+        rows = self._fresh_snapshot().filter(status_filter) if status_filter else self._fresh_snapshot().rows
+        return [row for row in rows if row["start_date"] <= end and row["end_date"] >= start]
+
+    def get_all_employees_from_db(self):
+        self._fresh_snapshot()
+        with self.replica.lock:
+            return sorted(employee["First_Name"] for employee in self.replica.tables["employee_table"].values())
+
+    def get_employees(self):
+        self._fresh_snapshot()
+        with self.replica.lock:
+            employees = list(self.replica.tables["employee_table"].values())
+        return sorted(
+            (Employee(employee["AUUID"], employee["First_Name"], employee.get("Department")) for employee in employees),
+            key=lambda employee: (employee.name or "", employee.id)
+        )
+
+    def get_all_leaves(self):
+        return [
+            {
+                "id": row["id"],
+                "name": row["employee_name"],
+                "type": row["leave_type"],
+                "start": row["start_date"],
+                "end": row["end_date"],
+                "description": row["description"],
+                "status": row["status"]
+            }
+            for row in self._fresh_snapshot().rows
+        ]
+
+    def get_latest_leave_entry(self):
+        leaves = self._leaves()
+        if not leaves:
+            return None
+        row = max(leaves, key=lambda row: row["id"])
+        return {
+            "employee_name": self.replica.employee_name(row["employee_id"]),
+            "leave_type": row["leave_type"],
+            "start_date": row["start_date"],
+            "end_date": row["end_date"],
+            "description": row["description"],
+            "status": row["status"],
+            "decline_reason": row.get("decline_reason"),
+            "recall_reason": row.get("recall_reason")
+        }
+
+    def get_employee_leave_entitlements(self, employee_id):
+        # Entitlements are not synced; they change rarely and are cached upstream.
+        return self.remote.get_employee_leave_entitlements(employee_id)
+
+    def get_leave_entitlements(self, employee_ids=None):
+        return self.remote.get_leave_entitlements(employee_ids)
+
+    def get_leave_stats(self, year=None, status=None):
+        # leave_stats is kept by a Supabase trigger; it is a few rows, so read it there.
+        return self.remote.get_leave_stats(year, status)
+
+    def rebuild_leave_stats(self):
+        return self.remote.rebuild_leave_stats()
+
+    def get_approved_leave_rows(self, employee_ids=None, range_start=None, range_end=None):
+        wanted = set(employee_ids) if employee_ids is not None else None
+        in_range = range_start is not None and range_end is not None
+        start, end = (range_start.isoformat(), range_end.isoformat()) if in_range else (None, None)
+        employees = self.replica.tables["employee_table"]
+        return [
+            {
+                "employee_id": row["employee_id"],
+                "employee_name": self.replica.employee_name(row["employee_id"]),
+                "department": employees.get(row["employee_id"], {}).get("Department"),
+                "leave_type": row["leave_type"],
+                "start_date": row["start_date"],
+                "end_date": row["end_date"],
+                "start_half_day": row.get("start_half_day"),
+                "end_half_day": row.get("end_half_day")
+            }
+            for row in self._leaves()
+            if row["status"] == "Approved" and (wanted is None or row["employee_id"] in wanted)
+            and (not in_range or (row["start_date"] <= end and row["end_date"] >= start))
+        ]
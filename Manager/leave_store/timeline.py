@@ -0,0 +1,109 @@
+# leave_store/timeline.py
+"""Per-day absence counts over a date range, for the calendar heatmap.
+
+Each leave adds +1 on its first day and -1 on the day after its last day
+of a difference array; a prefix sum then gives how many people are off on
+every day. All leaves are applied at once with ``numpy.add.at``, one row of
+the difference array per leave type and per department, so the whole
+timeline is a single linear pass over the leaves and the days.
+
+The counts are of people, not leave rows: before the difference array each
+employee's overlapping leaves within a group are merged, so someone with
+two overlapping rows (a split or re-submitted request) is off once that day.
+"""
+import numpy as np
+
+UNKNOWN_DEPARTMENT = "Unassigned"
+
+
+def _days(values):
+    return np.array([str(value)[:10] if value else "NaT" for value in values], dtype="datetime64[D]")
+
+
+def _merge_by_person(keys, first, last):
+    """Merges the overlapping or adjacent day intervals that share a ``(group, person)`` key.
+
+    Returns the merged keys and their first/last day indexes.
+    """
+    order = sorted(range(len(keys)), key=lambda position: (keys[position], first[position]))
+    merged_keys, merged_first, merged_last = [], [], []
+    for position in order:
+        if merged_keys and merged_keys[-1] == keys[position] and first[position] <= merged_last[-1] + 1:
+            merged_last[-1] = max(merged_last[-1], last[position])
+        else:
+            merged_keys.append(keys[position])
+            merged_first.append(first[position])
+            merged_last.append(last[position])
+    return merged_keys, np.array(merged_first, dtype=np.int64), np.array(merged_last, dtype=np.int64)
+
+
+def _daily_counts(groups, people, first, last, length):
+    """Prefix-summed difference array of people off: one row per group label, one column per day."""
+    groups = [str(group) for group in groups]
+    keys, first, last = _merge_by_person(list(zip(groups, people)), first, last)
+    labels, index = np.unique(np.array([group for group, _ in keys], dtype=object).astype(str), return_inverse=True)
+    diff = np.zeros((len(labels), length + 1), dtype=np.int64)
+    np.add.at(diff, (index, first), 1)
+    np.add.at(diff, (index, last + 1), -1)
+    counts = np.cumsum(diff[:, :-1], axis=1)
+    return {label: counts[row] for row, label in enumerate(labels)}
+
+
+class AbsenceTimeline:
+    """People off per day between ``range_start`` and ``range_end`` (inclusive).
+
+    ``total`` and the arrays in ``by_leave_type`` / ``by_department`` are
+    aligned with ``days``.
+    """
+
+    def __init__(self, range_start, range_end, total, by_leave_type, by_department):
+        self.range_start = range_start
+        self.range_end = range_end
+        self.days = np.arange(
+            np.datetime64(range_start, "D"), np.datetime64(range_end, "D") + np.timedelta64(1, "D")
+        )
+        self.total = total
+        self.by_leave_type = by_leave_type
+        self.by_department = by_department
+
+    def __len__(self):
+        return len(self.days)
+
+    def peak(self):
+        return int(self.total.max()) if len(self.total) else 0
+
+    def daily(self, counts=None):
+        """Yields ``(date, count)`` for the days with anyone off."""
+        counts = self.total if counts is None else counts
+        for position in np.flatnonzero(counts):
+            yield self.days[position].item(), int(counts[position])
+
+
+def compute_absence_timeline(rows, range_start, range_end):
+    """Builds the ``AbsenceTimeline`` of the leave rows over ``[range_start, range_end]``.
+
+    Rows need ``start_date``, ``end_date``, ``leave_type``, ``employee_id``
+    and (optionally) ``department``; leaves are clipped to the range.
+    """
+    origin = np.datetime64(range_start, "D")
+    length = int((np.datetime64(range_end, "D") - origin).astype(int)) + 1
+    rows = list(rows)
+    starts = _days(row["start_date"] for row in rows)
+    ends = _days(row["end_date"] for row in rows)
+    keep = ~(np.isnat(starts) | np.isnat(ends)) & (ends >= starts)
+    first = (starts - origin).astype("int64")
+    last = (ends - origin).astype("int64")
+    keep &= (last >= 0) & (first < length)
+    first = np.clip(first[keep], 0, length - 1)
+    last = np.clip(last[keep], 0, length - 1)
+    kept = [row for row, flag in zip(rows, keep) if flag]
+    people = [str(row["employee_id"]) for row in kept]
+
+    total = _daily_counts([""] * len(kept), people, first, last, length)
+    return AbsenceTimeline(
+        range_start,
+        range_end,
+        total.get("", np.zeros(length, dtype=np.int64)),
+        _daily_counts([row["leave_type"] for row in kept], people, first, last, length),
+        _daily_counts([row.get("department") or UNKNOWN_DEPARTMENT for row in kept], people, first, last, length),
+    )
@@ -4,6 +4,8 @@ import pandas as pd
 from datetime import datetime, date
 import time
 
+from leave_store import RECORDER, current_session
+
 # Page configuration
 st.set_page_config(
     page_title="Leave Request Manager",
@@ -39,4 +41,42 @@ page_navigator = st.navigation({
     "Team Overview": [team_overview],
 })
 
-page_navigator.run()
\ No newline at end of file
+with RECORDER.rerun(page_navigator.title):
+    page_navigator.run()
+
+
+# ========== PERFORMANCE PANEL ==========
+
+def performance_panel():
+    """Sidebar breakdown of this rerun's queries and renders, with metric exports."""
+    if not st.sidebar.toggle("Performance panel", key="performance_panel"):
+        return
+    events = RECORDER.rerun_events(current_session())
+    queries = [event for event in events if event.kind == "query"]
+    with st.sidebar:
+        st.caption(
+            f"{len(queries)} queries, {sum(event.seconds for event in queries) * 1000:.0f} ms in the data layer, "
+            f"{sum(event.payload_bytes for event in queries) / 1024:.0f} KiB"
+        )
+        st.dataframe(
+            pd.DataFrame(
+                [
+                    {
+                        "What": event.operation,
+                        "Backend": event.backend,
+                        "ms": round(event.seconds * 1000, 1),
+                        "Rows": event.rows if event.kind == "query" else None,
+                        "KiB": round(event.payload_bytes / 1024, 1) if event.kind == "query" else None,
+                    }
+                    for event in events
+                ],
+                columns=["What", "Backend", "ms", "Rows", "KiB"],
+            ),
+            hide_index=True,
+        )
+        st.download_button("Prometheus metrics", RECORDER.to_prometheus(), file_name="leave_store_metrics.prom",
+                           mime="text/plain")
+        st.download_button("Events (JSON lines)", RECORDER.to_jsonl(), file_name="leave_store_events.jsonl",
+                           mime="application/x-ndjson")
+
+performance_panel()
\ No newline at end of file
@@ -0,0 +1,72 @@
+-- Supabase (Postgres) migration for leave_store.sync delta sync.
+-- Adds an updated_at watermark column to the synced tables, keeps it current
+-- with a trigger, and records hard deletes as tombstones. Tombstones are
+-- pruned after seven days (leave_store.sync.TOMBSTONE_RETENTION); replicas
+-- that have not synced for six days reload in full instead of reading them.
+
+ALTER TABLE off_roll_leave ADD COLUMN IF NOT EXISTS updated_at timestamptz NOT NULL DEFAULT now();
+ALTER TABLE employee_table ADD COLUMN IF NOT EXISTS updated_at timestamptz NOT NULL DEFAULT now();
+
+CREATE INDEX IF NOT EXISTS off_roll_leave_updated_at_idx ON off_roll_leave (updated_at, id);
+CREATE INDEX IF NOT EXISTS employee_table_updated_at_idx ON employee_table (updated_at, "AUUID");
+
+CREATE OR REPLACE FUNCTION touch_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at := now();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS off_roll_leave_touch ON off_roll_leave;
+CREATE TRIGGER off_roll_leave_touch BEFORE INSERT OR UPDATE ON off_roll_leave
+    FOR EACH ROW EXECUTE FUNCTION touch_updated_at();
+
+DROP TRIGGER IF EXISTS employee_table_touch ON employee_table;
+CREATE TRIGGER employee_table_touch BEFORE INSERT OR UPDATE ON employee_table
+    FOR EACH ROW EXECUTE FUNCTION touch_updated_at();
+
+CREATE TABLE IF NOT EXISTS sync_tombstones (
+    table_name text NOT NULL,
+    row_id text NOT NULL,
+    deleted_at timestamptz NOT NULL DEFAULT now()
+);
+-- A bulk delete stamps every tombstone with one now(), so replicas page on
+-- (deleted_at, id) rather than deleted_at alone.
+ALTER TABLE sync_tombstones ADD COLUMN IF NOT EXISTS id bigserial;
+DROP INDEX IF EXISTS sync_tombstones_deleted_at_idx;
+CREATE INDEX IF NOT EXISTS sync_tombstones_deleted_at_id_idx ON sync_tombstones (deleted_at, id);
+
+CREATE OR REPLACE FUNCTION record_tombstone() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO sync_tombstones (table_name, row_id) VALUES (TG_TABLE_NAME, OLD.id::text);
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION record_employee_tombstone() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO sync_tombstones (table_name, row_id) VALUES (TG_TABLE_NAME, OLD."AUUID"::text);
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS off_roll_leave_tombstone ON off_roll_leave;
+CREATE TRIGGER off_roll_leave_tombstone AFTER DELETE ON off_roll_leave
+    FOR EACH ROW EXECUTE FUNCTION record_tombstone();
+
+DROP TRIGGER IF EXISTS employee_table_tombstone ON employee_table;
+CREATE TRIGGER employee_table_tombstone AFTER DELETE ON employee_table
+    FOR EACH ROW EXECUTE FUNCTION record_employee_tombstone();
+
+CREATE OR REPLACE FUNCTION prune_sync_tombstones(keep interval DEFAULT interval '7 days') RETURNS integer AS $$
+DECLARE
+    pruned integer;
+BEGIN
+    DELETE FROM sync_tombstones WHERE deleted_at < now() - keep;
+    GET DIAGNOSTICS pruned = ROW_COUNT;
+    RETURN pruned;
+END;
+$$ LANGUAGE plpgsql;
+
+-- With pg_cron enabled, prune nightly:
+-- SELECT cron.schedule('prune-sync-tombstones', '30 2 * * *', 'SELECT prune_sync_tombstones()');
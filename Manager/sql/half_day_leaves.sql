@@ -0,0 +1,6 @@
+-- Supabase (Postgres) migration for working-day leave durations.
+-- Flags a leave whose first and/or last day is only a half day; see
+-- leave_store/durations.py.
+
+ALTER TABLE off_roll_leave ADD COLUMN IF NOT EXISTS start_half_day boolean NOT NULL DEFAULT false;
+ALTER TABLE off_roll_leave ADD COLUMN IF NOT EXISTS end_half_day boolean NOT NULL DEFAULT false;
@@ -0,0 +1,104 @@
+-- Supabase (Postgres) migration for the leave_stats summary (leave_store/stats.py).
+-- Request and day counts per (employee, leave type, year, status), kept
+-- current by a trigger in the same transaction as every leave write.
+-- Maternity and paternity leave count calendar days, every other type
+-- working days (leave_store.durations.CALENDAR_DAY_LEAVE_TYPES).
+-- Working days are Monday-Friday minus the dates in public_holidays and
+-- minus half days, the rule the SQLite backend applies with its
+-- HolidayCalendar. Fill public_holidays from that same calendar with
+-- SupabaseBackend.sync_public_holidays(first_year, last_year), which also
+-- rebuilds the stats, or maintain the table by hand and set the app's
+-- HOLIDAY_CALENDAR secret to "PUBLIC_HOLIDAYS" so it reads the same days.
+-- Requires sql/half_day_leaves.sql. Rebuild with: SELECT rebuild_leave_stats();
+
+CREATE TABLE IF NOT EXISTS leave_stats (
+    employee_id text NOT NULL,
+    leave_type text NOT NULL,
+    year integer NOT NULL,
+    status text NOT NULL,
+    requests integer NOT NULL,
+    days numeric NOT NULL,
+    PRIMARY KEY (employee_id, leave_type, year, status)
+);
+
+CREATE TABLE IF NOT EXISTS public_holidays (
+    day date PRIMARY KEY
+);
+
+CREATE OR REPLACE FUNCTION leave_working_days(start_date date, end_date date, start_half boolean, end_half boolean)
+RETURNS numeric AS $$
+    WITH days AS (
+        SELECT series.day::date AS day,
+               extract(isodow FROM series.day) < 6 AND NOT EXISTS (
+                   SELECT 1 FROM public_holidays WHERE public_holidays.day = series.day::date
+               ) AS working
+        FROM generate_series(start_date, end_date, interval '1 day') AS series(day)
+    )
+    SELECT count(*) FILTER (WHERE working)
+         - CASE WHEN start_half AND bool_or(working) FILTER (WHERE day = start_date) THEN 0.5 ELSE 0 END
+         - CASE WHEN end_half AND bool_or(working) FILTER (WHERE day = end_date)
+                     AND NOT (start_half AND start_date = end_date) THEN 0.5 ELSE 0 END
+    FROM days;
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION leave_calendar_days(start_date date, end_date date, start_half boolean, end_half boolean)
+RETURNS numeric AS $$
+    SELECT (end_date - start_date + 1)::numeric
+         - CASE WHEN start_half THEN 0.5 ELSE 0 END
+         - CASE WHEN end_half AND NOT (start_half AND start_date = end_date) THEN 0.5 ELSE 0 END;
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION leave_days(leave_type text, start_date date, end_date date, start_half boolean,
+                                      end_half boolean)
+RETURNS numeric AS $$
+    SELECT CASE WHEN leave_type IN ('Maternity', 'Paternity')
+                THEN leave_calendar_days(start_date, end_date, start_half, end_half)
+                ELSE leave_working_days(start_date, end_date, start_half, end_half) END;
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION bump_leave_stats(leave off_roll_leave, sign integer) RETURNS void AS $$
+    INSERT INTO leave_stats (employee_id, leave_type, year, status, requests, days)
+    VALUES (
+        leave.employee_id::text, leave.leave_type, extract(year FROM leave.start_date)::integer, leave.status, sign,
+        sign * leave_days(leave.leave_type, leave.start_date, leave.end_date, leave.start_half_day, leave.end_half_day)
+    )
+    ON CONFLICT (employee_id, leave_type, year, status)
+    DO UPDATE SET requests = leave_stats.requests + excluded.requests, days = leave_stats.days + excluded.days;
+    -- Only the key just decremented can have dropped to zero.
+    DELETE FROM leave_stats
+    WHERE sign < 0 AND employee_id = leave.employee_id::text AND leave_type = leave.leave_type
+      AND year = extract(year FROM leave.start_date)::integer AND status = leave.status AND requests <= 0;
+$$ LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION maintain_leave_stats() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM bump_leave_stats(OLD, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM bump_leave_stats(NEW, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS off_roll_leave_stats ON off_roll_leave;
+CREATE TRIGGER off_roll_leave_stats AFTER INSERT OR UPDATE OR DELETE ON off_roll_leave
+    FOR EACH ROW EXECUTE FUNCTION maintain_leave_stats();
+
+CREATE OR REPLACE FUNCTION rebuild_leave_stats() RETURNS integer AS $$
+DECLARE
+    rebuilt integer;
+BEGIN
+    DELETE FROM leave_stats;
+    INSERT INTO leave_stats (employee_id, leave_type, year, status, requests, days)
+    SELECT employee_id::text, leave_type, extract(year FROM start_date)::integer, status, count(*),
+           sum(leave_days(leave_type, start_date, end_date, start_half_day, end_half_day))
+    FROM off_roll_leave
+    GROUP BY 1, 2, 3, 4;
+    GET DIAGNOSTICS rebuilt = ROW_COUNT;
+    RETURN rebuilt;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT rebuild_leave_stats();
@@ -0,0 +1,24 @@
+-- Supabase (Postgres) migration for the recall/withdrawal reason column.
+-- The manager app used to write recall and withdrawal reasons to
+-- off_roll_leave.recall_leave while reading recall_reason; every backend now
+-- reads and writes recall_reason (leave_store.base.status_update_fields).
+-- Renames recall_leave where only it exists, otherwise copies its reasons
+-- into recall_reason and leaves the old column in place.
+
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM information_schema.columns
+               WHERE table_schema = current_schema() AND table_name = 'off_roll_leave'
+                 AND column_name = 'recall_leave') THEN
+        IF NOT EXISTS (SELECT 1 FROM information_schema.columns
+                       WHERE table_schema = current_schema() AND table_name = 'off_roll_leave'
+                         AND column_name = 'recall_reason') THEN
+            ALTER TABLE off_roll_leave RENAME COLUMN recall_leave TO recall_reason;
+        ELSE
+            UPDATE off_roll_leave SET recall_reason = recall_leave
+            WHERE recall_reason IS NULL AND recall_leave IS NOT NULL;
+        END IF;
+    END IF;
+END $$;
+
+ALTER TABLE off_roll_leave ADD COLUMN IF NOT EXISTS recall_reason text;
@@ -1,302 +1,14 @@
 import streamlit as st
 from datetime import date, timedelta
-#from helpers.database import * # Import our new database module
-from supabase import create_client, Client
-
-#DATABASE LOGIC
-import sqlite3
-from datetime import date
-import streamlit as st
-from supabase import create_client, Client
-from datetime import datetime
-import pandas as pd
-
-# Initialize Supabase client
-@st.cache_resource
-def init_supabase():
-    """Initialize Supabase client with credentials from Streamlit secrets."""
-    url = st.secrets["SUPABASE_URL"]
-    key = st.secrets["SUPABASE_KEY"]
-    supabase: Client = create_client(url, key)
-    return supabase
-
-
-
-def get_employee_by_name(employee_name):
-    """Fetches employee details by name from Supabase."""
-    supabase = init_supabase()
-    try:
-        response = supabase.table("employee_table").select("AUUID, First_Name").eq("First_Name", employee_name).execute()
-        if response.data:
-            # Supabase returns a list of dictionaries, fetchone equivalent
-            return response.data[0]
-        return None
-    except Exception as e:
-        st.error(f"Error fetching employee by name: {str(e)}")
-        return None
-
-def apply_for_leave(employee_id, leave_type, start_date, end_date, description, attachment):
-    """Adds a new leave application to the Supabase database."""
-    supabase = init_supabase()
-    try:
-        response = supabase.table("off_roll_leave").insert({
-            "employee_id": employee_id,
-            "leave_type": leave_type,
-            "start_date": start_date.isoformat(),
-            "end_date": end_date.isoformat(),
-            "description": description,
-            "attachment": bool(attachment),
-            "status": "Pending"
-        }).execute()
-        if response.data:
-            return True, "Leave request submitted successfully!"
-        return False, "Failed to submit leave request"
-    except Exception as e:
-        return False, f"Error submitting leave request: {str(e)}"
-
-def get_leave_history(employee_id):
-    """Fetches the leave history for a specific employee from Supabase."""
-    supabase = init_supabase()
-    try:
-        response = supabase.table("off_roll_leave").select(
-            "leave_type, start_date, end_date, description, status, decline_reason, recall_leave"
-        ).eq("employee_id", employee_id).order("start_date", desc=True).execute()
-
-        if response.data:
-            # Convert to list of tuples for consistency with original SQLite output format
-            history = []
-            for row in response.data:
-                history.append((
-                    row['leave_type'],
-                    row['start_date'],
-                    row['end_date'],
-                    row['description'],
-                    row['status'],
-                    row.get('decline_reason'),
-                    row.get('recall_reason')
-                ))
-            return history
-        return []
-    except Exception as e:
-        st.error(f"Error fetching leave history: {str(e)}")
-        return []
-
-def get_all_pending_leaves():
-    """Fetches all leave requests with a 'Pending' status for the manager from Supabase."""
-    supabase = init_supabase()
-    try:
-        # Join leaves with employees to get employee name
-        response = supabase.table("off_roll_leave").select(
-            "AUUID, employee_id, leave_type, start_date, end_date, description, employee_table(First_Name)"
-        ).eq("status", "Pending").execute()
-
-        if response.data:
-            pending_leaves = []
-            for row in response.data:
-                # Extract employee name from the nested 'employees' dictionary
-                employee_name = row['employee_table']['First_Name'] if row['employee_table'] else None
-                pending_leaves.append({
-                    "id": row['AUUID'],
-                    "employee_name": employee_name,
-                    "leave_type": row['leave_type'],
-                    "start_date": row['start_date'],
-                    "end_date": row['end_date'],
-                    "description": row['description']
-                })
-            return pending_leaves
-        return []
-    except Exception as e:
-        st.error(f"Error fetching pending leaves: {str(e)}")
-        return []
-
-def get_approved_leaves():
-    """Fetches all leave requests with an 'Approved' status from Supabase."""
-    supabase = init_supabase()
-    try:
-        response = supabase.table("off_roll_leave").select(
-            "AUUID, employee_id, leave_type, start_date, end_date, description, employee_table(First_Name)"
-        ).eq("status", "Approved").execute()
-
-        if response.data:
-            approved_leaves = []
-            for row in response.data:
-                employee_name = row['employee_table']['First_Name'] if row['employee_table'] else None
-                approved_leaves.append({
-                    "id": row['AUUID'],
-                    "employee_name": employee_name,
-                    "leave_type": row['leave_type'],
-                    "start_date": row['start_date'],
-                    "end_date": row['end_date'],
-                    "description": row['description']
-                })
-            return approved_leaves
-        return []
-    except Exception as e:
-        st.error(f"Error fetching approved leaves: {str(e)}")
-        return []
-
-def update_leave_status(leave_id, new_status, reason=None):
-    """Updates the status of a leave request in Supabase."""
-    supabase = init_supabase()
-    update_data = {"status": new_status}
-    if new_status == "Declined":
-        update_data["decline_reason"] = reason
-    elif new_status == "Recalled":
-        update_data["recall_reason"] = reason
-    elif new_status == "Withdrawn": # Added for consistency with withdraw_leave
-        update_data["recall_reason"] = reason
-
-    try:
-        response = supabase.table("off_roll_leave").update(update_data).eq("employee_id", leave_id).execute()
-        if response.data:
-            return True, f"Leave status updated to {new_status}"
-        return False, "Failed to update leave status"
-    except Exception as e:
-        return False, f"Error updating leave status: {str(e)}"
-
-def get_team_leaves(status_filter=None, leave_type_filter=None, employee_filter=None):
-    """Fetches all team leaves with optional filters for the manager's dashboard from Supabase."""
-    supabase = init_supabase()
-    try:
-        query = supabase.table("off_roll_leave").select(
-            "employee_id, leave_type, start_date, end_date, status, description, decline_reason, employee_table(First_Name)"
-        )
-
-        if status_filter:
-            query = query.in_("status", status_filter)
-        if leave_type_filter:
-            query = query.in_("leave_type", leave_type_filter) # Corrected potential typo: ensure it's not `query = query = query.in_`
-        if employee_filter and employee_filter != "All Team Members":
-            query = query.eq("employee_table.First_Name", employee_filter)
-
-        response = query.execute()
-
-        if response.data:
-            leaves = []
-            for row in response.data:
-                employee_name = row['employee_table']['First_Name'] if row['employee_table'] else None
-                leaves.append({ # <--- THIS IS THE KEY CHANGE! Now creating a dictionary
-                    "employee_name": employee_name, # Add the key "employee_name":
-                    "leave_type": row['leave_type'],
-                    "start_date": row['start_date'],
-                    "end_date": row['end_date'],
-                    "status": row['status'],
-                    "description": row['description'],
-                    "decline_reason": row.get('decline_reason')
-                })
-            return leaves
-        return []
-    except Exception as e:
-        st.error(f"Error fetching team leaves: {str(e)}")
-        return []
-
-def get_all_employees_from_db():
-    """Gets a unique list of all employees from the employees table in Supabase."""
-    supabase = init_supabase()
-    try:
-        response = supabase.table("employee_table").select("First_Name").order("First_Name", desc=False).execute()
-        if response.data:
-            employees = [row['First_Name'] for row in response.data]
-            return employees
-        return []
-    except Exception as e:
-        st.error(f"Error fetching employees: {str(e)}")
-        return []
-
-def get_all_leaves():
-    """Fetches all leave records from Supabase, joining with employee names."""
-    supabase = init_supabase()
-    try:
-        response = supabase.table("off_roll_leave").select(
-            "AUUID, leave_type, start_date, end_date, description, status, employee_table(First_Name)"
-        ).execute()
-
-        if response.data:
-            leaves = []
-            for row in response.data:
-                employee_name = row['employee_table']['First Name'] if row['employee_table'] else None
-                leaves.append({
-                    "id": row["AUUID"],
-                    "name": employee_name,
-                    "type": row["leave_type"],
-                    "start": row["start_date"],
-                    "end": row["end_date"],
-                    "description": row["description"],
-                    "status": row["status"]
-                })
-            return leaves
-        return []
-    except Exception as e:
-        st.error(f"Error fetching all leaves: {str(e)}")
-        return []
-
-def withdraw_leave(leave_id, recall_reason=None):
-    """Marks a leave request as Withdrawn in Supabase with an optional reason."""
-    # This calls update_leave_status for consistency
-    return update_leave_status(leave_id, "Withdrawn", recall_reason)
-
-def get_latest_leave_entry():
-    """Fetches the details of the most recently added leave entry from Supabase."""
-    supabase = init_supabase()
-    try:
-        response = supabase.table("off_roll_leave").select(
-            "leave_type, start_date, end_date, description, status, decline_reason, recall_reason, employee_table(First_Name)"
-        ).order("id", desc=True).limit(1).execute()
-
-        if response.data:
-            row = response.data[0]
-            employee_name = row['employee_table']['First_Name'] if row['employees'] else None
-            return {
-                "employee_name": employee_name,
-                "leave_type": row['leave_type'],
-                "start_date": row['start_date'],
-                "end_date": row['end_date'],
-                "description": row['description'],
-                "status": row['status'],
-                "decline_reason": row.get('decline_reason'),
-                "recall_reason": row.get('recall_reason')
-            }
-        return None
-    except Exception as e:
-        st.error(f"Error fetching latest leave entry: {str(e)}")
-        return None
-
-def get_employee_leave_entitlements(employee_id):
-    """Fetches leave entitlements for a given employee from Supabase."""
-    supabase = init_supabase()
-    try:
-        response = supabase.table("leave_entitlements").select("*").eq("employee_id", employee_id).execute()
-        if response.data:
-            return response.data[0] # Return the first matching record
-        return None
-    except Exception as e:
-        st.error(f"Error fetching employee leave entitlements: {str(e)}")
-        return None
-
-def get_employee_used_leave(employee_id, leave_type=None):
-    """Calculates total used leave days for an employee, optionally by type, from Supabase."""
-    supabase = init_supabase()
-    try:
-        query = supabase.table("off_roll_leave").select("start_date, end_date").eq("employee_id", employee_id).eq("status", "Approved")
-        if leave_type:
-            query = query.eq("leave_type", leave_type)
-
-        response = query.execute()
-        used_days = 0
-        if response.data:
-            for record in response.data:
-                start = datetime.fromisoformat(record['start_date'])
-                end = datetime.fromisoformat(record['end_date'])
-                used_days += (end - start).days + 1 # +1 to include start and end day
-        return int(used_days)
-    except Exception as e:
-        st.error(f"Error calculating used leave: {str(e)}")
-        return 0
-
-# Initialize the database (run once)
-# Note: You'll need to create the table in Supabase dashboard first
-# init_db()
 
+from leave_store import (
+    get_absence_timeline,
+    get_calendar_leaves,
+    month_bounds,
+    parse_dates_set,
+    snapshot_window,
+    timed,
+)
 
 
 # Ultra-modern CSS with glassmorphism and advanced animations
@@ -786,27 +498,77 @@ def inject_premium_css():
     </style>
   """)
 
-st.header("Team Leave Calendar")
-            # You can enhance this to draw events on a calendar from the DB
-            # This part requires a calendar component like streamlit-calendar
-            # For now, we'll just list the approved leaves.
-st.info("Calendar view shows all approved leaves.")
-approved_leaves = get_team_leaves(status_filter=["Approved"])
-            
-events = []
-for leave in approved_leaves:
-    events.append({
-                    "title": f"{leave["employee_name"]} - {leave["leave_type"]}",
-                    "start": leave["start_date"],
-                    "end": leave["end_date"],
+def heatmap_events(timeline, counts):
+    """One shaded background cell plus a head-count label per day with anyone off."""
+    peak = max(int(counts.max()), 1) if len(counts) else 1
+    events = []
+    for day, count in timeline.daily(counts):
+        day = day.isoformat()
+        events.append({
+            "start": day,
+            "end": day,
+            "display": "background",
+            "backgroundColor": f"rgba(220, 38, 38, {0.15 + 0.75 * count / peak:.2f})",
         })
-            
+        events.append({"title": f"{count} off", "start": day, "allDay": True})
+    return events
+
+@timed("heatmap_view")
+def heatmap_view():
+    window_start, window_end = snapshot_window()
+    timeline = get_absence_timeline(window_start, window_end)
+    if timeline is None:
+        return
+
+    breakdowns = {"All leave": timeline.total}
+    breakdowns.update({f"Leave type: {name}": counts for name, counts in sorted(timeline.by_leave_type.items())})
+    breakdowns.update({f"Department: {name}": counts for name, counts in sorted(timeline.by_department.items())})
+    selected = st.selectbox("Count people off for", list(breakdowns))
+    counts = breakdowns[selected]
+    st.caption(f"Busiest day: {int(counts.max()) if len(counts) else 0} people off. Darker days have more people off.")
+
+    try:
+        from streamlit_calendar import calendar
+        calendar(events=heatmap_events(timeline, counts), key=f"heatmap_{selected}")
+    except ImportError:
+        st.write({day.isoformat(): count for day, count in timeline.daily(counts)})
+
+@timed("calendar_view")
+def calendar_view():
+    # The component reports the dates it shows through its datesSet callback;
+    # its last value (kept under the component key) decides what to load.
+    visible = parse_dates_set(st.session_state.get("team_calendar")) or month_bounds(date.today())
+    approved_leaves = get_calendar_leaves(*visible)
+
+    events = []
+    for leave in approved_leaves:
+        events.append({
+                        "title": f"{leave['employee_name']} - {leave['leave_type']}",
+                        "start": leave["start_date"],
+                        "end": leave["end_date"],
+            })
+
             # If you have streamlit_calendar installed
-try:
-    from streamlit_calendar import calendar
-    calendar(events=events)
-except ImportError:
-    st.write(events)
+    try:
+        from streamlit_calendar import calendar
+        calendar(
+            events=events,
+            options={"initialView": "dayGridMonth", "initialDate": (visible[0] + timedelta(days=7)).isoformat()},
+            callbacks=["datesSet"],
+            key="team_calendar",
+        )
+    except ImportError:
+        st.write(events)
+
+st.header("Team Leave Calendar")
+view_mode = st.radio("Calendar view", ["Events", "Heatmap"], horizontal=True)
+
+if view_mode == "Heatmap":
+    st.info("Heatmap shows how many team members are on approved leave each day.")
+    heatmap_view()
+else:
+    st.info("Calendar view shows the approved leaves in the dates on screen.")
+    calendar_view()
 
 # Placeholder for LEAVE_POLICIES if not defined elsewhere
 LEAVE_POLICIES = {
@@ -0,0 +1,50 @@
+# tests/conftest.py
+"""Shared fixtures: one small synthetic team loaded into SQLite and into the PostgREST stand-in."""
+from datetime import date
+
+import pytest
+
+from benchmarks import synthetic
+from benchmarks.postgrest_standin import PostgRESTStandIn
+from leave_store.sqlite_backend import SQLiteBackend
+from leave_store.supabase_backend import SupabaseBackend
+
+AS_OF = date(2025, 3, 3)
+# Sixty employees give about 1,260 leaves, past PostgREST's 1,000-row cap.
+EMPLOYEES = 60
+
+
+@pytest.fixture(scope="session")
+def as_of():
+    return AS_OF
+
+
+@pytest.fixture(scope="session")
+def dataset():
+    return synthetic.generate(EMPLOYEES, seed=7, as_of=AS_OF)
+
+
+@pytest.fixture
+def sqlite_backend(tmp_path, dataset):
+    backend = SQLiteBackend(str(tmp_path / "leaves.db"))
+    synthetic.load_sqlite(backend, dataset)
+    yield backend
+    backend.pool.close()
+
+
+@pytest.fixture
+def standin(dataset):
+    client = PostgRESTStandIn()
+    synthetic.load_standin(client, dataset)
+    client.load("sync_tombstones", [])
+    return client
+
+
+@pytest.fixture
+def supabase_backend(standin):
+    return SupabaseBackend(standin)
+
+
+@pytest.fixture(params=["sqlite", "supabase"])
+def backend(request):
+    return request.getfixturevalue(f"{request.param}_backend")
@@ -0,0 +1,114 @@
+# tests/test_cache.py
+import threading
+
+from leave_store.cache import CachedBackend, TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_expiry_and_tag_invalidation():
+    clock = FakeClock()
+    cache = TTLCache(clock=clock)
+    cache.set("pending", [1], ttl=30, tags=("leaves:Pending",))
+    cache.set("roster", ["Amina"], ttl=600, tags=("employees",))
+    assert cache.get("pending") == [1]
+    clock.now = 31
+    assert cache.get("pending") is None
+    assert cache.get("roster") == ["Amina"]
+    cache.invalidate("employees")
+    assert cache.get("roster") is None
+
+
+def test_lru_eviction():
+    cache = TTLCache(max_entries=2)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    cache.get("a")
+    cache.set("c", 3, ttl=60)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+
+def test_set_skips_values_loaded_across_an_invalidation():
+    cache = TTLCache()
+    since = cache.generation()
+    cache.invalidate("leaves:Pending")
+    assert not cache.set("pending", [1], ttl=30, tags=("leaves:Pending",), since=since)
+    assert cache.set("roster", ["Amina"], ttl=30, tags=("employees",), since=since)
+
+    since = cache.generation()
+    cache.invalidate_prefix("employee:")
+    assert not cache.set("history", [], ttl=30, tags=("employee:e1",), since=since)
+    since = cache.generation()
+    cache.clear()
+    assert not cache.set("roster", ["Amina"], ttl=30, tags=("employees",), since=since)
+    assert cache.get("pending") is None and cache.get("history") is None
+
+
+class SlowPendingBackend:
+    """Passes everything through, but holds ``get_all_pending_leaves`` until released."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.loaded = threading.Event()
+        self.release = threading.Event()
+
+    def __getattr__(self, name):
+        return getattr(self.backend, name)
+
+    def get_all_pending_leaves(self):
+        rows = self.backend.get_all_pending_leaves()
+        self.loaded.set()
+        self.release.wait(10)
+        return rows
+
+
+def test_write_during_a_load_is_not_hidden_by_it(sqlite_backend):
+    slow = SlowPendingBackend(sqlite_backend)
+    cached = CachedBackend(slow)
+    leave = sqlite_backend.get_all_pending_leaves()[0]
+
+    reader = threading.Thread(target=cached.get_all_pending_leaves)
+    reader.start()
+    assert slow.loaded.wait(10)
+    # The read has its (soon stale) rows; the approval lands before it is cached.
+    cached.update_leave_status(leave["id"], "Approved")
+    slow.release.set()
+    reader.join(10)
+
+    assert leave["id"] not in {row["id"] for row in cached.get_all_pending_leaves()}
+
+
+def test_status_change_invalidates_only_what_it_touches(sqlite_backend):
+    cached = CachedBackend(sqlite_backend)
+    pending = cached.get_all_pending_leaves()
+    leave = pending[0]
+    directory = cached.get_employee_directory()
+    history = cached.get_leave_history(leave["employee_id"])
+    assert cached.get_all_pending_leaves() is pending
+
+    cached.update_leave_status(leave["id"], "Approved")
+
+    assert leave["id"] not in {row["id"] for row in cached.get_all_pending_leaves()}
+    assert cached.get_employee_directory() is directory
+    assert cached.get_leave_history(leave["employee_id"]) is not history
+
+
+def test_leave_owner_map_is_bounded(sqlite_backend):
+    cached = CachedBackend(sqlite_backend, max_leave_owners=25)
+    page = cached.get_team_leaves_page(page_size=100)
+    assert len(cached._leave_owners) == 25
+    # The most recently seen leaves are the ones kept.
+    assert list(cached._leave_owners) == [row["id"] for row in page.rows[-25:]]
+
+    # A forgotten owner still invalidates that employee's entries.
+    forgotten = page.rows[0]
+    history = cached.get_leave_history(forgotten["employee_id"])
+    cached.update_leave_status(forgotten["id"], "Withdrawn")
+    assert cached.get_leave_history(forgotten["employee_id"]) is not history
@@ -0,0 +1,68 @@
+# tests/test_durations.py
+import math
+
+import numpy as np
+import pytest
+
+from leave_store import durations
+from leave_store.durations import HolidayCalendar, holidays_from_dates, register_holiday_rule, total_days
+
+
+def days(calendar, start, end, start_half=False, end_half=False):
+    return float(calendar.business_days([start], [end], [start_half], [end_half])[0])
+
+
+@pytest.fixture
+def kenya():
+    return HolidayCalendar("KE")
+
+
+def test_weekends_are_free(kenya):
+    assert days(kenya, "2025-03-03", "2025-03-07") == 5   # Monday to Friday
+    assert days(kenya, "2025-03-07", "2025-03-10") == 2   # Friday to Monday
+    assert days(kenya, "2025-03-08", "2025-03-09") == 0   # a weekend
+
+
+def test_public_holidays_are_free(kenya):
+    # Christmas and Boxing Day fall on the Wednesday and Thursday.
+    assert days(kenya, "2024-12-23", "2024-12-27") == 3
+    assert days(HolidayCalendar("NONE"), "2024-12-23", "2024-12-27") == 5
+    assert days(HolidayCalendar("NONE", extra_holidays=["2024-12-24"]), "2024-12-23", "2024-12-27") == 4
+
+
+def test_half_days(kenya):
+    assert days(kenya, "2025-03-03", "2025-03-07", start_half=True) == 4.5
+    assert days(kenya, "2025-03-03", "2025-03-07", start_half=True, end_half=True) == 4
+    # One day flagged at both ends is still half a day.
+    assert days(kenya, "2025-03-04", "2025-03-04", start_half=True, end_half=True) == 0.5
+    # A half day on a non-working day takes nothing off.
+    assert days(kenya, "2025-03-08", "2025-03-10", start_half=True) == 1
+
+
+def test_invalid_ranges_give_nan(kenya):
+    result = kenya.business_days(np.array(["2025-03-05", "NaT"], dtype="datetime64[D]"),
+                                 np.array(["2025-03-04", "2025-03-04"], dtype="datetime64[D]"))
+    assert all(math.isnan(value) for value in result)
+
+
+def test_maternity_and_paternity_count_calendar_days(kenya):
+    charged = kenya.leave_days(["Maternity", "Paternity", "Annual"],
+                               ["2025-03-03"] * 3, ["2025-03-09"] * 3,
+                               [False, True, False], [False, False, False])
+    assert charged.tolist() == [7, 6.5, 5]
+
+
+def test_total_days():
+    assert total_days(np.array([1.0, 2.0, np.nan])) == 3
+    assert isinstance(total_days(np.array([1.0, 2.0])), int)
+    assert total_days(np.array([0.5, 2.0])) == 2.5
+
+
+def test_registered_rule_from_a_holiday_table(monkeypatch):
+    monkeypatch.setitem(durations.HOLIDAY_RULES, "UG", None)
+    register_holiday_rule("UG", holidays_from_dates(["2025-10-09", "2026-01-26"]))
+    uganda = HolidayCalendar("UG")
+    assert days(uganda, "2025-10-06", "2025-10-10") == 4   # Independence Day, Thursday
+    assert days(uganda, "2025-12-25", "2025-12-26") == 2   # Kenyan holidays do not apply
+    with pytest.raises(ValueError):
+        HolidayCalendar("TZ")
@@ -0,0 +1,65 @@
+# tests/test_overlaps.py
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from leave_store.overlaps import LeaveIntervalIndex
+
+ORIGIN = date(2025, 1, 1)
+
+
+def leave(leave_id, employee_id, start, length):
+    first = ORIGIN + timedelta(days=start)
+    return {"id": leave_id, "employee_id": employee_id, "employee_name": f"Employee {employee_id}",
+            "start_date": first.isoformat(), "end_date": (first + timedelta(days=length)).isoformat()}
+
+
+@pytest.fixture(scope="module")
+def rows():
+    rng = random.Random(3)
+    # Mostly short leaves with a few very long ones, which must not widen every query.
+    return [leave(number, number % 40, rng.randint(0, 365), rng.choice([0, 0, 1, 2, 4, 9, 20, 180]))
+            for number in range(2000)]
+
+
+def brute_force(rows, start, end, exclude_employee=None):
+    return sorted(
+        (row for row in rows
+         if row["start_date"] <= end.isoformat() and row["end_date"] >= start.isoformat()
+         and row["employee_id"] != exclude_employee),
+        key=lambda row: (row["start_date"], row["id"])
+    )
+
+
+def test_matches_a_full_scan(rows):
+    index = LeaveIntervalIndex(rows)
+    rng = random.Random(5)
+    for _ in range(200):
+        start = ORIGIN + timedelta(days=rng.randint(-30, 400))
+        end = start + timedelta(days=rng.randint(0, 30))
+        exclude = rng.choice([None, 7])
+        expected = brute_force(rows, start, end, exclude)
+        found = index.overlapping(start, end, exclude_employee=exclude)
+        assert sorted(row["id"] for row in found) == sorted(row["id"] for row in expected)
+        assert [row["start_date"] for row in found] == [row["start_date"] for row in expected]
+        assert index.count_overlapping(start, end, exclude_employee=exclude) == len(expected)
+
+
+def test_limit_keeps_the_earliest_rows(rows):
+    index = LeaveIntervalIndex(rows)
+    start, end = date(2025, 6, 1), date(2025, 6, 14)
+    expected = brute_force(rows, start, end)
+    limited = index.overlapping(start, end, limit=5)
+    assert [row["start_date"] for row in limited] == [row["start_date"] for row in expected[:5]]
+
+
+def test_accepts_iso_strings_and_skips_bad_rows():
+    index = LeaveIntervalIndex([
+        leave(1, 1, 10, 3),
+        {"id": 2, "employee_id": 2, "start_date": None, "end_date": "2025-01-05"},
+        {"id": 3, "employee_id": 3, "start_date": "2025-01-09", "end_date": "2025-01-02"},
+    ])
+    assert len(index) == 1
+    assert [row["id"] for row in index.overlapping("2025-01-12", "2025-01-12")] == [1]
+    assert index.count_overlapping("2025-01-15", "2025-01-20") == 0
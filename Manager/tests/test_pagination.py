@@ -0,0 +1,44 @@
+# tests/test_pagination.py
+from leave_store.pagination import page_cursor
+
+
+def walk_pages(backend, page_size, **filters):
+    """Follows the keyset cursors to the end; returns every row and the first page's total."""
+    page = backend.get_team_leaves_page(page_size=page_size, **filters)
+    rows, total = list(page.rows), page.total
+    while page.next_cursor is not None:
+        page = backend.get_team_leaves_page(after=page.next_cursor, page_size=page_size, count=None, **filters)
+        assert page.total is None
+        rows.extend(page.rows)
+    return rows, total
+
+
+def test_pages_cover_every_leave_once_in_order(backend, sqlite_backend):
+    rows, total = walk_pages(backend, 100)
+    expected = sorted(sqlite_backend.get_team_leaves(), key=page_cursor)
+    assert [row["id"] for row in rows] == [row["id"] for row in expected]
+    assert total == len(expected)
+
+
+def test_pages_keep_filters(backend, sqlite_backend):
+    filters = dict(status_filter=["Approved", "Pending"], leave_type_filter=["Annual"])
+    rows, total = walk_pages(backend, 37, **filters)
+    expected = sorted(sqlite_backend.get_team_leaves(**filters), key=page_cursor)
+    assert [row["id"] for row in rows] == [row["id"] for row in expected]
+    assert total == len(expected)
+    assert {row["status"] for row in rows} <= {"Approved", "Pending"}
+
+
+def test_employee_id_filter(backend):
+    employee_id = backend.get_employees()[0]["id"]
+    rows, total = walk_pages(backend, 10, employee_id=employee_id)
+    assert rows and total == len(rows)
+    assert {row["employee_id"] for row in rows} == {employee_id}
+
+
+def test_frame_pages_match_row_pages(backend):
+    page = backend.get_team_leaves_page(page_size=50)
+    frame = backend.get_team_leaves_frame(page_size=50)
+    assert frame.rows["id"].tolist() == [row["id"] for row in page.rows]
+    assert frame.next_cursor == page.next_cursor
+    assert str(frame.rows["status"].dtype) == "category"
@@ -0,0 +1,72 @@
+# tests/test_stats.py
+from datetime import date
+
+from leave_store.durations import HolidayCalendar
+from leave_store.sqlite_backend import SQLiteBackend
+from leave_store.stats import summarize_leaves
+
+
+def stats_rows(backend):
+    return sorted((row["employee_id"], row["leave_type"], row["year"], row["status"], row["requests"], row["days"])
+                  for row in backend.get_leave_stats())
+
+
+def test_incremental_stats_match_a_rebuild(sqlite_backend):
+    employee_id = sqlite_backend.get_employees()[0]["id"]
+    sqlite_backend.apply_for_leave(employee_id, "Annual", date(2025, 4, 7), date(2025, 4, 11), "Trip", False,
+                                   start_half_day=True)
+    sqlite_backend.apply_for_leave(employee_id, "Maternity", date(2025, 5, 5), date(2025, 8, 1), "", False)
+    pending = [row["id"] for row in sqlite_backend.get_all_pending_leaves()]
+    sqlite_backend.update_leave_statuses(pending[:10], "Approved")
+    sqlite_backend.update_leave_statuses(pending[10:20], "Declined", reason="Busy season")
+    sqlite_backend.update_leave_status(pending[20], "Withdrawn")
+
+    incremental = stats_rows(sqlite_backend)
+    sqlite_backend.rebuild_leave_stats()
+    assert incremental == stats_rows(sqlite_backend)
+    # Emptied keys are deleted rather than left at zero.
+    assert all(requests > 0 for *_, requests, _ in incremental)
+
+
+def test_summary_counts_leave_days_by_type():
+    rows = [
+        {"employee_id": "e1", "leave_type": "Annual", "start_date": "2025-03-03", "end_date": "2025-03-09",
+         "status": "Approved", "start_half_day": True, "end_half_day": False},
+        {"employee_id": "e1", "leave_type": "Annual", "start_date": "2025-03-10", "end_date": "2025-03-10",
+         "status": "Approved", "start_half_day": False, "end_half_day": False},
+        {"employee_id": "e1", "leave_type": "Paternity", "start_date": "2025-03-03", "end_date": "2025-03-16",
+         "status": "Approved", "start_half_day": False, "end_half_day": False},
+    ]
+    summary = sorted(summarize_leaves(rows, sign=-1))
+    assert summary == [("e1", "Annual", 2025, "Approved", -2, -5.5), ("e1", "Paternity", 2025, "Approved", -1, -14.0)]
+
+
+def test_rebuild_returns_the_stats_row_count(sqlite_backend):
+    assert sqlite_backend.rebuild_leave_stats() == len(sqlite_backend.get_leave_stats())
+
+
+def test_stats_filter_by_year_and_status(sqlite_backend):
+    rows = sqlite_backend.get_leave_stats()
+    assert sqlite_backend.get_leave_stats(year=2025, status="Pending") == [
+        row for row in rows if row["year"] == 2025 and row["status"] == "Pending"
+    ]
+
+
+def test_migration_rebuilds_with_the_configured_calendar(tmp_path):
+    path = str(tmp_path / "old.db")
+    old = SQLiteBackend(path)
+    employee_id = "e1"
+    old.execute("INSERT INTO employees (id, name, partner, department, position, salary) VALUES (?, ?, ?, ?, ?, ?)",
+                (employee_id, "Achieng", "Acme", "Sales", "Agent", 0))
+    # Christmas week: three working days in Kenya, five without public holidays.
+    old.apply_for_leave(employee_id, "Annual", date(2024, 12, 23), date(2024, 12, 27), "", False)
+    # A version 3 database whose stats still need the working-day rebuild.
+    old.execute("DELETE FROM leave_stats")
+    old.execute("PRAGMA user_version = 3")
+    old.pool.close()
+
+    migrated = SQLiteBackend(path, calendar=HolidayCalendar("NONE"))
+    try:
+        assert [row["days"] for row in migrated.get_leave_stats()] == [5]
+    finally:
+        migrated.pool.close()
@@ -0,0 +1,65 @@
+# tests/test_supabase_backend.py
+from datetime import date
+
+from leave_store import supabase_backend as supabase_module
+from leave_store.snapshot import snapshot_window
+
+
+def test_snapshot_reads_past_the_row_cap(supabase_backend, sqlite_backend, standin, as_of, monkeypatch):
+    # A small cap, with the bulk ranges sized to it as on a real project.
+    standin.max_rows = 100
+    monkeypatch.setattr(supabase_module, "BULK_PAGE_SIZE", 100)
+    window = snapshot_window(as_of)
+    remote = supabase_backend.get_snapshot_leaves(*window)
+    assert len(remote) > 2 * standin.max_rows
+    assert sorted(row["id"] for row in remote) == sorted(row["id"] for row in sqlite_backend.get_snapshot_leaves(*window))
+
+
+def test_approved_rows_in_range(supabase_backend, sqlite_backend):
+    bounds = (date(2025, 1, 1), date(2025, 3, 31))
+    remote = supabase_backend.get_approved_leave_rows(range_start=bounds[0], range_end=bounds[1])
+    local = sqlite_backend.get_approved_leave_rows(range_start=bounds[0], range_end=bounds[1])
+    key = lambda row: (row["employee_id"], row["start_date"], row["leave_type"])
+    assert sorted(map(key, remote)) == sorted(map(key, local))
+    assert all(row["start_date"] <= "2025-03-31" and row["end_date"] >= "2025-01-01" for row in remote)
+
+
+def test_name_filter_matches_every_employee_with_the_name(supabase_backend, standin):
+    first, second = standin.tables["employee_table"][:2]
+    standin.write_rows("employee_table", dict(second, First_Name=first["First_Name"]))
+    standin.tables["employee_table"].remove(second)
+    standin.reindex("employee_table")
+
+    rows = supabase_backend.get_team_leaves(employee_filter=first["First_Name"])
+    assert {row["employee_id"] for row in rows} == {first["AUUID"], second["AUUID"]}
+    only_second = supabase_backend.get_team_leaves(employee_id=second["AUUID"])
+    assert only_second and {row["employee_id"] for row in only_second} == {second["AUUID"]}
+
+
+def test_search_escapes_quoted_terms(supabase_backend, standin):
+    standin.load("employee_table", [
+        {"AUUID": "q1", "First_Name": 'Wanjiru "WJ", Otieno'},
+        {"AUUID": "q2", "First_Name": "Back\\slash Kamau"},
+        {"AUUID": "q3", "First_Name": "Percent 100% Njeri"},
+        {"AUUID": "q4", "First_Name": "Percent 1000 Njeri"},
+    ])
+    assert [row["id"] for row in supabase_backend.search_employees('Wanjiru "WJ", O')] == ["q1"]
+    assert [row["id"] for row in supabase_backend.search_employees("Back\\sl")] == ["q2"]
+    assert [row["id"] for row in supabase_backend.search_employees("100%")] == ["q3"]
+
+
+def test_facade_reads_past_the_row_cap(supabase_backend, sqlite_backend, standin, monkeypatch):
+    standin.max_rows = 100
+    monkeypatch.setattr(supabase_module, "BULK_PAGE_SIZE", 100)
+    ids = lambda rows: sorted(row["id"] for row in rows)
+    assert len(supabase_backend.get_all_leaves()) > 2 * standin.max_rows
+    assert ids(supabase_backend.get_all_leaves()) == ids(sqlite_backend.get_all_leaves())
+    assert ids(supabase_backend.get_team_leaves()) == ids(sqlite_backend.get_team_leaves())
+    assert len(supabase_backend.get_all_pending_leaves()) == len(sqlite_backend.get_all_pending_leaves())
+    assert len(supabase_backend.get_approved_leaves()) == len(sqlite_backend.get_approved_leaves())
+    assert sorted(supabase_backend.get_all_employees_from_db()) == sorted(sqlite_backend.get_all_employees_from_db())
+
+
+def test_public_holidays_read_back_in_order(supabase_backend, standin):
+    standin.load("public_holidays", [{"day": "2025-12-25"}, {"day": "2025-01-01"}])
+    assert supabase_backend.get_public_holidays() == ["2025-01-01", "2025-12-25"]
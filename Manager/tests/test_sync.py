@@ -0,0 +1,84 @@
+# tests/test_sync.py
+from datetime import datetime, timezone
+
+from leave_store.sync import RELOAD_AFTER, SYNCED_AT, TOMBSTONE_TABLE, DeltaSync, MemoryReplica
+
+
+def synced(standin):
+    sync = DeltaSync(standin, MemoryReplica(), batch_size=250)
+    sync.refresh()
+    return sync
+
+
+def test_first_refresh_copies_everything(standin):
+    sync = synced(standin)
+    assert len(sync.replica.tables["off_roll_leave"]) == len(standin.tables["off_roll_leave"])
+    assert len(sync.replica.tables["employee_table"]) == len(standin.tables["employee_table"])
+    newest = max(row["updated_at"] for row in standin.tables["off_roll_leave"])
+    assert sync.replica.get_watermark("off_roll_leave") == newest
+
+
+def test_unchanged_refresh_writes_nothing(standin):
+    sync = synced(standin)
+    version, snapshot = sync.replica.version, sync.replica.snapshot()
+    watermark = sync.replica.get_watermark("off_roll_leave")
+
+    assert sync.refresh() == 0
+    assert sync.replica.version == version
+    assert sync.replica.snapshot() is snapshot
+    assert sync.replica.get_watermark("off_roll_leave") == watermark
+
+
+def test_refresh_pulls_only_changes(standin):
+    sync = synced(standin)
+    leave = dict(standin.tables["off_roll_leave"][0], status="Withdrawn")
+    written = standin.write_rows("off_roll_leave", leave, upsert=True)[0]
+
+    assert sync.refresh() == 1
+    assert sync.replica.tables["off_roll_leave"][leave["id"]]["status"] == "Withdrawn"
+    assert sync.replica.get_watermark("off_roll_leave") == written["updated_at"]
+
+
+def test_tombstones_delete_rows(standin):
+    sync = synced(standin)
+    leave_id = standin.tables["off_roll_leave"][0]["id"]
+    standin.tables["off_roll_leave"] = standin.tables["off_roll_leave"][1:]
+    standin.load(TOMBSTONE_TABLE, [{"id": 1, "table_name": "off_roll_leave", "row_id": str(leave_id),
+                                    "deleted_at": standin.now()}])
+
+    assert sync.refresh() == 1
+    assert leave_id not in sync.replica.tables["off_roll_leave"]
+    assert sync.refresh() == 0
+
+
+def test_bulk_delete_sharing_one_timestamp_is_paged(standin):
+    # One DELETE stamps all its tombstones with the same now(); more of them
+    # than a batch (or the server cap) must still all arrive.
+    standin.max_rows = 100
+    sync = DeltaSync(standin, MemoryReplica(), batch_size=100)
+    sync.refresh()
+    leaves = standin.tables["off_roll_leave"]
+    deleted, standin.tables["off_roll_leave"] = leaves[:350], leaves[350:]
+    deleted_at = standin.now()
+    standin.load(TOMBSTONE_TABLE, [
+        {"id": position, "table_name": "off_roll_leave", "row_id": str(row["id"]), "deleted_at": deleted_at}
+        for position, row in enumerate(deleted, start=1)
+    ])
+
+    assert sync.refresh() == len(deleted)
+    assert set(sync.replica.tables["off_roll_leave"]) == {row["id"] for row in standin.tables["off_roll_leave"]}
+    assert sync.replica.get_watermark(TOMBSTONE_TABLE) == deleted_at
+    assert sync.refresh() == 0
+
+
+def test_stale_replica_reloads_instead_of_trusting_pruned_tombstones(standin):
+    sync = synced(standin)
+    # Deleted, with its tombstone already pruned, while the replica was idle.
+    gone = standin.tables["off_roll_leave"].pop(0)["id"]
+    idle_since = datetime.now(timezone.utc) - RELOAD_AFTER * 2
+    sync.replica.set_watermark(SYNCED_AT, idle_since.isoformat())
+
+    assert sync.refresh() == 1
+    assert gone not in sync.replica.tables["off_roll_leave"]
+    assert len(sync.replica.tables["off_roll_leave"]) == len(standin.tables["off_roll_leave"])
+    assert datetime.fromisoformat(sync.replica.get_watermark(SYNCED_AT)) > idle_since
@@ -0,0 +1,39 @@
+# tests/test_timeline.py
+from datetime import date, timedelta
+
+from leave_store.timeline import compute_absence_timeline
+
+
+def leave(employee_id, start, end, leave_type="Annual", department="Sales"):
+    return {"employee_id": employee_id, "leave_type": leave_type, "department": department,
+            "start_date": start, "end_date": end}
+
+
+def test_overlapping_rows_of_one_person_count_once():
+    rows = [
+        leave("e1", "2025-03-03", "2025-03-05"),
+        leave("e1", "2025-03-04", "2025-03-07"),
+        leave("e1", "2025-03-06", "2025-03-06", leave_type="Sick"),
+        leave("e2", "2025-03-05", "2025-03-05", department=None),
+    ]
+    timeline = compute_absence_timeline(rows, date(2025, 3, 3), date(2025, 3, 9))
+    assert timeline.total.tolist() == [1, 1, 2, 1, 1, 0, 0]
+    assert timeline.by_leave_type["Annual"].tolist() == [1, 1, 2, 1, 1, 0, 0]
+    assert timeline.by_leave_type["Sick"].tolist() == [0, 0, 0, 1, 0, 0, 0]
+    assert timeline.by_department["Sales"].tolist() == [1, 1, 1, 1, 1, 0, 0]
+    assert timeline.by_department["Unassigned"].tolist() == [0, 0, 1, 0, 0, 0, 0]
+    assert timeline.peak() == 2
+
+
+def test_empty_range_has_no_one_off():
+    timeline = compute_absence_timeline([], date(2025, 3, 1), date(2025, 3, 31))
+    assert len(timeline) == 31 and timeline.peak() == 0 and not list(timeline.daily())
+
+
+def test_matches_distinct_people_per_day(sqlite_backend):
+    range_start, range_end = date(2025, 1, 1), date(2025, 3, 31)
+    timeline = sqlite_backend.get_absence_timeline(range_start, range_end)
+    rows = sqlite_backend.get_approved_leave_rows(range_start=range_start, range_end=range_end)
+    for offset, count in enumerate(timeline.total):
+        day = (range_start + timedelta(days=offset)).isoformat()
+        assert count == len({row["employee_id"] for row in rows if row["start_date"] <= day <= row["end_date"]})